@@ -9,6 +9,11 @@ Module to test the gedcom modules.
 import os
 import sys
 import argparse
+import tempfile
+import time
+import gc
+import tracemalloc
+import random
 # import inspect
 
 # Allow imports from parent folder.
@@ -18,6 +23,15 @@ sys.path.insert(0, parentFolder)
 
 # From parent folder.
 import gedcom_date
+import gedcom_line
+import gedcom_individual
+import gedcom_reader
+import gedcom_relationships
+import gedcom_kinship
+import gedcom_search
+import gedcom_names
+import place
+import place_grid
 
 
 
@@ -56,6 +70,414 @@ def testDates():
 
 
 
+def testNesting(depth = 14, count = 2000):
+    '''
+    Benchmark the parsers on a synthetic gedcom with deeply nested tags.
+    Each individual has a note nested to the specified depth followed by a level 1 tag that must not be swallowed by the note.
+    '''
+    # Build the synthetic gedcom file.
+    noteLines = ['1 NOTE Deep note']
+    for level in range(2, depth + 1):
+        noteLines.append(f'{level} CONT Level {level}')
+    lines = ['0 HEAD']
+    for index in range(count):
+        lines.append(f'0 @I{index}@ INDI')
+        lines.append('1 NAME Mary /Walton/')
+        lines.extend(noteLines)
+        lines.append('1 SEX F')
+    lines.append('0 TRLR')
+    with tempfile.NamedTemporaryFile('w', suffix='.ged', delete=False) as file:
+        file.write('\n'.join(lines))
+        fileName = file.name
+
+    # Time reading and parsing the file.
+    startTime = time.perf_counter()
+    individuals = []
+    records = []
+    for line in gedcom_line.GedComLine.readFile(fileName):
+        if line.level == 0:
+            records.append([])
+        records[-1].append(line)
+    for record in records:
+        if record[0].tag == 'INDI':
+            individuals.append(gedcom_individual.GedComIndividual(record))
+    elapsedTime = time.perf_counter() - startTime
+    os.remove(fileName)
+
+    # Check that the blocks were split at the correct levels.
+    errors = 0
+    for individual in individuals:
+        if individual.sex != gedcom_individual.IndividualSex.FEMALE or individual.tags is None or individual.tags[0].toGedCom(1) != noteLines:
+            errors += 1
+    print(f'Nesting depth {depth}, {len(individuals)} individuals, {len(lines)} lines in {elapsedTime:.3f}s, {errors} errors.')
+
+
+
+def testOpen(fileName, repeats = 3):
+    '''
+    Benchmark opening the specified gedcom file against the old reader.
+    The old reader read the file with readline() and each line was split again by every parser that used it, twice or more.
+    The best of the repeats is reported and the garbage collector is paused, the same as :py:func:`GedCom.open`.
+    '''
+    # The gedcom class needs the application libraries, so only import it for this test.
+    import gedcom
+    isCollecting = gc.isenabled()
+    gc.disable()
+    oldTimes = []
+    tokenTimes = []
+    openTimes = []
+    for _ in range(repeats):
+        # The old reader with the first two splits of each line.
+        startTime = time.perf_counter()
+        count = 0
+        with open(fileName, 'r', encoding='utf-8', errors='replace') as file:
+            line = file.readline()
+            while line != '':
+                line.rstrip().split(' ', 1)
+                line.rstrip().split(' ', 2)
+                count += 1
+                line = file.readline()
+        oldTimes.append(time.perf_counter() - startTime)
+
+        # The chunked reader that tokenizes each line once.
+        startTime = time.perf_counter()
+        lines = list(gedcom_line.GedComLine.readFile(fileName))
+        tokenTimes.append(time.perf_counter() - startTime)
+        del lines
+
+        gedCom = gedcom.GedCom()
+        startTime = time.perf_counter()
+        gedCom.open(fileName)
+        openTimes.append(time.perf_counter() - startTime)
+        del gedCom
+        gc.collect()
+    if isCollecting:
+        gc.enable()
+    print(f'{fileName} {count} lines.')
+    print(f'\tOld reader, readline() and split twice in {min(oldTimes):.3f}s.')
+    print(f'\tChunked reader, tokenized once in {min(tokenTimes):.3f}s.')
+    print(f'\tOpen in {min(openTimes):.3f}s, {100 * min(tokenTimes) / min(openTimes):.0f}% reading and tokenizing, {min(openTimes) - min(tokenTimes):.3f}s building the records.')
+
+
+
+def testStatistics(fileName):
+    ''' Count the records in the specified gedcom file with the streaming reader. '''
+    startTime = time.time()
+    counts = {}
+    sexes = {}
+    for record in gedcom_reader.GedComReader.iterRecords(fileName):
+        className = type(record).__name__
+        counts[className] = counts.get(className, 0) + 1
+        if isinstance(record, gedcom_individual.GedComIndividual):
+            sexes[record.sex.name] = sexes.get(record.sex.name, 0) + 1
+    elapsedTime = time.time() - startTime
+    print(f'{fileName} in {elapsedTime:.3f}s.')
+    for className, count in counts.items():
+        print(f'\t{className} {count}')
+    for sex, count in sexes.items():
+        print(f'\t{sex} {count}')
+
+
+
+def testColumns(fileName):
+    ''' Benchmark the date column queries on the specified gedcom file against a loop over the records. '''
+    # The columns need numpy, so only import them for this test.
+    import gedcom_columns
+    individuals = []
+    families = []
+    for record in gedcom_reader.GedComReader.iterRecords(fileName, ('INDI', 'FAM')):
+        if isinstance(record, gedcom_individual.GedComIndividual):
+            individuals.append(record)
+        else:
+            families.append(record)
+    startTime = time.time()
+    columns = gedcom_columns.GedComColumns(individuals, families)
+    print(f'Columns for {len(individuals)} individuals and {len(families)} families in {time.time() - startTime:.3f}s.')
+
+    startTime = time.time()
+    alive = columns.getIdentities(columns.getAliveIn(1881))
+    print(f'\t{len(alive)} alive in 1881 in {1000 * (time.time() - startTime):.1f}ms.')
+
+    startTime = time.time()
+    distribution = columns.getAgeAtDeathDistribution()
+    print(f'\tAge at death distribution {distribution.tolist()} in {1000 * (time.time() - startTime):.1f}ms.')
+
+    startTime = time.time()
+    decades, counts = columns.getMarriagesPerDecade()
+    print(f'\t{len(decades)} decades of marriages in {1000 * (time.time() - startTime):.1f}ms.')
+
+    # The same age at death distribution as a loop over the records.
+    startTime = time.time()
+    loopDistribution = {}
+    for individual in individuals:
+        if individual.birth is not None and individual.birth.date is not None and individual.birth.date.sortKey > 0:
+            if individual.death is not None and individual.death.date is not None and individual.death.date.sortKey > 0:
+                years = individual.getYears(individual.death.date) // 10
+                loopDistribution[years] = loopDistribution.get(years, 0) + 1
+    print(f'\tLoop age at death distribution in {1000 * (time.time() - startTime):.1f}ms, {"same" if all(loopDistribution.get(index, 0) == count for index, count in enumerate(distribution)) else "different"}.')
+
+
+
+def testMemory(fileName):
+    '''
+    Report the memory used by each individual in the specified gedcom file.
+    This is compared with the same individuals that also keep the tokenized lines of their original gedcom, as they did before the original text was compacted.
+    '''
+    tracemalloc.start()
+    startMemory = tracemalloc.get_traced_memory()[0]
+    individuals = list(gedcom_reader.GedComReader.iterRecords(fileName, ('INDI', )))
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - startMemory
+    print(f'{len(individuals)} individuals in {memory / 1024 / 1024:.1f}MB, {memory / max(1, len(individuals)):.0f} bytes per individual.')
+    del individuals
+    gc.collect()
+
+    # The individuals with the tokenized lines of each record.
+    startMemory = tracemalloc.get_traced_memory()[0]
+    individuals = []
+    lines = None
+    for line in gedcom_line.GedComLine.readFile(fileName):
+        if line.level == 0:
+            if lines is not None:
+                individuals.append((gedcom_individual.GedComIndividual(lines), lines))
+            lines = [line] if line.tag == 'INDI' else None
+        elif lines is not None:
+            lines.append(line)
+    if lines is not None:
+        individuals.append((gedcom_individual.GedComIndividual(lines), lines))
+    gc.collect()
+    linesMemory = tracemalloc.get_traced_memory()[0] - startMemory
+    tracemalloc.stop()
+    print(f'{len(individuals)} individuals with their lines in {linesMemory / 1024 / 1024:.1f}MB, {linesMemory / max(1, len(individuals)):.0f} bytes per individual.')
+    print(f'\tThe compact original text saves {100 * (linesMemory - memory) / max(1, linesMemory):.0f}% of the memory.')
+
+
+
+def testRoundTrip(fileName):
+    '''
+    Check that a lazy gedcom is saved unchanged after its records are viewed.
+    The file saved before any record is built is compared with the file saved after every record is built, apart from the date and time in the header.
+    '''
+    # The gedcom class needs the application libraries, so only import it for this test.
+    import gedcom
+    gedCom = gedcom.GedCom()
+    gedCom.open(fileName, isLazy=True)
+    with tempfile.TemporaryDirectory() as folder:
+        # The same name in two folders, so the FILE line in the headers are the same.
+        fileNames = [os.path.join(folder, 'unviewed', 'saved.ged'), os.path.join(folder, 'viewed', 'saved.ged')]
+        for name in fileNames:
+            os.mkdir(os.path.dirname(name))
+        gedCom.saveAs(fileNames[0])
+        # View every record.
+        for records in (gedCom.individuals, gedCom.families, gedCom.sources, gedCom.media):
+            for identity in records:
+                records[identity]
+        gedCom.saveAs(fileNames[1])
+        texts = []
+        for name in fileNames:
+            with open(name, 'r', encoding='utf-8') as file:
+                texts.append([line for line in file.read().split('\n') if not line.startswith('1 DATE ') and not line.startswith('2 TIME ')])
+    blankLines = [line for line in texts[1][:-1] if line == '']
+    print(f'Round trip of {len(texts[0])} lines, {len(blankLines)} blank lines, {"same" if texts[0] == texts[1] else "different"}.')
+
+
+
+def testRelationships(fileName):
+    ''' Benchmark the relationship graph on the specified gedcom file. '''
+    individuals = {}
+    families = {}
+    for record in gedcom_reader.GedComReader.iterRecords(fileName, ('INDI', 'FAM')):
+        if isinstance(record, gedcom_individual.GedComIndividual):
+            individuals[record.identity] = record
+        else:
+            families[record.identity] = record
+    startTime = time.time()
+    relationships = gedcom_relationships.GedComRelationships(individuals, families)
+    print(f'Relationships for {len(individuals)} individuals and {len(families)} families in {time.time() - startTime:.3f}s.')
+
+    startTime = time.time()
+    count = 0
+    for identity in individuals:
+        count += len(relationships.getChildren(identity)) + len(relationships.getSiblings(identity))
+    print(f'\t{count} children and siblings in {1000 * (time.time() - startTime):.1f}ms.')
+
+    startTime = time.time()
+    count = 0
+    for identity in individuals:
+        for ancestor, generation in relationships.iterAncestors(identity, 10):
+            count += 1
+    print(f'\t{count} ancestors to 10 generations in {1000 * (time.time() - startTime):.1f}ms.')
+
+    startTime = time.time()
+    cycles = relationships.getCycles()
+    print(f'\t{len(cycles)} individuals in ancestor cycles in {1000 * (time.time() - startTime):.1f}ms.')
+
+    # The relationships to the individual with the most relatives of a sample.
+    kinship = gedcom_kinship.GedComKinship(relationships, individuals)
+    identities = list(individuals)[::max(1, len(individuals) // 20)]
+    startTime = time.time()
+    homeIdentity = None
+    count = -1
+    for identity in identities:
+        if len(kinship.getRelationshipsTo(identity)) > count:
+            homeIdentity = identity
+            count = len(kinship.relatives)
+    print(f'\tRelationships to {len(identities)} individuals in {1000 * (time.time() - startTime):.1f}ms.')
+    relatives = kinship.getRelationshipsTo(homeIdentity)
+    startTime = time.time()
+    for identity in relatives:
+        kinship.getRelationship(homeIdentity, identity)
+    print(f'\t{len(relatives)} relatives of {homeIdentity} one pair at a time in {1000 * (time.time() - startTime):.1f}ms.')
+
+
+
+def testGrid(count = 100000):
+    ''' Benchmark the spatial index of the places on a synthetic set of places and check it against a search of every place. '''
+    random.seed(1)
+    place.Place.reset()
+    for index in range(count):
+        latitude = random.uniform(49.0, 59.0)
+        longitude = random.uniform(-8.0, 2.0)
+        latitudeText = f'N{latitude:.5f}' if latitude >= 0 else f'S{-latitude:.5f}'
+        longitudeText = f'E{longitude:.5f}' if longitude >= 0 else f'W{-longitude:.5f}'
+        place.Place(f'Place {index}', f'Place {index}', None, None, latitudeText, longitudeText)
+    places = list(place.Place.allPlaces.values())
+    startTime = time.time()
+    grid = place_grid.PlaceGrid(places)
+    print(f'Grid of {grid.count} places in {time.time() - startTime:.3f}s.')
+
+    errors = 0
+    elapsedTime = 0
+    queries = 200
+    found = 0
+    for _ in range(queries):
+        centre = random.choice(places)
+        startTime = time.perf_counter()
+        nearby = grid.getWithin(centre.latitude, centre.longitude, 10)
+        elapsedTime += time.perf_counter() - startTime
+        found += len(nearby)
+        expected = 0
+        for other in places:
+            if place_grid.PlaceGrid.getDistance(centre.latitude, centre.longitude, other.latitude, other.longitude) <= 10:
+                expected += 1
+        if expected != len(nearby):
+            errors += 1
+    print(f'\t{found // queries} places within 10km in {1000 * elapsedTime / queries:.3f}ms, {errors} errors.')
+
+    elapsedTime = 0
+    for _ in range(queries):
+        startTime = time.perf_counter()
+        grid.getInBox(53.0, -1.6, 53.1, -1.4)
+        elapsedTime += time.perf_counter() - startTime
+    print(f'\tBounding box in {1000 * elapsedTime / queries:.3f}ms.')
+
+    elapsedTime = 0
+    for _ in range(queries):
+        startTime = time.perf_counter()
+        grid.getNearest(random.uniform(49.0, 59.0), random.uniform(-8.0, 2.0), 5)
+        elapsedTime += time.perf_counter() - startTime
+    print(f'\t5 nearest places in {1000 * elapsedTime / queries:.3f}ms.')
+    place.Place.reset()
+
+
+
+def testSearch(fileName):
+    ''' Benchmark the full text search on the specified gedcom file and check it against a search of every record. '''
+    individuals = []
+    sources = []
+    for record in gedcom_reader.GedComReader.iterRecords(fileName, ('INDI', 'SOUR')):
+        if isinstance(record, gedcom_individual.GedComIndividual):
+            individuals.append(record)
+        else:
+            sources.append(record)
+    startTime = time.time()
+    search = gedcom_search.GedComSearch(individuals, sources)
+    print(f'Search index of {len(search.words)} words in {len(individuals)} individuals and {len(sources)} sources in {time.time() - startTime:.3f}s.')
+
+    # The queries are the start of words from the index and pairs of words from the same individual.
+    random.seed(1)
+    queries = []
+    for _ in range(100):
+        word = random.choice(search.words)
+        queries.append(word[:random.randint(1, len(word))])
+    for individual in random.sample(individuals, min(100, len(individuals))):
+        words = search.recordWords.get(individual.identity, [])
+        if len(words) > 1:
+            first, second = random.sample(words, 2)
+            queries.append(f'{first[:3]} {second}')
+
+    startTime = time.perf_counter()
+    found = 0
+    for query in queries:
+        found += len(search.getIndividuals(query)) + len(search.getSources(query))
+    elapsedTime = time.perf_counter() - startTime
+    print(f'\t{len(queries)} searches found {found} records in {1000 * elapsedTime / len(queries):.3f}ms per search.')
+
+    # Check a sample of the queries against the words of every individual.
+    errors = 0
+    for query in queries[::10]:
+        prefixes = gedcom_search.GedComSearch.getWords(query)
+        expected = set()
+        for individual in individuals:
+            words = search.recordWords.get(individual.identity, [])
+            isMatch = True
+            for prefix in prefixes:
+                isPrefix = False
+                for word in words:
+                    if word.startswith(prefix):
+                        isPrefix = True
+                isMatch = isMatch and isPrefix
+            if isMatch:
+                expected.add(individual.identity)
+        if expected != set(search.getIndividuals(query)):
+            errors += 1
+    print(f'\t{len(queries[::10])} searches checked, {errors} errors.')
+
+
+
+def testNames(fileName):
+    ''' Benchmark the phonetic name index on the specified gedcom file and compare it with a score of every name. '''
+    individuals = []
+    for record in gedcom_reader.GedComReader.iterRecords(fileName, ('INDI', )):
+        individuals.append(record)
+    startTime = time.time()
+    names = gedcom_names.GedComNames(individuals)
+    print(f'Name index of {len(names.individuals)} names in {len(individuals)} individuals in {time.time() - startTime:.3f}s.')
+
+    # The queries are names from the index with a letter changed, added or removed.
+    random.seed(1)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    queries = []
+    for name in random.sample(sorted(names.individuals), min(100, len(names.individuals))):
+        position = random.randint(0, len(name) - 1)
+        change = random.randint(0, 2)
+        if change == 0:
+            queries.append(name[:position] + random.choice(letters) + name[position + 1:])
+        elif change == 1:
+            queries.append(name[:position] + random.choice(letters) + name[position:])
+        else:
+            queries.append(name[:position] + name[position + 1:])
+    for individual in random.sample(individuals, min(100, len(individuals))):
+        queries.append(f'{individual.givenName} {individual.surname}')
+
+    startTime = time.perf_counter()
+    found = 0
+    for query in queries:
+        found += len(names.getIndividuals(query, 100))
+    elapsedTime = time.perf_counter() - startTime
+    print(f'\t{len(queries)} searches found {found} individuals in {1000 * elapsedTime / len(queries):.3f}ms per search.')
+
+    # Check that the names within one edit of a sample of the queries are found.
+    missing = 0
+    for query in queries[:100:5]:
+        matches = names.getMatches(query)
+        for name in names.individuals:
+            if gedcom_names.GedComNames.getDistance(query, name) <= 1 and len(name) > 3 and name not in matches:
+                missing += 1
+    print(f'\t{len(queries[:100:5])} searches checked, {missing} names within one edit missed.')
+
+
+
 def main():
     ''' Entry point for the gedcom viewer. '''
     # Process the command line arguments.
@@ -63,9 +485,40 @@ def main():
     argParse = argparse.ArgumentParser(prog='test', description='Test the python gedcom library.')
     argParse.add_argument('gedcom', nargs='?', help='The gedcom file to view.')
     argParse.add_argument('-d', '--date', help='Test the gedcom date class.', action='store_true')
+    argParse.add_argument('-n', '--nesting', help='Benchmark the parsers on deeply nested records.', action='store_true')
+    argParse.add_argument('-o', '--open', help='Benchmark opening the gedcom file against the old reader.', action='store_true')
+    argParse.add_argument('-s', '--statistics', help='Count the records in the gedcom file with the streaming reader.', action='store_true')
+    argParse.add_argument('-c', '--columns', help='Benchmark the date columns on the gedcom file, this needs numpy.', action='store_true')
+    argParse.add_argument('-m', '--memory', help='Report the memory used by each individual in the gedcom file.', action='store_true')
+    argParse.add_argument('-t', '--round-trip', help='Check that a lazy gedcom file is saved unchanged after its records are viewed.', action='store_true')
+    argParse.add_argument('-r', '--relationships', help='Benchmark the relationship graph on the gedcom file.', action='store_true')
+    argParse.add_argument('-g', '--grid', help='Benchmark the spatial index of the places.', action='store_true')
+    argParse.add_argument('-f', '--find', help='Benchmark the full text search on the gedcom file.', action='store_true')
+    argParse.add_argument('-p', '--phonetic', help='Benchmark the phonetic name index on the gedcom file.', action='store_true')
     args = argParse.parse_args()
 
-    testDates()
+    if args.nesting:
+        testNesting()
+    elif args.open:
+        testOpen(args.gedcom)
+    elif args.statistics:
+        testStatistics(args.gedcom)
+    elif args.columns:
+        testColumns(args.gedcom)
+    elif args.memory:
+        testMemory(args.gedcom)
+    elif args.round_trip:
+        testRoundTrip(args.gedcom)
+    elif args.relationships:
+        testRelationships(args.gedcom)
+    elif args.grid:
+        testGrid()
+    elif args.find:
+        testSearch(args.gedcom)
+    elif args.phonetic:
+        testNames(args.gedcom)
+    else:
+        testDates()
 
 
 
@@ -28,6 +28,9 @@ class Configuration:
     :ivar string flagsDirectory: The directory that contains the flags images.
     '''
 
+    # The home directory for this user and the gedcom program.
+    DIRECTORY = os.path.join(str(pathlib.Path.home()), '.walton', 'gedcom')    # pylint: disable=invalid-name
+
 
 
     def __init__(self):
@@ -40,7 +43,7 @@ class Configuration:
         #else:
         #    self.DIRECTORY = os.getenv('HOME')
         #    self.FILENAME = self.DIRECTORY + '/formulaone.xml'
-        self.DIRECTORY = os.path.join(str(pathlib.Path.home()), '.walton', 'gedcom')    # pylint: disable=invalid-name
+        self.DIRECTORY = Configuration.DIRECTORY                                        # pylint: disable=invalid-name
         self.FILENAME = os.path.join(self.DIRECTORY, 'gedcom-py.xml')                   # pylint: disable=invalid-name
 
         # Check that the configuration directory exists.
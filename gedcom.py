@@ -12,6 +12,8 @@ import argparse
 import platform
 import subprocess
 import datetime
+import gc
+import threading
 from enum import Enum
 
 # Application libraries.
@@ -25,7 +27,23 @@ from gedcom_family import GedComFamily
 from gedcom_source import GedComSource
 from gedcom_media import GedComMedia
 from gedcom_tag import GedComTag
+from gedcom_line import GedComLine
+from gedcom_block import GedComBlock
+from gedcom_records import GedComRecords
+from gedcom_index import GedComIndex
+from gedcom_cache import GedComCache
+from gedcom_parallel import GedComParallel
+from gedcom_reader import GedComReader
+from gedcom_writer import GedComWriter
+from gedcom_identities import GedComIdentities
+from gedcom_relationships import GedComRelationships
+from gedcom_kinship import GedComKinship
+from gedcom_citations import GedComCitations
+from gedcom_place_usage import GedComPlaceUsage
 from place import Place
+from place_grid import PlaceGrid
+from gedcom_search import GedComSearch
+from gedcom_names import GedComNames
 
 
 
@@ -36,6 +54,7 @@ class GedComObjects(Enum):
     SOURCE = 4
     REPOSITORY = 5
     HEADER = 6
+    TRAILER = 7
     UNKNOWN = 99
 
 
@@ -44,141 +63,450 @@ class GedCom:
     '''
     Class to represent a gedcom file.
 
-    :ivar dict(GedComIndividual) individuals: Collection of individuals in this gedcom.
-    :ivar dict(GedComFamily) families: Collection of families in this gedcom.
+    :ivar GedComRecords individuals: Collection of individuals in this gedcom.
+    :ivar GedComRecords families: Collection of families in this gedcom.
+    :ivar GedComRecords media: Collection of media in this gedcom.
+    :ivar GedComRecords sources: Collection of sources in this gedcom.
     :ivar string defaultIdentity: The identity of the default individual.
+    :ivar bool isLazy: True if the records were opened lazily and are only built when first used.
+    :ivar GedComIndex index: The index of the records in the gedcom file in lazy mode.
+    :ivar bool isLoading: True while the records are being built in the background.
+    :ivar threading.Thread loader: The background thread that builds the records or None.
+    :ivar GedComRelationships relationships: The relationship graph of the individuals or None until it is first used.
+    :ivar GedComKinship kinship: The relationship names of the individuals or None until it is first used.
+    :ivar GedComCitations citations: The index of the records that cite each source or None until it is first used.
+    :ivar GedComPlaceUsage placeUsage: The index of the records at each place or None until it is first used.
+    :ivar PlaceGrid placeGrid: The spatial index of the places or None until it is first used.
+    :ivar GedComSearch search: The full text index of the individuals and sources or None until it is first used.
+    :ivar GedComNames names: The phonetic index of the names of the individuals or None until it is first used.
     '''
 
-
-
     def __init__(self):
         ''' Class constructor for GedCom objects. '''
         self.defaultIdentity = None
-        self.individuals = {}
-        self.families = {}
-        self.media = {}
-        self.sources = {}
+        self.individuals = GedComRecords()
+        self.families = GedComRecords()
+        self.media = GedComRecords()
+        self.sources = GedComRecords()
         self.fileName = None
         self.isDirty = False
-        Place.allPlaces = {}
+        self.isLazy = False
+        self.index = None
+        self.isLoading = False
+        self.loader = None
+        self.relationships = None
+        self.kinship = None
+        self.citations = None
+        self.placeUsage = None
+        self.placeGrid = None
+        self.search = None
+        self.names = None
+        Place.reset()
+        GedComIdentities.reset()
         GedComIndividual.gedcom = self
         GedComFamily.gedcom = self
         GedComSource.gedcom = self
         GedComTag.gedcom = self
+        GedComMedia.gedcom = self
 
 
 
     def new(self):
         ''' Start a new empty gedcom. '''
+        self.closeIndex()
         self.defaultIdentity = None
-        self.individuals = {}
-        self.families = {}
-        self.media = {}
-        self.sources = {}
+        self.individuals = GedComRecords()
+        self.families = GedComRecords()
+        self.media = GedComRecords()
+        self.sources = GedComRecords()
         self.fileName = None
         self.isDirty = False
-        Place.allPlaces = {}
+        self.isLazy = False
+        self.relationships = None
+        self.kinship = None
+        self.citations = None
+        self.placeUsage = None
+        self.placeGrid = None
+        self.search = None
+        self.names = None
+        Place.reset()
+        GedComIdentities.reset()
+
+
+
+    def getRelationships(self):
+        ''' Returns the relationship graph of the individuals.  The graph is built on the first call after the gedcom is opened or changed. '''
+        relationships = self.relationships
+        if relationships is None:
+            relationships = GedComRelationships(self.individuals, self.families)
+            self.relationships = relationships
+        return relationships
+
+
+
+    def isRelationshipsReady(self):
+        '''
+        Returns True if the relationship graph exists or can be built from records that are already built.
+        While the records are lazy or still loading, building the graph would build every record on the calling thread.
+        '''
+        return self.relationships is not None or not (self.isLazy or self.isLoading)
+
+
+
+    def resetRelationships(self):
+        ''' Discard the relationship graph after the links between the individuals and families have changed. '''
+        self.relationships = None
+        self.kinship = None
+
+
+
+    def getKinship(self):
+        ''' Returns the relationship names of the individuals.  This is built on the first call after the gedcom is opened or changed. '''
+        kinship = self.kinship
+        if kinship is None:
+            kinship = GedComKinship(self.getRelationships(), self.individuals)
+            self.kinship = kinship
+        return kinship
+
+
+
+    def getCitations(self):
+        ''' Returns the index of the records that cite each source.  This is built on the first call after the gedcom is opened. '''
+        citations = self.citations
+        if citations is None:
+            citations = GedComCitations(self.individuals.values(), self.families.values())
+            self.citations = citations
+        return citations
+
+
+
+    def getPlaceUsage(self):
+        ''' Returns the index of the records at each place.  This is built on the first call after the gedcom is opened. '''
+        placeUsage = self.placeUsage
+        if placeUsage is None:
+            # The places are only complete when all the records are built.
+            self.buildAll()
+            placeUsage = GedComPlaceUsage(self.individuals.values(), self.families.values(), self.sources.values())
+            self.placeUsage = placeUsage
+        return placeUsage
+
+
+
+    def getPlaceGrid(self):
+        ''' Returns the spatial index of the places.  This is built on the first call after the gedcom is opened or edited. '''
+        placeGrid = self.placeGrid
+        if placeGrid is None:
+            # The places are only complete when all the records are built.
+            self.buildAll()
+            placeGrid = PlaceGrid(Place.allPlaces.values())
+            self.placeGrid = placeGrid
+        return placeGrid
+
+
+
+    def getSearch(self):
+        ''' Returns the full text index of the individuals and sources.  This is built on the first call after the gedcom is opened. '''
+        search = self.search
+        if search is None:
+            # The index needs every record, so build the lazy records first.
+            self.buildAll()
+            search = GedComSearch(self.individuals.values(), self.sources.values())
+            self.search = search
+        return search
+
+
+
+    def getNames(self):
+        ''' Returns the phonetic index of the names of the individuals.  This is built on the first call after the gedcom is opened. '''
+        names = self.names
+        if names is None:
+            # The index needs every individual, so build the lazy records first.
+            self.buildAll()
+            names = GedComNames(self.individuals.values())
+            self.names = names
+        return names
+
+
+
+    def updateIndexes(self, record):
+        ''' Update the indexes of the citations, places, search and names after the specified individual, family or source has been edited. '''
+        # An edit can add places or coordinates, the spatial index is built again when it is next used.
+        self.placeGrid = None
+        if isinstance(record, GedComIndividual):
+            if self.citations is not None:
+                self.citations.updateIndividual(record)
+            if self.placeUsage is not None:
+                self.placeUsage.updateIndividual(record)
+            if self.search is not None:
+                self.search.updateIndividual(record)
+            if self.names is not None:
+                self.names.updateIndividual(record)
+        elif isinstance(record, GedComFamily):
+            if self.citations is not None:
+                self.citations.updateFamily(record)
+            if self.placeUsage is not None:
+                self.placeUsage.updateFamily(record)
+        elif isinstance(record, GedComSource):
+            if self.placeUsage is not None:
+                self.placeUsage.updateSource(record)
+            if self.search is not None:
+                self.search.updateSource(record)
 
 
 
     def getNextBlock(self, gedcom, start):
-        ''' Returns the next block and next position in the gedcom lines or empty list at the end. '''
-        block = []
-        if start >= len(gedcom):
-            return block, start
+        ''' Returns the next block and next position in the gedcom lines or an empty block at the end. '''
+        return GedComBlock.toBlock(gedcom).getNextBlock(start)
+
+
+
+    def getRecords(self, tag):
+        ''' Returns the records for the specified level 0 tag, for example :py:attr:`individuals` for 'INDI', or None when the tag is not a record. '''
+        if tag == 'INDI':
+            return self.individuals
+        if tag == 'FAM':
+            return self.families
+        if tag == 'SOUR':
+            return self.sources
+        if tag == 'OBJE':
+            return self.media
+        return None
+
+
+
+    def addRecord(self, tag, record):
+        ''' Add the specified record with the specified level 0 tag to this gedcom.  The first individual is the default individual. '''
+        if tag == 'INDI' and self.defaultIdentity is None:
+            self.defaultIdentity = record.identity
+        self.getRecords(tag)[record.identity] = record
 
-        level = gedcom[start][:1]
-        # print(f'level = {level}')
-        block.append(gedcom[start])
-        # print(f'\t{gedcom[start]}')
-        start += 1
-        while start < len(gedcom) and gedcom[start][:1] > level:
-            # print(f'\t{gedcom[start]}')
-            block.append(gedcom[start])
-            start += 1
 
-        # Return the block and the next start position.
-        return block, start
 
+    def addObject(self, objectLines):
+        ''' Add the gedcom object in the specified lines to this gedcom. '''
+        if len(objectLines) == 0:
+            return
+        tag = objectLines[0].tag
+        record = GedComReader.createRecord(tag, objectLines)
+        if record is not None:
+            self.addRecord(tag, record)
 
 
-    def open(self, fileName):
-        ''' Open the specified gedcom file. '''
+
+    def createIndividual(self, lines):
+        ''' Returns a new individual built from the specified lines. '''
+        individual = GedComIndividual(lines)
+        if len(individual.familyIdentities) > 1:
+            individual.familyIdentities.sort(key=individual.byDateOfMarriage)
+        return individual
+
+
+
+    def createMedia(self, lines):
+        ''' Returns a new media object built from the specified lines. '''
+        return GedComMedia(self, lines)
+
+
+
+    def buildAll(self):
+        ''' Build all the records that were opened lazily.  This completes the places. '''
+        if not self.isLazy:
+            return
+        for records in (self.individuals, self.families, self.sources, self.media):
+            records.buildAll()
+        self.isLazy = False
+
+
+
+    def open(self, fileName, isLazy = False, isCache = False, workers = 1):
+        '''
+        Open the specified gedcom file.
+        In lazy mode the records are only built when they are first used.
+        With the cache the records are loaded from the cache when the gedcom file has not changed.
+        With more than one worker the records are parsed in that number of processes.
+        '''
         print(f'open(\'{fileName}\')')
-        file = open(fileName, 'r')
-        objectType = GedComObjects.UNKNOWN
-        objectLines = []
+        self.closeIndex()
         self.fileName = fileName
         self.mediaFolder = '/home/steve/Documents/Waltons/Family Tree/'
         self.defaultIdentity = None
-        self.individuals = {}
-        self.families = {}
-        self.media = {}
-        self.sources = {}
-        Place.allPlaces = {}
-        line = file.readline().rstrip('\n')
-        while line != '':
-            if line[:1] == '0':
-                if objectType == GedComObjects.INDIVIDUAL:
-                    # Add a new individual.
-                    individual = GedComIndividual(objectLines)
-                    if len(self.individuals) == 0:
-                        self.defaultIdentity = individual.identity
-                    self.individuals[individual.identity] = individual
-                elif objectType == GedComObjects.FAMILY:
-                    family = GedComFamily(objectLines)
-                    self.families[family.identity] = family
-                elif objectType == GedComObjects.SOURCE:
-                    source = GedComSource(objectLines)
-                    self.sources[source.identity] = source
-                elif objectType == GedComObjects.MEDIA:
-                    media = GedComMedia(self, objectLines)
-                    self.media[media.identity] = media
-                elif objectType == GedComObjects.REPOSITORY:
-                    pass
-                elif objectType == GedComObjects.HEADER:
-                    pass
-                else:
-                    if len(objectLines) > 0:
-                        print('Unknown Gedcom object.')
-                        print(f'\t{objectLines[0]}')
-
-                # Start a new object.
-                if line[-4:] == 'INDI':
-                    objectType = GedComObjects.INDIVIDUAL
-                elif line[-3:] == 'FAM':
-                    objectType = GedComObjects.FAMILY
-                elif line[-4:] == 'OBJE':
-                    objectType = GedComObjects.MEDIA
-                elif line[-4:] == 'SOUR':
-                    objectType = GedComObjects.SOURCE
-                elif line[-4:] == 'REPO':
-                    objectType = GedComObjects.REPOSITORY
-                elif line[-4:] == 'HEAD':
-                    # Gedcom Header, tag at the start of a gedcom file.
-                    objectType = GedComObjects.HEADER
-                elif line[-4:] == 'TRLR':
-                    # Gedcom Trailer, tag at the end of a gedcom file.
-                    objectType = GedComObjects.UNKNOWN
-                else:
-                    print(line[-4:])
-                    objectType = GedComObjects.UNKNOWN
-                objectLines = []
-
-            # Add line to current group.
-            objectLines.append(line)
-
-            # Read the next line.
-            line = file.readline().rstrip('\n')
-        file.close()
+        self.individuals = GedComRecords(self.createIndividual)
+        self.families = GedComRecords(GedComFamily)
+        self.media = GedComRecords(self.createMedia)
+        self.sources = GedComRecords(GedComSource)
+        self.isLazy = isLazy
+        self.relationships = None
+        self.kinship = None
+        self.citations = None
+        self.placeUsage = None
+        self.placeGrid = None
+        self.search = None
+        self.names = None
+        Place.reset()
+        GedComIdentities.reset()
+        if isLazy:
+            self.openLazy(fileName)
+        elif isCache:
+            self.openCache(fileName, workers)
+        else:
+            self.parseFile(fileName, workers)
+
+        self.isDirty = False
+
+        print(f'There are {len(self.individuals)} individuals, {len(self.families)} families, {len(self.media)} media and {len(self.sources)} sources.')
+
+
+
+    def parseFile(self, fileName, workers = 1):
+        ''' Parse all the records in the specified gedcom file. '''
+        if workers > 1:
+            self.parseParallel(fileName, workers)
+            return
+        objectLines = []
+        # The loaded objects are all kept, so the garbage collector is paused while loading.
+        isCollecting = gc.isenabled()
+        gc.disable()
+        try:
+            # Each line is tokenized once by the reader.
+            for line in GedComLine.readFile(fileName):
+                if line.level == 0:
+                    self.addObject(objectLines)
+
+                    # Start a new object.
+                    objectLines = []
+
+                # Add line to current group.
+                objectLines.append(line)
+            self.addObject(objectLines)
+        finally:
+            if isCollecting:
+                gc.enable()
 
         # Sort the familes by date order.
         for individual in self.individuals.values():
-            individual.familyIdentities.sort(key=individual.byDateOfMarriage)
+            if len(individual.familyIdentities) > 1:
+                individual.familyIdentities.sort(key=individual.byDateOfMarriage)
 
-        self.isDirty = False
 
-        print(f'There are {len(self.individuals)} individuals, {len(self.families)} families, {len(self.media)} media and {len(self.sources)} sources.')
+
+    def parseParallel(self, fileName, workers):
+        ''' Parse all the records in the specified gedcom file with the specified number of processes. '''
+        isCollecting = gc.isenabled()
+        gc.disable()
+        try:
+            # The chunks are returned in the order of the file.
+            for records, places in GedComParallel.parseFile(fileName, workers):
+                for tag, record in records:
+                    self.addRecord(tag, record)
+                Place.mergePlaces(places)
+        finally:
+            if isCollecting:
+                gc.enable()
+
+        # Sort the familes by date order.
+        for individual in self.individuals.values():
+            if len(individual.familyIdentities) > 1:
+                individual.familyIdentities.sort(key=individual.byDateOfMarriage)
+
+
+
+    def openCache(self, fileName, workers = 1):
+        ''' Load the records from the cache of the specified gedcom file.  If the cache is not valid then parse the file and update the cache. '''
+        cache = GedComCache(fileName)
+        isCollecting = gc.isenabled()
+        gc.disable()
+        try:
+            objects = cache.load()
+        finally:
+            if isCollecting:
+                gc.enable()
+        if objects is None:
+            self.parseFile(fileName, workers)
+            cache.save((self.defaultIdentity, dict(self.individuals), dict(self.families), dict(self.sources), dict(self.media), Place.allPlaces))
+            return
+
+        print(f'Loaded from cache \'{cache.cacheFileName}\'.')
+        self.defaultIdentity, individuals, families, sources, media, allPlaces = objects
+        Place.reset(allPlaces)
+        self.individuals.update(individuals)
+        self.families.update(families)
+        self.sources.update(sources)
+        self.media.update(media)
+
+
+
+    def openLazy(self, fileName):
+        ''' Index the records in the specified gedcom file by the byte range of their text. '''
+        self.index = GedComIndex(fileName)
+        for records in (self.individuals, self.families, self.sources, self.media):
+            records.reader = self.index.getText
+        for tag, identity, start, end in self.index.records:
+            records = self.getRecords(tag)
+            if records is not None and identity is not None:
+                if tag == 'INDI' and self.defaultIdentity is None:
+                    self.defaultIdentity = identity
+                records.addOffsets(identity, start, end)
+            else:
+                self.addObject(GedComLine.fromText(self.index.getText(start, end)))
+
+
+
+    def startLoading(self, onProgress = None):
+        '''
+        Build the records of a lazily opened gedcom in a background thread.
+        The records are still built on demand by the main thread while the background thread is running.
+        The onProgress(count, total) function is called from the background thread as the records are built.
+        '''
+        if not self.isLazy or self.loader is not None:
+            return
+        self.isLoading = True
+        self.loader = threading.Thread(target=self.loadAll, args=(onProgress,), daemon=True)
+        self.loader.start()
+
+
+
+    def loadAll(self, onProgress):
+        ''' Build all the records that were opened lazily in the order of the file.  This runs in the background thread. '''
+        total = len(self.individuals) + len(self.families) + len(self.sources) + len(self.media)
+        count = 0
+        isCollecting = gc.isenabled()
+        gc.disable()
+        try:
+            for records in (self.individuals, self.families, self.sources, self.media):
+                # New records might be added by the main thread.
+                for identity in list(records):
+                    if not self.isLoading:
+                        # The gedcom has been closed.
+                        return
+                    records[identity]
+                    count += 1
+                    if onProgress is not None and count % 1000 == 0:
+                        onProgress(count, total)
+        finally:
+            if isCollecting:
+                gc.enable()
+        self.isLazy = False
+        self.isLoading = False
+        if onProgress is not None:
+            onProgress(total, total)
+
+
+
+    def stopLoading(self):
+        ''' Stop the background thread that builds the records. '''
+        if self.loader is not None:
+            self.isLoading = False
+            self.loader.join()
+            self.loader = None
+
+
+
+    def closeIndex(self):
+        ''' Release the index of the gedcom file. '''
+        self.stopLoading()
+        if self.index is not None:
+            self.index.close()
+            self.index = None
 
 
 
@@ -189,57 +517,65 @@ class GedCom:
 
 
 
-    def writeLines(self, file, lines):
-        ''' Write lines into the specified file with line feeds. '''
-        for line in lines:
-            file.write(f'{line}\n')
-
+    def writeRecord(self, writer, records, identity):
+        '''
+        Write the record with the specified identity into the writer.
+        A record that has not been built or has not changed is written from its original text.
+        A changed record is written from :py:func:`toGedCom` and the new lines become its original text.
+        '''
+        text = records.getText(identity)
+        if text is not None:
+            writer.write(text if text.endswith('\n') else f'{text}\n')
+            return
+        record = records[identity]
+        if isinstance(record.gedcomFile, GedComBlock) and not record.isDirty:
+            writer.write(f'{record.gedcomFile}\n')
+            return
+        lines = record.toGedCom()
+        writer.writeLines(lines)
+        record.gedcomFile = GedComBlock.toBlock(lines)
+        record.isDirty = False
 
 
 
     def saveAs(self, fileName):
         ''' Save the current gedcom with the specified file name. '''
         print(f'Save gedcom as {fileName}')
-        file = open(fileName, 'w')
-
-        # Write the file header.
-        file.write('0 HEAD\n')
-        file.write('1 SOUR gedcom-py\n')
-        file.write('2 NAME gedcom-py\n')
-        file.write('2 VERS 1.0.0\n')
-        file.write('1 DEST DISKETTE\n')
-        now = datetime.datetime.now()
-        file.write(f'1 DATE {now.day} {now.strftime("%b").upper()} {now.year}\n')
-        file.write(f'2 TIME {now.strftime("%H:%M:%S")}\n')
-        file.write('1 CHAR UTF-8\n')
-        file.write(f'1 FILE {os.path.basename(fileName)}\n')
-
-        # Write the individuals.
-        for individual in self.individuals.values():
-            self.writeLines(file, individual.toGedCom())
-
-        # Write the familes.
-        for family in self.families.values():
-            self.writeLines(file, family.toGedCom())
-
-        # Write the sources.
-        for source in self.sources.values():
-            self.writeLines(file, source.toGedCom())
-
-        # Write the media.
-        for media in self.media.values():
-            self.writeLines(file, media.toGedCom())
-
-        # Write the repositories.
-        file.write('0 @R0001@ REPO\n')
-        file.write('1 NAME Steve Walton\n')
-        file.write('0 @R0002@ REPO\n')
-        file.write('1 NAME Genes Reunited\n')
-        file.write('1 WWW www.genesreunited.co.uk\n')
-
-        # Close the file.
-        file.write('0 TRLR\n')
-        file.close()
+        if os.name == 'nt' and self.index is not None and os.path.abspath(fileName) == os.path.abspath(self.index.fileName):
+            # Windows can not replace a file that is memory mapped, so build the lazy records and release the map.
+            self.buildAll()
+            self.closeIndex()
+
+        # The file is only replaced when it is complete.
+        with GedComWriter(fileName) as writer:
+            # Write the file header.
+            now = datetime.datetime.now()
+            writer.writeLines([
+                '0 HEAD',
+                '1 SOUR gedcom-py',
+                '2 NAME gedcom-py',
+                '2 VERS 1.0.0',
+                '1 DEST DISKETTE',
+                f'1 DATE {now.day} {now.strftime("%b").upper()} {now.year}',
+                f'2 TIME {now.strftime("%H:%M:%S")}',
+                '1 CHAR UTF-8',
+                f'1 FILE {os.path.basename(fileName)}'
+            ])
+
+            # Write the individuals, familes, sources and media.
+            for records in (self.individuals, self.families, self.sources, self.media):
+                for identity in records:
+                    self.writeRecord(writer, records, identity)
+
+            # Write the repositories.
+            writer.writeLines([
+                '0 @R0001@ REPO',
+                '1 NAME Steve Walton',
+                '0 @R0002@ REPO',
+                '1 NAME Genes Reunited',
+                '1 WWW www.genesreunited.co.uk',
+                '0 TRLR'
+            ])
 
         self.isDirty = False
 
@@ -265,6 +601,10 @@ def main():
     argParse.add_argument('gedcom', nargs='?', help='The gedcom file to view.')
     argParse.add_argument('-i', '--install', help='Install the program and desktop link.', action='store_true')
     argParse.add_argument('-u', '--uninstall', help='Uninstall the program.', action='store_true')
+    argParse.add_argument('-l', '--lazy', help='Only build the gedcom records when they are first used.', action='store_true')
+    argParse.add_argument('-n', '--no-cache', help='Do not use the cache of the parsed gedcom file.', action='store_true')
+    argParse.add_argument('-j', '--jobs', help='The number of processes to parse the gedcom file.', type=int, default=1)
+    argParse.add_argument('-b', '--background', help='Show the window straight away and build the gedcom records in the background.', action='store_true')
     args = argParse.parse_args()
 
     if args.install:
@@ -299,7 +639,8 @@ def main():
 
     gedCom = GedCom()
     if os.path.exists(args.gedcom):
-        gedCom.open(args.gedcom)
+        # In background mode only the index of the records is built before the window is shown.
+        gedCom.open(args.gedcom, args.lazy or args.background, not args.no_cache, args.jobs)
     else:
         print(f"'{args.gedcom}' is missing.")
 
@@ -310,6 +651,8 @@ def main():
         wxApp = widget_wx.main_window.WxApp(application)
         application.postRenderPage = wxApp.frame.displayCurrentPage
         application.actions = wxApp.frame.actions
+        if args.background:
+            gedCom.startLoading(wxApp.frame.postLoadProgress)
 
         # Inspection debugging.
         # import wx.lib.inspection
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support blocks of lines in the gedcom python library.
+This module implements the :py:class:`GedComBlock` class.
+'''
+# System Libraries.
+
+# Application Libraries.
+from gedcom_line import GedComLine
+
+
+
+class GedComBlock:
+    '''
+    Class to represent a block of consecutive gedcom lines.
+    The block is a view into a shared list of lines, the lines are not copied.
+
+    :ivar list lines: The shared list of :py:class:`GedComLine` objects.
+    :ivar int start: The position of the first line of the block in the shared list.
+    :ivar int end: The position after the last line of the block in the shared list.
+    :ivar GedComLine first: The first line of the block or None for an empty block.
+    :ivar str text: The text of a block from :py:func:`fromText` that has not been tokenized yet.
+    '''
+    __slots__ = ('lines', 'start', 'end', 'first', 'text')
+
+
+
+    def toBlock(block):
+        '''
+        Returns the parameter as a :py:class:`GedComBlock` object.
+        The parameter can be a block, a list of :py:class:`GedComLine` objects or a list of strings.
+        '''
+        if isinstance(block, GedComBlock):
+            return block
+        if len(block) > 0 and isinstance(block[0], str):
+            block = GedComLine.fromText('\n'.join(block))
+        return GedComBlock(block, 0, len(block))
+
+
+
+    def fromText(text):
+        ''' Returns a block for the specified gedcom text.  The text is only tokenized when the block is used. '''
+        block = GedComBlock.__new__(GedComBlock)
+        block.text = text
+        return block
+
+
+
+    def isBlock(block):
+        ''' Returns True if the parameter is a block or a list of lines. '''
+        return isinstance(block, (GedComBlock, list))
+
+
+
+    def __init__(self, lines, start, end):
+        ''' Class constructor for the :py:class:`GedComBlock` class. '''
+        self.lines = lines
+        self.start = start
+        self.end = end
+        self.first = lines[start] if start < end else None
+
+
+
+    def __getattr__(self, name):
+        ''' Magic Method to tokenize the text of a block from :py:func:`fromText` the first time its lines are used. '''
+        if name not in ('lines', 'start', 'end', 'first'):
+            raise AttributeError(name)
+        lines = GedComLine.fromText(self.text)
+        self.lines = lines
+        self.start = 0
+        self.end = len(lines)
+        self.first = lines[0] if len(lines) > 0 else None
+        return getattr(self, name)
+
+
+
+    def __reduce__(self):
+        ''' Magic Method to pickle the block as its text.  The lines are tokenized again when the block is used. '''
+        return (GedComBlock.fromText, (str(self),))
+
+
+
+    def compact(self):
+        ''' Returns a block that only keeps the text of this block.  The lines are tokenized again if the block is used. '''
+        return GedComBlock.fromText(str(self).rstrip('\n'))
+
+
+
+    def __len__(self):
+        ''' Magic Method to return the number of lines in the block. '''
+        return self.end - self.start
+
+
+
+    def __getitem__(self, index):
+        ''' Magic Method to return a line or, for a slice, a sub block. '''
+        try:
+            position = self.start + index if index >= 0 else self.end + index
+        except TypeError:
+            # A slice of the block is a sub block.
+            start, end, step = index.indices(self.end - self.start)
+            if step != 1:
+                return [self.lines[self.start + position] for position in range(start, end, step)]
+            return GedComBlock(self.lines, self.start + start, self.start + max(start, end))
+        if position < self.start or position >= self.end:
+            raise IndexError('GedComBlock index out of range')
+        return self.lines[position]
+
+
+
+    def __iter__(self):
+        ''' Magic Method to iterate through the lines in the block. '''
+        return map(self.lines.__getitem__, range(self.start, self.end))
+
+
+
+    def __str__(self):
+        ''' Magic Method to return the block as gedcom text. '''
+        try:
+            # A block from fromText() already has the text.
+            return self.text
+        except AttributeError:
+            return '\n'.join([line.text for line in self.lines[self.start:self.end]])
+
+
+
+    def getNextBlock(self, start):
+        '''
+        Returns the next sub block starting at the specified position in this block and the position after the sub block.
+        At the end of this block an empty block is returned.
+        '''
+        lines = self.lines
+        end = self.end
+        position = self.start + start
+        if position >= end:
+            return GedComBlock(lines, end, end), start
+
+        level = lines[position].level
+        next = position + 1
+        while next < end and lines[next].level > level:
+            next += 1
+
+        # Return the block and the next start position.
+        return GedComBlock(lines, position, next), next - self.start
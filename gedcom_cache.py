@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support a persistent cache of parsed gedcom files in the gedcom python library.
+This module implements the :py:class:`GedComCache` class.
+'''
+# System Libraries.
+import os
+import io
+import hashlib
+import pickle
+
+# Application Libraries.
+from configuration import Configuration
+
+
+
+class GedComCache:
+    '''
+    Class to represent the cache of the parsed objects of a gedcom file.
+    The cache is only valid while the size, modified time and hash of the contents of the gedcom file match.
+
+    :ivar str fileName: The full name of the gedcom file.
+    :ivar str cacheFileName: The full name of the cache file for the gedcom file.
+    :ivar int size: The size of the gedcom file in bytes.
+    :ivar int modified: The modified time of the gedcom file in nanoseconds.
+    :ivar str hash: The hash of the contents of the gedcom file or None until it is required.
+    '''
+
+    # The version of the cache files.  Increase this when the cached classes change.
+    VERSION = 5
+
+    # The folder for the cache files below the home directory of the program.
+    DIRECTORY = os.path.join(Configuration.DIRECTORY, 'cache')
+
+
+
+    def __init__(self, fileName):
+        ''' Class constructor for the :py:class:`GedComCache` class. '''
+        self.fileName = os.path.abspath(fileName)
+        self.cacheFileName = os.path.join(GedComCache.DIRECTORY, f'{hashlib.sha1(self.fileName.encode("utf-8")).hexdigest()}.cache')
+        status = os.stat(self.fileName)
+        self.size = status.st_size
+        self.modified = status.st_mtime_ns
+        self.hash = None
+
+
+
+    def getHash(self):
+        ''' Returns the hash of the contents of the gedcom file. '''
+        if self.hash is None:
+            fileHash = hashlib.sha256()
+            with open(self.fileName, 'rb') as file:
+                while True:
+                    chunk = file.read(1024 * 1024)
+                    if len(chunk) == 0:
+                        break
+                    fileHash.update(chunk)
+            self.hash = fileHash.hexdigest()
+        return self.hash
+
+
+
+    def load(self):
+        ''' Returns the cached objects for the gedcom file or None if the cache is missing or out of date. '''
+        if not os.path.exists(self.cacheFileName):
+            return None
+        try:
+            # Read the whole cache in one read.
+            with open(self.cacheFileName, 'rb') as file:
+                stream = io.BytesIO(file.read())
+            version, size, modified, fileHash = pickle.load(stream)
+            if version != GedComCache.VERSION or size != self.size or modified != self.modified:
+                return None
+            if fileHash != self.getHash():
+                return None
+            return pickle.load(stream)
+        except Exception as exception:
+            print(f'Gedcom cache \'{self.cacheFileName}\' is not valid. {exception}')
+            return None
+
+
+
+    def save(self, objects):
+        ''' Write the objects for the gedcom file into the cache. '''
+        temporaryFileName = f'{self.cacheFileName}.tmp'
+        try:
+            os.makedirs(GedComCache.DIRECTORY, exist_ok=True)
+            with open(temporaryFileName, 'wb') as file:
+                pickle.dump((GedComCache.VERSION, self.size, self.modified, self.getHash()), file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(objects, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporaryFileName, self.cacheFileName)
+        except Exception as exception:
+            print(f'Failed to write the gedcom cache \'{self.cacheFileName}\'. {exception}')
+            if os.path.exists(temporaryFileName):
+                os.remove(temporaryFileName)
@@ -13,6 +13,7 @@ from gedcom_source import GedComSource
 from gedcom_date import GedComDate
 from gedcom_place import GedComPlace
 from gedcom_tag import GedComTag
+from gedcom_block import GedComBlock
 
 
 
@@ -30,9 +31,9 @@ class GedComCensus:
         ''' Key for a list sort of census by date. '''
         if isinstance(item, GedComCensus):
             if item.date is None:
-                return datetime.now()
-            return item.date.theDate
-        return datetime.now()
+                return datetime.date.today().toordinal()
+            return item.date.sortKey
+        return datetime.date.today().toordinal()
 
 
 
@@ -56,30 +57,30 @@ class GedComCensus:
             return
 
         # Check that the parameter is a block of lines.
-        if not isinstance(gedcomFile, list):
+        if not GedComBlock.isBlock(gedcomFile):
             return
+        gedcomFile = GedComBlock.toBlock(gedcomFile)
 
         # Fetch the first block.
-        block, start = self.individual.gedcom.getNextBlock(gedcomFile, 1)
+        block, start = gedcomFile.getNextBlock(1)
         while len(block) > 0:
-            # Split into tags.
-            tags = block[0].split()
-            if tags[1] == 'SOUR':
-                self.sources.append(tags[2][1:-1])
-            elif tags[1] == 'DATE':
+            tag = block.first.tag
+            if tag == 'SOUR':
+                self.sources.append(block.first.getPointer())
+            elif tag == 'DATE':
                 self.date = GedComDate(block)
-            elif tags[1] == 'PLAC':
+            elif tag == 'PLAC':
                 self.place = GedComPlace(block)
-            elif tags[1] == 'OCCU' or tags[1] == 'NOTE':
+            elif tag == 'OCCU' or tag == 'NOTE':
                 if self.tags is None:
                     self.tags = []
                 self.tags.append(GedComTag(block))
             else:
                 # Unknown.
-                print(f'CENS unrecogised tag \'{tags[1]}\'')
+                print(f'CENS unrecogised tag \'{tag}\'')
 
             # Fetch the next block.
-            block, start = self.individual.gedcom.getNextBlock(gedcomFile, start)
+            block, start = gedcomFile.getNextBlock(start)
 
 
 
@@ -103,6 +104,14 @@ class GedComCensus:
 
 
 
+    def getLabel(self):
+        ''' Returns the label of the census for the indexes, for example 'Census 1881', or 'Census' when the year is not known. '''
+        if self.date is None or self.date.theDate is None:
+            return 'Census'
+        return f'Census {self.date.theDate.year}'
+
+
+
     def toGedCom(self, level = 1):
         ''' Return the census in GedCom format. '''
         result = []
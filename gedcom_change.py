@@ -9,6 +9,8 @@ import datetime
 import os
 
 # Application libraries.
+from gedcom_block import GedComBlock
+from gedcom_date import GedComDate
 
 
 
@@ -49,27 +51,39 @@ class GedComChange:
             return
 
         # Check that the parameter is a block of lines.
-        if not isinstance(gedcomFile, list):
+        if not GedComBlock.isBlock(gedcomFile):
             return
 
         date = '1 Jan 1980'
         time = '00:00:00'
         # Fetch the data.
-        for line in gedcomFile:
-            # Split into tags.
-            tags = line.split()
-            if tags[1] == 'CHAN':
+        for line in GedComBlock.toBlock(gedcomFile):
+            if line.tag == 'CHAN':
                 pass
-            elif tags[1] == 'DATE':
-                date = line[7:]
-            elif tags[1] == 'TIME':
-                time = line[7:]
-            elif tags[1] == '_PGVU':
-                self.by = line[8:]
+            elif line.tag == 'DATE':
+                date = line.value
+            elif line.tag == 'TIME':
+                time = line.value
+            elif line.tag == '_PGVU':
+                self.by = line.value
             else:
                 # Unknown.
-                print(f'Change unrecogised tag \'{tags[1]}\' \'{line}\'')
-        self.datetime = datetime.datetime.strptime(f'{date} {time}', '%d %b %Y %H:%M:%S')
+                print(f'Change unrecogised tag \'{line.tag}\' \'{line}\'')
+        self.datetime = GedComChange.toDateTime(date, time)
+
+
+
+    def toDateTime(date, time):
+        '''
+        Returns the datetime of the specified date and time of a change, for example '12 MAR 2021' and '10:11:12'.
+        The usual format is split directly because strptime() is slow, anything else is left to strptime().
+        '''
+        try:
+            day, month, year = date.split(' ')
+            hour, minute, second = time.split(':')
+            return datetime.datetime(int(year), GedComDate.MONTHS[month.upper()], int(day), int(hour), int(minute), int(second))
+        except (ValueError, KeyError):
+            return datetime.datetime.strptime(f'{date} {time}', '%d %b %Y %H:%M:%S')
 
 
 
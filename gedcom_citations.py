@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support the index of the source citations in the gedcom python library.
+This module implements the :py:class:`GedComCitations` class.
+'''
+# System Libraries.
+
+# Application Libraries.
+
+
+
+class GedComCitations:
+    '''
+    Class to represent the index from each source to the individuals and families that cite it.
+    Each citation has a label for where the source is used, for example 'Birth Date' or 'Census 1881'.
+    A source on the record itself has an empty label.
+    The index is built once from the records and then each record is updated after it is edited.
+
+    :ivar dict individuals: The identity of each source to a dictionary of the identities of the individuals that cite it to their labels.
+    :ivar dict families: The identity of each source to a dictionary of the identities of the families that cite it to their labels.
+    :ivar dict recordSources: The identity of each record to the identities of the sources that it cites.
+    '''
+
+
+
+    def __init__(self, individuals, families):
+        '''
+        Class constructor for the :py:class:`GedComCitations` class.
+        The individuals and families are the record objects, for example gedcom.individuals.values().
+        '''
+        self.individuals = {}
+        self.families = {}
+        self.recordSources = {}
+        for individual in individuals:
+            self.addIndividual(individual)
+        for family in families:
+            self.addFamily(family)
+
+
+
+    def add(self, citations, sources, recordIdentity, label):
+        ''' Add the specified label of the specified record to each of the specified sources. '''
+        for source in sources:
+            if source not in citations:
+                citations[source] = {}
+            records = citations[source]
+            if recordIdentity not in records:
+                records[recordIdentity] = []
+                if recordIdentity not in self.recordSources:
+                    self.recordSources[recordIdentity] = []
+                self.recordSources[recordIdentity].append(source)
+            if label not in records[recordIdentity]:
+                records[recordIdentity].append(label)
+
+
+
+    def addIndividual(self, individual):
+        ''' Add the citations of the specified individual in the order that they are shown. '''
+        identity = individual.identity
+        self.add(self.individuals, individual.sources, identity, '')
+        self.add(self.individuals, individual.nameSources, identity, 'Name')
+        for tag, name in ((individual.birth, 'Birth'), (individual.death, 'Death')):
+            if tag is not None:
+                if tag.date is not None:
+                    self.add(self.individuals, tag.date.sources, identity, f'{name} Date')
+                if tag.place is not None:
+                    self.add(self.individuals, tag.place.sources, identity, f'{name} Place')
+                self.add(self.individuals, tag.sources, identity, name)
+        if individual.census is not None:
+            for census in individual.census:
+                if census.sources is not None:
+                    self.add(self.individuals, census.sources, identity, census.getLabel())
+
+
+
+    def addFamily(self, family):
+        ''' Add the citations of the specified family in the order that they are shown. '''
+        identity = family.identity
+        if family.marriage is not None:
+            if family.marriage.date is not None:
+                self.add(self.families, family.marriage.date.sources, identity, 'Marriage Date')
+            if family.marriage.place is not None:
+                self.add(self.families, family.marriage.place.sources, identity, 'Marriage Place')
+        if family.divorce is not None:
+            self.add(self.families, family.divorce.sources, identity, 'Divorce')
+            if family.divorce.date is not None:
+                self.add(self.families, family.divorce.date.sources, identity, 'Divorce Date')
+
+
+
+    def removeRecord(self, identity):
+        ''' Remove all the citations of the specified individual or family. '''
+        if identity not in self.recordSources:
+            return
+        for source in self.recordSources.pop(identity):
+            for citations in (self.individuals, self.families):
+                if source in citations and identity in citations[source]:
+                    del citations[source][identity]
+
+
+
+    def updateIndividual(self, individual):
+        ''' Replace the citations of the specified individual after it has been edited. '''
+        self.removeRecord(individual.identity)
+        self.addIndividual(individual)
+
+
+
+    def updateFamily(self, family):
+        ''' Replace the citations of the specified family after it has been edited. '''
+        self.removeRecord(family.identity)
+        self.addFamily(family)
+
+
+
+    def getIndividuals(self, identity):
+        ''' Returns a dictionary of the identities of the individuals that cite the specified source to their labels. '''
+        return self.individuals.get(identity, {})
+
+
+
+    def getFamilies(self, identity):
+        ''' Returns a dictionary of the identities of the families that cite the specified source to their labels. '''
+        return self.families.get(identity, {})
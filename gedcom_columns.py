@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support whole tree statistics with date columns in the gedcom python library.
+This module implements the :py:class:`GedComColumns` class.
+This module requires numpy.
+'''
+# System Libraries.
+import datetime
+import numpy
+
+# Application Libraries.
+from gedcom_date import GedComDate, GedComDateStatus, GedComDateAccuracy
+
+
+
+class GedComColumns:
+    '''
+    Class to represent the dates of a gedcom as numpy columns.
+    A date is the day ordinal of the :py:class:`GedComDate` as an int32 or 0 when the date is unknown.
+    The flags of the date are kept in a matching int16 column so that the queries can mask on the accuracy.
+    The columns are a snapshot, build a new object after the gedcom changes.
+
+    :ivar list individualIdentities: The identities of the individuals in the order of the individual columns.
+    :ivar numpy.ndarray births: The dates of birth of the individuals.
+    :ivar numpy.ndarray birthFlags: The flags of the dates of birth.
+    :ivar numpy.ndarray deaths: The dates of death of the individuals.
+    :ivar numpy.ndarray deathFlags: The flags of the dates of death.
+    :ivar list familyIdentities: The identities of the families in the order of the family columns.
+    :ivar numpy.ndarray marriages: The dates of marriage of the families.
+    :ivar numpy.ndarray marriageFlags: The flags of the dates of marriage.
+    :ivar numpy.ndarray censusIndividuals: The position in the individual columns of the individual for each census.
+    :ivar numpy.ndarray censuses: The dates of the census records.
+    :ivar numpy.ndarray censusFlags: The flags of the dates of the census records.
+    '''
+
+    # The number of years an individual without a date of death is assumed to live.
+    MAXIMUM_AGE = 100
+
+    # The ordinal of the numpy datetime64 epoch, 1 Jan 1970.
+    EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+    # The flags of a date that is exactly known, on the day and with known accuracy.
+    EXACT_FLAGS = GedComDate.STATUSES.index(GedComDateStatus.ON) | (GedComDate.ACCURACIES.index(GedComDateAccuracy.KNOWN) << GedComDate.ACCURACY_SHIFT)
+
+    # The mask of the flags that must match :py:attr:`EXACT_FLAGS` for an exact date.
+    EXACT_MASK = GedComDate.STATUS_MASK | (3 << GedComDate.ACCURACY_SHIFT)
+
+
+
+    def getDate(tag):
+        ''' Returns the (ordinal, flags) of the date of the specified tag. '''
+        if tag is None or tag.date is None:
+            return 0, GedComDate.EMPTY_FLAGS
+        return tag.date.sortKey, tag.date.flags
+
+
+
+    def __init__(self, individuals, families):
+        '''
+        Class constructor for the :py:class:`GedComColumns` class.
+        The individuals and families are the record objects, for example gedcom.individuals.values().
+        '''
+        self.individualIdentities = []
+        births = []
+        deaths = []
+        censusIndividuals = []
+        censuses = []
+        for individual in individuals:
+            position = len(self.individualIdentities)
+            self.individualIdentities.append(individual.identity)
+            births.append(GedComColumns.getDate(individual.birth))
+            deaths.append(GedComColumns.getDate(individual.death))
+            if individual.census is not None:
+                for census in individual.census:
+                    censusIndividuals.append(position)
+                    censuses.append(GedComColumns.getDate(census))
+
+        self.familyIdentities = []
+        marriages = []
+        for family in families:
+            self.familyIdentities.append(family.identity)
+            marriages.append(GedComColumns.getDate(family.marriage))
+
+        self.births, self.birthFlags = GedComColumns.toColumns(births)
+        self.deaths, self.deathFlags = GedComColumns.toColumns(deaths)
+        self.marriages, self.marriageFlags = GedComColumns.toColumns(marriages)
+        self.censusIndividuals = numpy.array(censusIndividuals, dtype=numpy.int32)
+        self.censuses, self.censusFlags = GedComColumns.toColumns(censuses)
+
+
+
+    def toColumns(dates):
+        ''' Returns the ordinal and flags columns for the specified list of (ordinal, flags). '''
+        columns = numpy.array(dates, dtype=numpy.int32).reshape(-1, 2)
+        return numpy.ascontiguousarray(columns[:, 0]), columns[:, 1].astype(numpy.int16)
+
+
+
+    def isExact(flags):
+        ''' Returns the mask of the dates that are exactly known for the specified flags column. '''
+        return (flags & GedComColumns.EXACT_MASK) == GedComColumns.EXACT_FLAGS
+
+
+
+    def toYears(dates):
+        ''' Returns the years of the specified dates column. '''
+        return (dates - GedComColumns.EPOCH).astype('datetime64[D]').astype('datetime64[Y]').astype(numpy.int32) + 1970
+
+
+
+    def getIdentities(self, mask):
+        ''' Returns the identities of the individuals selected by the specified mask. '''
+        return [self.individualIdentities[position] for position in numpy.flatnonzero(mask)]
+
+
+
+    def getAliveIn(self, year, isExactOnly = False):
+        '''
+        Returns the mask of the individuals alive at some time in the specified year.
+        An individual without a date of death is assumed to live :py:attr:`MAXIMUM_AGE` years.
+        '''
+        start = datetime.date(year, 1, 1).toordinal()
+        end = datetime.date(year, 12, 31).toordinal()
+        isBorn = (self.births > 0) & (self.births <= end)
+        isKnownDeath = self.deaths > 0
+        isNotDied = numpy.where(isKnownDeath, self.deaths >= start, self.births + int(GedComColumns.MAXIMUM_AGE * 365.2425) >= start)
+        mask = isBorn & isNotDied
+        if isExactOnly:
+            mask &= GedComColumns.isExact(self.birthFlags) & (~isKnownDeath | GedComColumns.isExact(self.deathFlags))
+        return mask
+
+
+
+    def getAgesAtDeath(self, isExactOnly = False):
+        ''' Returns the (positions, ages) of the individuals with a known date of birth and date of death.  The ages are in whole years. '''
+        mask = (self.births > 0) & (self.deaths > 0)
+        if isExactOnly:
+            mask &= GedComColumns.isExact(self.birthFlags) & GedComColumns.isExact(self.deathFlags)
+        positions = numpy.flatnonzero(mask)
+        births = (self.births[positions] - GedComColumns.EPOCH).astype('datetime64[D]')
+        deaths = (self.deaths[positions] - GedComColumns.EPOCH).astype('datetime64[D]')
+        ages = deaths.astype('datetime64[Y]').astype(numpy.int32) - births.astype('datetime64[Y]').astype(numpy.int32)
+        # Take a year off when the birthday had not been reached in the year of death.
+        birthMonths = births.astype('datetime64[M]').astype(numpy.int32) % 12
+        deathMonths = deaths.astype('datetime64[M]').astype(numpy.int32) % 12
+        birthMonthDays = births - births.astype('datetime64[M]')
+        deathMonthDays = deaths - deaths.astype('datetime64[M]')
+        ages -= (deathMonths < birthMonths) | ((deathMonths == birthMonths) & (deathMonthDays < birthMonthDays))
+        return positions, ages
+
+
+
+    def getAgeAtDeathDistribution(self, binSize = 10, isExactOnly = False):
+        '''
+        Returns the number of individuals that died in each age range of binSize years.  The first range is from 0.
+        The individuals with a date of death before their date of birth are left out.
+        '''
+        _, ages = self.getAgesAtDeath(isExactOnly)
+        return numpy.bincount(ages[ages >= 0] // binSize)
+
+
+
+    def getMarriagesPerDecade(self, isExactOnly = False):
+        ''' Returns the (decades, counts) of the marriages with a known date. '''
+        mask = self.marriages > 0
+        if isExactOnly:
+            mask &= GedComColumns.isExact(self.marriageFlags)
+        decades = GedComColumns.toYears(self.marriages[mask]) // 10 * 10
+        return numpy.unique(decades, return_counts=True)
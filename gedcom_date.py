@@ -6,8 +6,13 @@ This module implements the :py:class:`GedComDate` class.
 '''
 # System Libraries.
 import datetime
+import functools
+import re
 from enum import Enum
 
+# Application Libraries.
+from gedcom_block import GedComBlock
+
 
 
 class GedComDateStatus(Enum):
@@ -36,10 +41,58 @@ class GedComDateAccuracy(Enum):
 class GedComDate:
     '''
     Class to represent a date in the gedcom python library.
+    The date is stored as the ordinal of the day and a single integer with the statuses packed into its bits.
+    A dual dated year, for example 1731/32 from before the calendar change, is stored as the later year.
 
+    :ivar int sortKey: The proleptic Gregorian ordinal of the date or 0 for an unknown date.  This is the key to sort dates.
+    :ivar int flags: The status, accuracy, day status, month status, year status and dual dated flag packed into an integer.
+    :ivar GedComDate the2ndDate: The end date of a BET ... AND or FROM ... TO range or None.
+    :ivar list sources: The identities of the sources for the date.
     :ivar GedComDateStatus status: The status of the date, EMPTY, ON, BEFORE, AFTER.
     :ivar GedComDateAccuracy accuracy: The accuracy of the date, KNOWN, ABOUT, ESTIMATED, CALCULATED
     '''
+    __slots__ = ('sortKey', 'flags', 'the2ndDate', 'sources')
+
+    # The month numbers from the gedcom month names.
+    MONTHS = {'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6, 'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12}
+
+    # The words that set the status of a date.
+    STATUS_PREFIXES = {
+        'BEF'  : GedComDateStatus.BEFORE,
+        'AFT'  : GedComDateStatus.AFTER,
+        'BET'  : GedComDateStatus.BETWEEN,
+        'FROM' : GedComDateStatus.FROM,
+    }
+
+    # The words that set the accuracy of a date.
+    ACCURACY_PREFIXES = {
+        'ABT' : GedComDateAccuracy.ABOUT,
+        'EST' : GedComDateAccuracy.ESTIMATED,
+        'CAL' : GedComDateAccuracy.CALCULATED,
+    }
+
+    # The common date formats, an optional BEF, AFT, ABT, EST or CAL then an optional day, an optional month and a year or a dual dated year.
+    COMMON_FORMAT = re.compile(r'(?:(BEF|AFT|ABT|EST|CAL) )?(?:([0-9]{1,2}) )?(?:(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC) )?([0-9]{1,4})(?:/([0-9]{1,2}))?')
+
+    # The dual dated year format, for example 1731/32.
+    DUAL_YEAR = re.compile(r'([0-9]{1,4})/([0-9]{1,2})')
+
+    # The values of the packed fields in the flags, the position in the tuple is the value in the flags.
+    STATUSES = (GedComDateStatus.EMPTY, GedComDateStatus.ON, GedComDateStatus.BEFORE, GedComDateStatus.AFTER, GedComDateStatus.BETWEEN, GedComDateStatus.FROM, GedComDateStatus.NOT_ON)
+    ACCURACIES = (GedComDateAccuracy.KNOWN, GedComDateAccuracy.ABOUT, GedComDateAccuracy.ESTIMATED, GedComDateAccuracy.CALCULATED)
+    PART_STATUSES = (GedComDateStatus.UNKNOWN, GedComDateStatus.KNOWN, GedComDateStatus.GUESS)
+
+    # The positions of the packed fields in the flags.
+    STATUS_MASK = 0x0F
+    ACCURACY_SHIFT = 4
+    DAY_SHIFT = 6
+    MONTH_SHIFT = 8
+    YEAR_SHIFT = 10
+    DUAL_DATED = 0x1000
+
+    # The flags of an empty date, all the fields are the first value in their tuple.
+    EMPTY_FLAGS = 0
+
 
 
     def __init__(self, dateString = None):
@@ -52,13 +105,94 @@ class GedComDate:
 
     def __lt__(self, other):
         ''' Magic Method to define < behaviour. '''
-        if self.theDate is None:
+        if self.sortKey == 0:
             return True
         if other is None:
             return False
-        if other.theDate is None:
-            return False
-        return self.theDate < other.theDate
+        return self.sortKey < other.sortKey
+
+
+
+    def __getstate__(self):
+        ''' Magic Method to return the state of the date for pickle. '''
+        return (self.sortKey, self.flags, self.the2ndDate, self.sources)
+
+
+
+    def __setstate__(self, state):
+        ''' Magic Method to restore the state of the date from pickle. '''
+        self.sortKey, self.flags, self.the2ndDate, self.sources = state
+
+
+
+    def pack(status, accuracy, dayStatus, monthStatus, yearStatus, isDualDated = False):
+        ''' Returns the flags for the specified statuses. '''
+        flags = GedComDate.STATUSES.index(status)
+        flags |= GedComDate.ACCURACIES.index(accuracy) << GedComDate.ACCURACY_SHIFT
+        flags |= GedComDate.PART_STATUSES.index(dayStatus) << GedComDate.DAY_SHIFT
+        flags |= GedComDate.PART_STATUSES.index(monthStatus) << GedComDate.MONTH_SHIFT
+        flags |= GedComDate.PART_STATUSES.index(yearStatus) << GedComDate.YEAR_SHIFT
+        if isDualDated:
+            flags |= GedComDate.DUAL_DATED
+        return flags
+
+
+
+    @property
+    def status(self):
+        ''' The status of the date, EMPTY, ON, BEFORE, AFTER. '''
+        return GedComDate.STATUSES[self.flags & GedComDate.STATUS_MASK]
+
+
+
+    @status.setter
+    def status(self, status):
+        ''' Set the status of the date. '''
+        self.flags = (self.flags & ~GedComDate.STATUS_MASK) | GedComDate.STATUSES.index(status)
+
+
+
+    @property
+    def accuracy(self):
+        ''' The accuracy of the date, KNOWN, ABOUT, ESTIMATED, CALCULATED. '''
+        return GedComDate.ACCURACIES[(self.flags >> GedComDate.ACCURACY_SHIFT) & 3]
+
+
+
+    @property
+    def dayStatus(self):
+        ''' The status of the day, KNOWN, GUESS or UNKNOWN. '''
+        return GedComDate.PART_STATUSES[(self.flags >> GedComDate.DAY_SHIFT) & 3]
+
+
+
+    @property
+    def monthStatus(self):
+        ''' The status of the month, KNOWN, GUESS or UNKNOWN. '''
+        return GedComDate.PART_STATUSES[(self.flags >> GedComDate.MONTH_SHIFT) & 3]
+
+
+
+    @property
+    def yearStatus(self):
+        ''' The status of the year, KNOWN, GUESS or UNKNOWN. '''
+        return GedComDate.PART_STATUSES[(self.flags >> GedComDate.YEAR_SHIFT) & 3]
+
+
+
+    @property
+    def isDualDated(self):
+        ''' True if the year is dual dated, for example 1731/32. '''
+        return (self.flags & GedComDate.DUAL_DATED) != 0
+
+
+
+    @property
+    def theDate(self):
+        ''' The date as a :py:class:`datetime.date` or None for an unknown date. '''
+        if self.sortKey == 0:
+            return None
+        return datetime.date.fromordinal(self.sortKey)
 
 
 
@@ -67,71 +201,114 @@ class GedComDate:
         Update the object to the date specified in the parameter.
         The parameter can be a block or a string.
         '''
+        self.sortKey = 0
+        self.flags = GedComDate.EMPTY_FLAGS
         self.the2ndDate = None
-        self.sources = []
+        # Most dates have no sources so they share an empty tuple.
+        self.sources = ()
         if dateString is None:
             return
 
         if isinstance(dateString, str):
             return self.parseString(dateString)
 
-        if not isinstance(dateString, list):
+        if not GedComBlock.isBlock(dateString):
             return
 
-        for line in dateString:
-            # print(line)
-            # Split into tags.
-            tags = line.split()
-            if tags[1] == 'DATE':
-                self.parseString(line[7:])
-            elif tags[1] == 'SOUR':
-                self.sources.append(tags[2][1:-1])
+        sources = []
+        for line in GedComBlock.toBlock(dateString):
+            if line.tag == 'DATE':
+                self.parseString(line.value)
+            elif line.tag == 'SOUR':
+                sources.append(line.getPointer())
             else:
                 # Unknown.
-                print(f'DATE unrecogised tag \'{tags[1]}\'')
+                print(f'DATE unrecogised tag \'{line.tag}\'')
+        if len(sources) > 0:
+            self.sources = sources
 
 
 
     def parseString(self, dateString = None):
         ''' Update the object to the date specified in the string. '''
+        # The parsed values are shared by all the dates with the same string.
+        self.sortKey, self.flags, self.the2ndDate = GedComDate.parseValue(dateString)
+
+
+
+    @functools.lru_cache(maxsize=16384)
+    def parseValue(dateString):
+        '''
+        Returns the (sortKey, flags, the2ndDate) for the date specified in the string.
+        The common formats are matched by a single regular expression, anything else is parsed a word at a time.
+        '''
         if dateString == '' or dateString.upper() == 'UNKNOWN':
-            self.status = GedComDateStatus.EMPTY
-            return
+            return 0, GedComDate.EMPTY_FLAGS, None
 
         # Only deal with upper case.
         dateString = dateString.upper()
 
+        # Fast path for the common formats.
+        match = GedComDate.COMMON_FORMAT.fullmatch(dateString)
+        if match is not None:
+            prefix, dayString, monthString, yearString, dualString = match.groups()
+            status = GedComDateStatus.ON
+            accuracy = GedComDateAccuracy.KNOWN
+            if prefix is not None:
+                if prefix in GedComDate.STATUS_PREFIXES:
+                    status = GedComDate.STATUS_PREFIXES[prefix]
+                else:
+                    accuracy = GedComDate.ACCURACY_PREFIXES[prefix]
+            if monthString is None:
+                month = 1
+                monthStatus = GedComDateStatus.UNKNOWN
+            else:
+                month = GedComDate.MONTHS[monthString]
+                monthStatus = GedComDateStatus.KNOWN
+            if dayString is None:
+                day = 1
+                dayStatus = GedComDateStatus.UNKNOWN
+            else:
+                day = int(dayString)
+                dayStatus = GedComDateStatus.KNOWN
+            year = int(yearString)
+            if dualString is not None:
+                # The later year of a dual dated year.
+                year += 1
+            flags = GedComDate.pack(status, accuracy, dayStatus, monthStatus, GedComDateStatus.KNOWN, dualString is not None)
+            return datetime.date(year, month, day).toordinal(), flags, None
+
+        the2ndDate = None
+
         # If FROM .. TO or BET ... AND then deal with each half separately.
         if 'BET' in dateString:
             index = dateString.index('AND')
             afterString = dateString[index+4:]
             beforeString = dateString[:index-1]
-            self.the2ndDate = GedComDate(afterString)
-            self.the2ndDate.status = GedComDateStatus.NOT_ON
+            the2ndDate = GedComDate.notOn(afterString)
             dateString = beforeString
         if 'FROM' in dateString:
             index = dateString.index('TO')
             afterString = dateString[index+3:]
             beforeString = dateString[:index-1]
-            self.the2ndDate = GedComDate(afterString)
-            self.the2ndDate.status = GedComDateStatus.NOT_ON
+            the2ndDate = GedComDate.notOn(afterString)
             dateString = beforeString
 
         # Default accuracy.
-        self.accuracy = GedComDateAccuracy.KNOWN
+        accuracy = GedComDateAccuracy.KNOWN
 
         # Default status.
-        self.status = GedComDateStatus.ON
-        months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+        status = GedComDateStatus.ON
 
         month = None
+        monthStatus = GedComDateStatus.UNKNOWN
         numberOne = None
         numberTwo = None
         numberOneGuess = False
         numberTwoGuess = False
+        isDualDated = False
         blocks = dateString.split()
         for block in blocks:
-            #print(f'\t\'{block}\'')
             isGuess = False
             if block[:1] == '<':
                 # Guess.
@@ -140,28 +317,26 @@ class GedComDate:
             if block[-1:] == '>':
                 # Guess close.
                 block = block[:-1]
-                #print(f'\t\'{block}\'')
-            if block == 'BEF':
-                self.status = GedComDateStatus.BEFORE
-            elif block == 'AFT':
-                self.status = GedComDateStatus.AFTER
-            elif block == 'BET':
-                self.status = GedComDateStatus.BETWEEN
-            elif block == 'FROM':
-                self.status = GedComDateStatus.FROM
-            elif block == 'ABT':
-                self.accuracy = GedComDateAccuracy.ABOUT
-            elif block == 'EST':
-                self.accuracy = GedComDateAccuracy.ESTIMATED
-            elif block == 'CAL':
-                self.accuracy = GedComDateAccuracy.CALCULATED
-            elif block.upper() in months:
-                month = months.index(block.upper()) + 1
+            if block in GedComDate.STATUS_PREFIXES:
+                status = GedComDate.STATUS_PREFIXES[block]
+            elif block in GedComDate.ACCURACY_PREFIXES:
+                accuracy = GedComDate.ACCURACY_PREFIXES[block]
+            elif block in GedComDate.MONTHS:
+                month = GedComDate.MONTHS[block]
                 if isGuess:
-                    self.monthStatus = GedComDateStatus.GUESS
+                    monthStatus = GedComDateStatus.GUESS
                 else:
-                    self.monthStatus = GedComDateStatus.KNOWN
+                    monthStatus = GedComDateStatus.KNOWN
             else:
+                match = GedComDate.DUAL_YEAR.fullmatch(block)
+                if match is not None:
+                    # The later year of a dual dated year.
+                    numberTwo = numberOne
+                    numberTwoGuess = numberOneGuess
+                    numberOne = int(match.group(1)) + 1
+                    numberOneGuess = isGuess
+                    isDualDated = True
+                    continue
                 try:
                     number = int(block)
                 except:
@@ -174,38 +349,47 @@ class GedComDate:
                     numberOneGuess = isGuess
 
         if numberOne is None:
-            self.yearStatus = GedComDateStatus.UNKNOWN
-            year = datetime.date.today().year
-
             # Not sure about this.
-            self.status = GedComDateStatus.EMPTY
-            return
+            return 0, GedComDate.pack(GedComDateStatus.EMPTY, accuracy, GedComDateStatus.UNKNOWN, monthStatus, GedComDateStatus.UNKNOWN), the2ndDate
 
+        year = numberOne
+        if numberOneGuess:
+            yearStatus = GedComDateStatus.GUESS
         else:
-            year = numberOne
-            # print(f'year is {year}')
-            if numberOneGuess:
-                self.yearStatus = GedComDateStatus.GUESS
-            else:
-                self.yearStatus = GedComDateStatus.KNOWN
+            yearStatus = GedComDateStatus.KNOWN
 
         if month is None:
-            self.monthStatus = GedComDateStatus.UNKNOWN
             month = 1
 
         if numberTwo is None:
             day = 1
-            self.dayStatus = GedComDateStatus.UNKNOWN
+            dayStatus = GedComDateStatus.UNKNOWN
         else:
             day = numberTwo
             if numberTwoGuess:
-                self.dayStatus = GedComDateStatus.GUESS
+                dayStatus = GedComDateStatus.GUESS
             else:
-                self.dayStatus = GedComDateStatus.KNOWN
+                dayStatus = GedComDateStatus.KNOWN
+
+        flags = GedComDate.pack(status, accuracy, dayStatus, monthStatus, yearStatus, isDualDated)
+        return datetime.date(year, month, day).toordinal(), flags, the2ndDate
+
+
+
+    def notOn(dateString):
+        ''' Returns the second date of a BET ... AND or FROM ... TO range.  This is shared between dates so it must not change. '''
+        the2ndDate = GedComDate(dateString)
+        the2ndDate.status = GedComDateStatus.NOT_ON
+        return the2ndDate
+
+
 
-        #print(f'date({year}, {month}, {day})')
-        self.theDate = datetime.date(year, month, day)
-        #print(f'theDate = {self.theDate}')
+    def getYearText(self, yearText):
+        ''' Returns the year for display, a dual dated year is shown as both years, for example 1731/32. '''
+        if self.flags & GedComDate.DUAL_DATED:
+            year = self.theDate.year
+            return f'{year - 1}/{year % 100:02d}'
+        return yearText
 
 
 
@@ -248,9 +432,9 @@ class GedComDate:
         elif self.monthStatus == GedComDateStatus.GUESS:
             result = f'{result}({self.theDate.strftime("%B")}) '
         if self.yearStatus == GedComDateStatus.KNOWN:
-            result = f'{result}{self.theDate.strftime("%Y")}'
+            result = f'{result}{self.getYearText(self.theDate.strftime("%Y"))}'
         elif self.yearStatus == GedComDateStatus.GUESS:
-            result = f'{result}({self.theDate.strftime("%Y")})'
+            result = f'{result}({self.getYearText(self.theDate.strftime("%Y"))})'
 
         if self.status == GedComDateStatus.BETWEEN:
             result = f'{result.strip()} and {self.the2ndDate.toLongString()}'
@@ -306,12 +490,12 @@ class GedComDate:
             # This does not work in Windows for years before 1900.
             # result = f'{result}{self.theDate.strftime("%y")}'
             # This is not the same as the above but I was thinking about have 4 digit years in short dates.
-            result = f'{result}{self.theDate.year}'
+            result = f'{result}{self.getYearText(self.theDate.year)}'
         elif self.yearStatus == GedComDateStatus.GUESS:
             # This does not work in Windows for years before 1900.
             # result = f'{result}({self.theDate.strftime("%y")})'
             # This is not the same as the above but I was thinking about have 4 digit years in short dates.
-            result = f'{result}({self.theDate.year})'
+            result = f'{result}({self.getYearText(self.theDate.year)})'
 
         if self.status == GedComDateStatus.BETWEEN:
             result = f'{result.strip()}/{self.the2ndDate.toShortString()}'
@@ -365,9 +549,9 @@ class GedComDate:
         elif self.monthStatus == GedComDateStatus.GUESS:
             result = f'{result}<{self.theDate.strftime("%b").upper()}> '
         if self.yearStatus == GedComDateStatus.KNOWN:
-            result = f'{result}{self.theDate.strftime("%Y")}'
+            result = f'{result}{self.getYearText(self.theDate.strftime("%Y"))}'
         elif self.yearStatus == GedComDateStatus.GUESS:
-            result = f'{result}<{self.theDate.strftime("%Y")}>'
+            result = f'{result}<{self.getYearText(self.theDate.strftime("%Y"))}>'
 
         if self.status == GedComDateStatus.BETWEEN:
             result = f'{result.strip()} AND {self.the2ndDate.toGedCom()}'
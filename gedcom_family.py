@@ -14,6 +14,7 @@ from gedcom_date import GedComDate
 from gedcom_place import GedComPlace
 from gedcom_tag import GedComTag
 from gedcom_change import GedComChange
+from gedcom_block import GedComBlock
 
 
 class IndividualSex(Enum):
@@ -28,7 +29,10 @@ class GedComFamily:
 
     :ivar string identity: The identity of the family in the gedcom file.
     :ivar GedCom gedcom: The gedcom object that contains this family.
+    :ivar bool isDirty: True if the family has changed since it was read from the gedcom file.
+    :ivar GedComBlock gedcomFile: The original gedcom of the family.  Only the text is kept, the lines are tokenized again when they are used.
     '''
+    __slots__ = ('identity', 'gedcomFile', 'isDirty', 'husbandIdentity', 'wifeIdentity', 'childrenIdentities', 'marriage', 'divorce', 'change', 'sources')
 
     # Connection to the single gedcom.
     gedcom = None
@@ -49,6 +53,7 @@ class GedComFamily:
             # New empty family.
             self.identity = f'F{len(GedComFamily.gedcom.families) + 1:04d}'
             self.gedcomFile = ''
+            self.isDirty = True
             self.husbandIdentity = None
             self.wifeIdentity = None
             self.childrenIdentities = []
@@ -67,49 +72,59 @@ class GedComFamily:
         ''' Build the family from the specified gedcom settings. '''
         # The default empty settings.
         self.gedcomFile = gedcomFile
+        self.isDirty = False
         self.identity = ''
         self.husbandIdentity = None
         self.wifeIdentity = None
-        self.childrenIdentities = []
+        # The empty lists are shared tuples until something is added.
+        self.childrenIdentities = ()
         self.marriage = None
         self.divorce = None
         self.change = None
-        self.sources = []
+        self.sources = ()
         if gedcomFile is None:
             return
+        gedcomFile = GedComBlock.toBlock(gedcomFile)
+        self.gedcomFile = gedcomFile
 
         # The identity is on the first line.
-        tags = gedcomFile[0].split()
-        if tags[1][:1] == '@':
-            self.identity = tags[1][1:-1]
+        if gedcomFile.first.identity is not None:
+            self.identity = gedcomFile.first.identity
 
         # Fetch the first block.
-        block, start = GedComFamily.gedcom.getNextBlock(gedcomFile, 1)
+        block, start = gedcomFile.getNextBlock(1)
         while len(block) > 0:
-            tags = block[0].split()
-            if tags[1] == 'MARR':
+            tag = block.first.tag
+            if tag == 'MARR':
                 # This gives the type, date and place.
                 self.marriage = GedComTag(block)
-            elif tags[1] == 'HUSB':
-                self.husbandIdentity = tags[2][1:-1]
-            elif tags[1] == 'WIFE':
-                self.wifeIdentity = tags[2][1:-1]
-            elif tags[1] == 'CHIL':
-                self.childrenIdentities.append(tags[2][1:-1])
-            elif tags[1] == 'DIV':
+            elif tag == 'HUSB':
+                self.husbandIdentity = block.first.getPointer()
+            elif tag == 'WIFE':
+                self.wifeIdentity = block.first.getPointer()
+            elif tag == 'CHIL':
+                if len(self.childrenIdentities) == 0:
+                    self.childrenIdentities = []
+                self.childrenIdentities.append(block.first.getPointer())
+            elif tag == 'DIV':
                 self.divorce = GedComTag(block)
-            elif tags[1] == 'SOUR':
-                self.sources.append(tags[2][1:-1])
-            elif tags[1] == 'OBJE':
+            elif tag == 'SOUR':
+                if len(self.sources) == 0:
+                    self.sources = []
+                self.sources.append(block.first.getPointer())
+            elif tag == 'OBJE':
                 pass
-            elif tags[1] == 'CHAN':
+            elif tag == 'CHAN':
                 self.change = GedComChange(block)
             else:
                 # Unknown.
-                print(f'Family unrecogised tag \'{tags[1]}\'')
+                print(f'Family unrecogised tag \'{tag}\'')
 
             # Fetch next block.
-            block, start = GedComFamily.gedcom.getNextBlock(gedcomFile, start)
+            block, start = gedcomFile.getNextBlock(start)
+
+        # Only keep the text of the original gedcom.
+        self.gedcomFile = gedcomFile.compact()
 
         # Debug output.
         #childrenName = ''
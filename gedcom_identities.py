@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support a registry of the cross reference identities in the gedcom python library.
+This module implements the :py:class:`GedComIdentities` class.
+'''
+# System Libraries.
+
+
+
+class GedComIdentities:
+    '''
+    Class to represent the registry of the cross reference identities, for example 'I0001', 'F0123' and 'S0042'.
+    Each identity is kept as a single string object that is shared by every reference to it.
+    Each identity also has a dense integer handle, so that tables of records can be lists and arrays rather than dictionaries.
+    The handles are the positions in :py:attr:`identities` and are only valid until :py:func:`reset` is called.
+    '''
+
+    # The identities in the order they were first seen.  The position of an identity is its handle.
+    identities = []
+
+    # The handle of each identity.
+    handles = {}
+
+
+
+    def reset():
+        ''' Start a new empty registry, for example when a new gedcom is opened. '''
+        GedComIdentities.identities = []
+        GedComIdentities.handles = {}
+
+
+
+    def swap(identities = None, handles = None):
+        '''
+        Replace the registry with the specified identities and handles, or a new empty registry, and returns the previous (identities, handles).
+        This lets a reader keep the identities of its records in a private registry, for example :py:func:`GedComReader.iterRecords`.
+        '''
+        previous = (GedComIdentities.identities, GedComIdentities.handles)
+        GedComIdentities.identities = [] if identities is None else identities
+        GedComIdentities.handles = {} if handles is None else handles
+        return previous
+
+
+
+    def intern(identity):
+        ''' Returns the shared string object for the specified identity. '''
+        handle = GedComIdentities.handles.get(identity)
+        if handle is None:
+            GedComIdentities.handles[identity] = len(GedComIdentities.identities)
+            GedComIdentities.identities.append(identity)
+            return identity
+        return GedComIdentities.identities[handle]
+
+
+
+    def getHandle(identity):
+        ''' Returns the integer handle of the specified identity.  A new identity is added to the registry. '''
+        handle = GedComIdentities.handles.get(identity)
+        if handle is None:
+            handle = len(GedComIdentities.identities)
+            GedComIdentities.handles[identity] = handle
+            GedComIdentities.identities.append(identity)
+        return handle
+
+
+
+    def getIdentity(handle):
+        ''' Returns the identity of the specified integer handle. '''
+        return GedComIdentities.identities[handle]
+
+
+
+    def getCount():
+        ''' Returns the number of identities in the registry.  This is the size of a table indexed by handle. '''
+        return len(GedComIdentities.identities)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support an index of the records in a gedcom file in the gedcom python library.
+This module implements the :py:class:`GedComIndex` class.
+'''
+# System Libraries.
+import mmap
+import os
+
+# Application Libraries.
+from gedcom_line import GedComLine
+
+
+
+class GedComIndex:
+    '''
+    Class to represent an index of the level 0 records in a gedcom file.
+    The file is memory mapped, the text of a record is only decoded when it is required.
+
+    :ivar str fileName: The name of the indexed gedcom file.
+    :ivar mmap map: The memory map of the gedcom file or None for an empty file.
+    :ivar list records: The (tag, identity, start, end) of each level 0 record in the order of the file.
+    :ivar dict offsets: The (start, end) byte range of each record by identity.
+    '''
+
+
+
+    def __init__(self, fileName):
+        ''' Class constructor for the :py:class:`GedComIndex` class. '''
+        self.fileName = fileName
+        self.map = None
+        self.records = []
+        self.offsets = {}
+        with open(fileName, 'rb') as file:
+            if os.fstat(file.fileno()).st_size > 0:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map is not None:
+            self.scan()
+
+
+
+    def scan(self):
+        ''' Build the index with one scan of the file for the start of the level 0 records. '''
+        data = self.map
+        length = len(data)
+        # Skip any byte order mark.
+        start = 3 if data[:3] == b'\xef\xbb\xbf' else 0
+        while start < length:
+            # Find the start of the next level 0 record.
+            end = data.find(b'\n0 ', start)
+            end = length if end == -1 else end + 1
+            lineEnd = data.find(b'\n', start, end)
+            firstLine = self.decode(data[start:end if lineEnd == -1 else lineEnd])
+            line = None if firstLine == '' or firstLine.isspace() else GedComLine.parse(firstLine)
+            if line is not None:
+                self.records.append((line.tag, line.identity, start, end))
+                if line.identity is not None:
+                    self.offsets[line.identity] = (start, end)
+            start = end
+
+
+
+    def decode(self, data):
+        ''' Returns the specified bytes from the file as text with line feed line endings. '''
+        return data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+
+
+    def getText(self, start, end):
+        ''' Returns the text of the file between the specified byte offsets. '''
+        return self.decode(self.map[start:end])
+
+
+
+    def getRecordText(self, identity):
+        ''' Returns the text of the record with the specified identity. '''
+        start, end = self.offsets[identity]
+        return self.getText(start, end)
+
+
+
+    def close(self):
+        ''' Release the memory map of the file. '''
+        if self.map is not None:
+            self.map.close()
+            self.map = None
@@ -15,6 +15,7 @@ from gedcom_place import GedComPlace
 from gedcom_tag import GedComTag
 from gedcom_census import GedComCensus
 from gedcom_change import GedComChange
+from gedcom_block import GedComBlock
 
 
 class IndividualSex(Enum):
@@ -32,26 +33,24 @@ class ToDo:
         self.description = ''
         if block is None:
             return
-        if not isinstance(block, list):
+        if not GedComBlock.isBlock(block):
             return
 
-        for line in block:
-            # print(line)
-            # Split into tags.
-            tags = line.split()
-            if tags[1] == '_TODO':
+        for line in GedComBlock.toBlock(block):
+            if line.tag == '_TODO':
                 # Add a line.
-                self.rank = int(tags[2])
-                position = line.find(tags[2]) + len(tags[2]) + 1
-                self.description = line[position:]
+                rank, _, self.description = line.value.partition(' ')
+                self.rank = int(rank)
             else:
                 # Unknown.
-                print(f'_TODO unrecogised tag \'{tags[1]}\' \'{line}\'')
+                print(f'_TODO unrecogised tag \'{line.tag}\' \'{line}\'')
 
 
 
 class IdentitySources:
     ''' Class to represent a identity and sources. '''
+    __slots__ = ('identity', 'sources')
+
     def __init__(self, block = None):
         ''' Class constructor for a identity sources object. '''
         self.identity = None
@@ -62,26 +61,22 @@ class IdentitySources:
             # Simply an identity.
             self.identity = block
             return
-        if not isinstance(block, list):
+        if not GedComBlock.isBlock(block):
             return
+        block = GedComBlock.toBlock(block)
 
         # Identity in first line.
-        tags = block[0].split()
-        self.identity = tags[2][1:-1]
-        block.pop(0)
+        self.identity = block.first.getPointer()
 
         # Loop through the rest of block.
-        for line in block:
-            # print(line)
-            # Split into tags.
-            tags = line.split()
-            if tags[1] == 'SOUR':
+        for line in block[1:]:
+            if line.tag == 'SOUR':
                 if self.sources is None:
                     self.sources = []
-                self.sources.append(tags[2][1:-1])
+                self.sources.append(line.getPointer())
             else:
                 # Unknown.
-                print(f'Identity Sources unrecogised tag \'{tags[1]}\' \'{line}\'')
+                print(f'Identity Sources unrecogised tag \'{line.tag}\' \'{line}\'')
 
 
 
@@ -93,7 +88,10 @@ class GedComIndividual:
     :ivar GedCom gedcom: The gedcom object that contains this individual.
     :ivar string givenName: The given name of the individual.
     :ivar string surname: The surname of the individual.
+    :ivar bool isDirty: True if the individual has changed since it was read from the gedcom file.
+    :ivar GedComBlock gedcomFile: The original gedcom of the individual.  Only the text is kept, the lines are tokenized again when they are used.
     '''
+    __slots__ = ('identity', 'gedcomFile', 'isDirty', 'sources', 'givenName', 'surname', 'firstName', 'nameSources', 'sex', 'birth', 'death', 'familyIdentities', 'parentFamilyIdentity', 'todos', 'tags', 'census', 'media', 'change')
 
     # Connection to the single gedcom.
     gedcom = None
@@ -113,6 +111,7 @@ class GedComIndividual:
         if gedcomFile is None:
             self.identity = f'I{len(GedComIndividual.gedcom.individuals) + 1:04d}'
             self.gedcomFile = ''
+            self.isDirty = True
             self.sources = []
             self.givenName = 'New'
             self.surname = 'Individual'
@@ -139,15 +138,12 @@ class GedComIndividual:
     def parseSex(self, gedcom):
         ''' Build the sex from the specified gedcom settings. '''
         for line in gedcom:
-            # print(line)
-            # Split into tags.
-            tags = line.split()
-            if tags[1] == 'SEX':
-                if tags[2][0:1] == 'F':
+            if line.tag == 'SEX':
+                if line.value[0:1] == 'F':
                     self.sex = IndividualSex.FEMALE
             else:
                 # Unknown.
-                print(f'Individual SEX unrecogised tag \'{tags[1]}\'')
+                print(f'Individual SEX unrecogised tag \'{line.tag}\'')
 
 
 
@@ -155,27 +151,22 @@ class GedComIndividual:
         ''' Build the name from the specified gedcom settings. '''
         # Loop through the tags.
         for line in gedcom:
-            # print(line)
-            # Split into tags.
-            tags = line.split()
-            if tags[1] == 'NAME':
+            if line.tag == 'NAME':
                 # Ignore this for now.
                 pass
-            elif tags[1] == 'SURN':
-                if len(tags) > 2:
-                    self.surname = tags[2]
-                    for index in range(3, len(tags)):
-                        self.surname += ' ' + tags[index]
-            elif tags[1] == 'GIVN':
-                if len(tags) > 2:
-                    self.givenName = tags[2]
-                    for index in range(3, len(tags)):
-                        self.givenName += ' ' + tags[index]
-            elif tags[1] == 'SOUR':
-                self.nameSources.append(tags[2][1:-1])
+            elif line.tag == 'SURN':
+                if line.value.strip() != '':
+                    self.surname = ' '.join(line.value.split())
+            elif line.tag == 'GIVN':
+                if line.value.strip() != '':
+                    self.givenName = ' '.join(line.value.split())
+            elif line.tag == 'SOUR':
+                if len(self.nameSources) == 0:
+                    self.nameSources = []
+                self.nameSources.append(line.getPointer())
             else:
                 # Unknown.
-                print(f'Individual NAME unrecogised tag \'{tags[1]}\'')
+                print(f'Individual NAME unrecogised tag \'{line.tag}\'')
 
         names = self.givenName.split(' ')
         self.firstName = names[0]
@@ -185,17 +176,19 @@ class GedComIndividual:
     def parse(self, gedcomFile):
         ''' Build the individual from the specified gedcomFile settings. '''
         self.gedcomFile = gedcomFile
+        self.isDirty = False
         self.identity = ''
-        self.sources = []
+        # The empty lists are shared tuples until something is added.
+        self.sources = ()
         self.givenName = ''
         self.surname = ''
         self.firstName = ''
-        self.nameSources = []
+        self.nameSources = ()
         self.sex = IndividualSex.MALE
         self.birth = None
         self.death = None
         # Families of own marrages.
-        self.familyIdentities = []
+        self.familyIdentities = ()
         # Family of parents marrage.
         self.parentFamilyIdentity = None
         self.todos = None
@@ -205,61 +198,69 @@ class GedComIndividual:
         self.change = None
         if gedcomFile is None:
             return
+        gedcomFile = GedComBlock.toBlock(gedcomFile)
+        self.gedcomFile = gedcomFile
 
         # The identity is on the first line.
-        tags = gedcomFile[0].split()
-        if tags[1][:1] == '@':
-            self.identity = tags[1][1:-1]
+        if gedcomFile.first.identity is not None:
+            self.identity = gedcomFile.first.identity
 
         # Fetch the first block.
-        block, start = GedComIndividual.gedcom.getNextBlock(gedcomFile, 1)
+        block, start = gedcomFile.getNextBlock(1)
         while len(block) > 0:
             #for line in block:
             #    print(line)
             #print('<--')
-            tags = block[0].split()
-            if tags[1] == 'NAME':
+            tag = block.first.tag
+            if tag == 'NAME':
                 self.parseName(block)
-            elif tags[1] == 'SEX':
+            elif tag == 'SEX':
                 self.parseSex(block)
-            elif tags[1] == 'BIRT':
+            elif tag == 'BIRT':
                 # self.parseBirth(block)
                 self.birth = GedComTag(block)
-            elif tags[1] == 'DEAT':
+            elif tag == 'DEAT':
                 # self.parseDeath(block)
                 self.death = GedComTag(block)
-            elif tags[1] == 'FAMS':
+            elif tag == 'FAMS':
                 # Family spouse.
+                if len(self.familyIdentities) == 0:
+                    self.familyIdentities = []
                 self.familyIdentities.append(IdentitySources(block))
-            elif tags[1] == 'FAMC':
+            elif tag == 'FAMC':
                 # Family child.
-                self.parentFamilyIdentity = tags[2][1:-1]
-            elif tags[1] == 'OCCU' or tags[1] == 'EDUC' or tags[1] == 'NOTE':
+                self.parentFamilyIdentity = block.first.getPointer()
+            elif tag == 'OCCU' or tag == 'EDUC' or tag == 'NOTE':
                 if self.tags is None:
                     self.tags = []
                 self.tags.append(GedComTag(block))
-            elif tags[1] == 'SOUR':
-                self.sources.append(tags[2][1:-1])
-            elif tags[1] == 'OBJE':
+            elif tag == 'SOUR':
+                if len(self.sources) == 0:
+                    self.sources = []
+                self.sources.append(block.first.getPointer())
+            elif tag == 'OBJE':
                 if self.media is None:
                     self.media = []
-                self.media.append(tags[2][1:-1])
-            elif tags[1] == 'CENS':
+                self.media.append(block.first.getPointer())
+            elif tag == 'CENS':
                 if self.census is None:
                     self.census = []
                 self.census.append(GedComCensus(self, block))
-            elif tags[1] == '_TODO':
+            elif tag == '_TODO':
                 if self.todos is None:
                     self.todos = []
                 self.todos.append(ToDo(self, block))
-            elif tags[1] == 'CHAN':
+            elif tag == 'CHAN':
                 self.change = GedComChange(block)
             else:
                 # Unknown.
-                print(f'Individual unrecogised tag \'{tags[1]}\' \'{block[0]}\'')
+                print(f'Individual unrecogised tag \'{tag}\' \'{block.first}\'')
 
             # Fetch the next block.
-            block, start = GedComIndividual.gedcom.getNextBlock(gedcomFile, start)
+            block, start = gedcomFile.getNextBlock(start)
+
+        # Only keep the text of the original gedcom.
+        self.gedcomFile = gedcomFile.compact()
 
         # Debug output.
         # print(f'\'{self.identity}\', \'{self.givenName}\', \'{self.surname}\'')
@@ -401,10 +402,10 @@ class GedComIndividual:
         identity = identitySource.identity
         family = GedComIndividual.gedcom.families[identity]
         if family.marriage is None:
-            return datetime.date.today()
+            return datetime.date.today().toordinal()
         if family.marriage.date is None:
-            return datetime.date.today()
-        return family.marriage.date.theDate
+            return datetime.date.today().toordinal()
+        return family.marriage.date.sortKey
 
 
 
@@ -414,15 +415,19 @@ class GedComIndividual:
         #if individual.birthDate is None:
         #    return None
         if individual.birth is None:
-            return None
+            return 0
         if individual.birth.date is None:
-            return None
-        return individual.birth.date.theDate
+            return 0
+        return individual.birth.date.sortKey
 
 
 
     def getSiblings(self):
         ''' Returns the identities of siblings of the individual. '''
+        if GedComIndividual.gedcom.isRelationshipsReady():
+            return GedComIndividual.gedcom.getRelationships().getSiblings(self.identity)
+
+        # The relationship graph would build every lazy record, so only read the records of the parents.
         siblings = []
         if self.parentFamilyIdentity is not None:
             family = GedComIndividual.gedcom.families[self.parentFamilyIdentity]
@@ -449,6 +454,10 @@ class GedComIndividual:
 
     def getChildren(self):
         ''' Returns the identities of children of the individual. '''
+        if GedComIndividual.gedcom.isRelationshipsReady():
+            return GedComIndividual.gedcom.getRelationships().getChildren(self.identity)
+
+        # The relationship graph would build every lazy record, so only read the records of the families.
         children = []
         for familyIdentity in self.familyIdentities:
             family = GedComIndividual.gedcom.families[familyIdentity.identity]
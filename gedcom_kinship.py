@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support the names of the relationships between individuals in the gedcom python library.
+This module implements the :py:class:`GedComKinship` class.
+'''
+# System Libraries.
+
+# Application Libraries.
+from gedcom_identities import GedComIdentities
+from gedcom_individual import IndividualSex
+
+
+
+class GedComKinship:
+    '''
+    Class to represent the blood relationships between the individuals of a :py:class:`GedComRelationships` graph.
+    A relationship is (up, down, isHalf) where up is the generations from the person to the nearest common ancestor and down is the generations from that ancestor to the relative.
+    For example (2, 1, False) is an uncle or aunt and (3, 5, False) is a second cousin twice removed.
+
+    :ivar GedComRelationships relationships: The relationship graph.
+    :ivar GedComRecords individuals: The individuals, only used for the sex of the relatives.
+    :ivar str identity: The identity of the last person passed to :py:func:`getRelationshipsTo` or None.
+    :ivar dict relatives: The relationships of the relatives of the last person passed to :py:func:`getRelationshipsTo`.
+    '''
+
+    # The ordinal names of the cousins.
+    ORDINALS = ('', 'first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth', 'tenth')
+
+    # The names of the generations removed of the cousins.
+    REMOVED = ('', ' once removed', ' twice removed')
+
+    # The (male, female, unknown) names of the direct and close relationships.
+    CHILDREN = ('son', 'daughter', 'child')
+    PARENTS = ('father', 'mother', 'parent')
+    SIBLINGS = ('brother', 'sister', 'sibling')
+    NEPHEWS = ('nephew', 'niece', 'nephew or niece')
+    UNCLES = ('uncle', 'aunt', 'uncle or aunt')
+    SPOUSES = ('husband', 'wife', 'spouse')
+
+
+
+    def getGreats(count):
+        ''' Returns the 'great ' prefix for the specified number of extra generations. '''
+        if count <= 2:
+            return 'great ' * count
+        return f'{count}x great '
+
+
+
+    def getWord(words, sex):
+        ''' Returns the word for the specified sex from the specified (male, female, unknown) words. '''
+        if sex == IndividualSex.MALE:
+            return words[0]
+        if sex == IndividualSex.FEMALE:
+            return words[1]
+        return words[2]
+
+
+
+    def getName(up, down, isHalf, sex = None):
+        ''' Returns the name of the specified relationship, for example 'half uncle' or 'third cousin twice removed'. '''
+        if up == 0 and down == 0:
+            return 'self'
+        if up == 0:
+            if down == 1:
+                return GedComKinship.getWord(GedComKinship.CHILDREN, sex)
+            return f'{GedComKinship.getGreats(down - 2)}grand{GedComKinship.getWord(GedComKinship.CHILDREN, sex)}'
+        if down == 0:
+            if up == 1:
+                return GedComKinship.getWord(GedComKinship.PARENTS, sex)
+            return f'{GedComKinship.getGreats(up - 2)}grand{GedComKinship.getWord(GedComKinship.PARENTS, sex)}'
+
+        half = 'half ' if isHalf else ''
+        if up == 1 and down == 1:
+            return f'{half}{GedComKinship.getWord(GedComKinship.SIBLINGS, sex)}'
+        if up == 1:
+            grand = '' if down == 2 else f'{GedComKinship.getGreats(down - 3)}grand '
+            return f'{half}{grand}{GedComKinship.getWord(GedComKinship.NEPHEWS, sex)}'
+        if down == 1:
+            return f'{half}{GedComKinship.getGreats(up - 2)}{GedComKinship.getWord(GedComKinship.UNCLES, sex)}'
+
+        degree = min(up, down) - 1
+        removed = abs(up - down)
+        ordinal = GedComKinship.ORDINALS[degree] if degree < len(GedComKinship.ORDINALS) else f'{degree}th'
+        removedText = GedComKinship.REMOVED[removed] if removed < len(GedComKinship.REMOVED) else f' {removed} times removed'
+        return f'{half}{ordinal} cousin{removedText}'
+
+
+
+    def __init__(self, relationships, individuals):
+        ''' Class constructor for the :py:class:`GedComKinship` class. '''
+        self.relationships = relationships
+        self.individuals = individuals
+        self.identity = None
+        self.relatives = None
+
+
+
+    def getAncestorMap(self, handle):
+        ''' Returns a dictionary of the ancestors of the specified handle, including itself, to (generation, handle of the child towards the specified handle). '''
+        ancestors = {handle: (0, -1)}
+        generation = 0
+        current = [handle]
+        while len(current) > 0:
+            generation += 1
+            parents = []
+            for child in current:
+                for parent in self.relationships.getParentHandles(child):
+                    if parent not in ancestors:
+                        ancestors[parent] = (generation, child)
+                        parents.append(parent)
+            current = parents
+        return ancestors
+
+
+
+    def isHalf(self, child, otherChild):
+        ''' Returns True if the specified children of a common ancestor only share one parent. '''
+        relationships = self.relationships
+        return relationships.fathers[child] != relationships.fathers[otherChild] or relationships.mothers[child] != relationships.mothers[otherChild]
+
+
+
+    def getRelationship(self, identity, other):
+        '''
+        Returns the (up, down, isHalf) relationship of the other individual to the specified individual or None if they are not blood relatives.
+        The nearest common ancestor is found from the ancestors of both individuals, each ancestor is visited once however many paths lead to it.
+        '''
+        handle = GedComIdentities.handles.get(identity)
+        otherHandle = GedComIdentities.handles.get(other)
+        if handle is None or otherHandle is None or handle >= self.relationships.count or otherHandle >= self.relationships.count:
+            return None
+        ancestors = self.getAncestorMap(handle)
+        otherAncestors = self.getAncestorMap(otherHandle)
+        if len(otherAncestors) < len(ancestors):
+            smallest = otherAncestors
+        else:
+            smallest = ancestors
+
+        best = None
+        for ancestor in smallest:
+            if ancestor in ancestors and ancestor in otherAncestors:
+                up, child = ancestors[ancestor]
+                down, otherChild = otherAncestors[ancestor]
+                isHalf = up > 0 and down > 0 and self.isHalf(child, otherChild)
+                if best is None or (up + down, up, isHalf) < (best[0] + best[1], best[0], best[2]):
+                    best = (up, down, isHalf)
+        return best
+
+
+
+    def getRelationshipsTo(self, identity):
+        '''
+        Returns a dictionary of the identities of all the blood relatives of the specified individual to their (up, down, isHalf) relationship.
+        The ancestors are found first and then the descendants of all the ancestors are searched together nearest first, so each individual is visited once.
+        The result for the last individual is kept, so a listing of relationships to the same person only searches once.
+        '''
+        if identity == self.identity:
+            return self.relatives
+        relatives = {}
+        handle = GedComIdentities.handles.get(identity)
+        if handle is not None and handle < self.relationships.count:
+            ancestors = self.getAncestorMap(handle)
+            identities = GedComIdentities.identities
+            # The (up, relative, isHalf) waiting at each total of up and down generations.
+            buckets = [[] for _ in range(max(generation for generation, _ in ancestors.values()) + 1)]
+            for ancestor, (up, _) in ancestors.items():
+                buckets[up].append((up, ancestor, False))
+            isSeen = set()
+            total = 0
+            while total < len(buckets):
+                # Sorted so that the nearest common ancestor wins a tie and a full relationship wins over a half relationship.
+                buckets[total].sort()
+                for up, relative, isHalf in buckets[total]:
+                    if relative in isSeen:
+                        continue
+                    isSeen.add(relative)
+                    down = total - up
+                    relatives[identities[relative]] = (up, down, isHalf)
+                    children = self.relationships.getChildHandles(relative)
+                    if len(children) > 0:
+                        if total + 1 == len(buckets):
+                            buckets.append([])
+                        for child in children:
+                            if child not in isSeen:
+                                if down == 0:
+                                    # The relative is a common ancestor, the relationship is half when the children only share one parent.
+                                    isHalf = up > 0 and self.isHalf(ancestors[relative][1], child)
+                                buckets[total + 1].append((up, child, isHalf))
+                buckets[total] = None
+                total += 1
+        self.identity = identity
+        self.relatives = relatives
+        return relatives
+
+
+
+    def getDescription(self, identity, other):
+        ''' Returns the name of the relationship of the other individual to the specified individual, for example 'second cousin' or 'wife', or None when they are not related. '''
+        if identity == self.identity:
+            relationship = self.relatives.get(other)
+        else:
+            relationship = self.getRelationship(identity, other)
+        sex = self.individuals[other].sex if other in self.individuals else None
+        if relationship is None:
+            if other in self.relationships.getSpouses(identity):
+                return GedComKinship.getWord(GedComKinship.SPOUSES, sex)
+            return None
+        up, down, isHalf = relationship
+        return GedComKinship.getName(up, down, isHalf, sex)
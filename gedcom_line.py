@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support tokenized lines in the gedcom python library.
+This module implements the :py:class:`GedComLine` class.
+'''
+# System Libraries.
+
+# Application Libraries.
+from gedcom_identities import GedComIdentities
+
+
+
+class GedComLine:
+    '''
+    Class to represent a single line of a gedcom file split into its parts.
+    Each line is split exactly once, the parsers then use the parts rather than the text.
+
+    :ivar int level: The level of the line.
+    :ivar str identity: The cross reference identity of the line without the '@' characters or None.
+    :ivar str tag: The gedcom tag of the line.
+    :ivar str value: The value of the line, everything after the tag.
+    :ivar str text: The original text of the line.
+    '''
+    __slots__ = ('level', 'identity', 'tag', 'value', 'text')
+
+    # The number of characters to read from a gedcom file in each chunk.
+    CHUNK_SIZE = 1024 * 1024
+
+
+
+    def readFile(fileName):
+        ''' Generator for the :py:class:`GedComLine` objects in the specified gedcom file. '''
+        with open(fileName, 'r', encoding='utf-8', errors='replace') as file:
+            remainder = ''
+            isFirst = True
+            while True:
+                chunk = file.read(GedComLine.CHUNK_SIZE)
+                if chunk == '':
+                    break
+                if isFirst:
+                    # Remove any byte order mark.
+                    chunk = chunk.lstrip('\ufeff')
+                    isFirst = False
+                lines = (remainder + chunk).split('\n')
+                # The last line might continue in the next chunk.
+                remainder = lines.pop()
+                for text in lines:
+                    if text != '' and not text.isspace():
+                        # This is the loop for every line of the file, so the line is built here rather than by parse().
+                        try:
+                            yield GedComLine(text)
+                        except ValueError:
+                            print(f'Line malformed gedcom line \'{text}\'')
+            if remainder != '' and not remainder.isspace():
+                line = GedComLine.parse(remainder)
+                if line is not None:
+                    yield line
+
+
+
+    def fromText(text):
+        ''' Returns the list of :py:class:`GedComLine` objects in the specified gedcom text. '''
+        lines = []
+        for line in text.split('\n'):
+            if line != '' and not line.isspace():
+                line = GedComLine.parse(line)
+                if line is not None:
+                    lines.append(line)
+        return lines
+
+
+
+    def parse(text):
+        ''' Returns the :py:class:`GedComLine` object for the specified text or None when the text is not a valid gedcom line. '''
+        try:
+            return GedComLine(text)
+        except ValueError:
+            print(f'Line malformed gedcom line \'{text}\'')
+            return None
+
+
+
+    def __init__(self, text):
+        ''' Class constructor for the :py:class:`GedComLine` class.  Raises a ValueError when the text does not have a level and a tag. '''
+        self.text = text
+        # This is called for every line of the file, partition() is faster than split().
+        level, _, rest = text.partition(' ')
+        tag, _, value = rest.partition(' ')
+        if level == '' or tag == '':
+            # Not the standard single spaces, split on any white space.
+            parts = text.split(None, 2)
+            if len(parts) < 2:
+                raise ValueError(f'No tag in gedcom line \'{text}\'')
+            level = parts[0]
+            tag = parts[1]
+            value = parts[2] if len(parts) > 2 else ''
+        self.level = int(level)
+        if tag[:1] == '@' and value != '':
+            # Cross reference identity, the tag follows the identity.
+            self.identity = GedComIdentities.intern(tag[1:-1])
+            tag, _, value = value.partition(' ')
+        else:
+            self.identity = None
+        self.tag = tag
+        self.value = value
+
+
+
+    def getPointer(self):
+        ''' Returns the identity that the value of this line points to.  The identity is shared with all the other references to it. '''
+        return GedComIdentities.intern(self.value[1:-1])
+
+
+
+    def __str__(self):
+        ''' Magic Method to return the original text of the line. '''
+        return self.text
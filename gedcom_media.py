@@ -13,6 +13,7 @@ from gedcom_tag import GedComTag
 from gedcom_date import GedComDate
 from gedcom_place import GedComPlace
 from gedcom_change import GedComChange
+from gedcom_block import GedComBlock
 
 
 
@@ -31,6 +32,7 @@ class GedComMedia:
 
     :ivar GedComDateStatus status: The status of the date, EMPTY, ON, BEFORE, AFTER.
     :ivar GedComDateAccuracy accuracy: The accuracy of the date, KNOWN, ABOUT, ESTIMATED, CALCULATED
+    :ivar bool isDirty: True if the media has changed since it was read from the gedcom file.
     '''
     # Connection to the single gedcom.
     gedcom = None
@@ -57,18 +59,17 @@ class GedComMedia:
     def parseFile(self, block):
         ''' Parse the FILE tag. '''
         for line in block:
-            tags = line.split()
-            if tags[1] == 'FILE':
-                self.file = line[7:]
-            elif tags[1] == 'TITL':
-                self.title = line[7:]
-            elif tags[1] == 'FORM':
-                self.form = line[7:]
-            elif tags[1] == 'TYPE':
-                self.type = line[7:]
+            if line.tag == 'FILE':
+                self.file = line.value
+            elif line.tag == 'TITL':
+                self.title = line.value
+            elif line.tag == 'FORM':
+                self.form = line.value
+            elif line.tag == 'TYPE':
+                self.type = line.value
             else:
                 # Unknown.
-                print(f'FILE unrecogised tag \'{tags[1]}\' \'{line}\'.')
+                print(f'FILE unrecogised tag \'{line.tag}\' \'{line}\'.')
 
             # Fetch the next block.
 
@@ -78,6 +79,7 @@ class GedComMedia:
         Update the object to the date specified in the string.
         '''
         self.gedcomFile = gedcomFile
+        self.isDirty = False
         self.identity = None
         self.file = None
         self.title = None
@@ -90,37 +92,38 @@ class GedComMedia:
             return
         if len(gedcomFile) == 0:
             return
+        gedcomFile = GedComBlock.toBlock(gedcomFile)
+        self.gedcomFile = gedcomFile
 
         # The identity is on the first line.
-        tags = gedcomFile[0].split()
-        if tags[1][:1] == '@':
-            self.identity = tags[1][1:-1]
+        if gedcomFile.first.identity is not None:
+            self.identity = gedcomFile.first.identity
 
         # Fetch the first block.
-        block, start = GedComMedia.gedcom.getNextBlock(gedcomFile, 1)
+        block, start = gedcomFile.getNextBlock(1)
         while len(block) > 0:
             #for line in block:
             #    print(line)
             #print('<--')
-            tags = block[0].split()
-            if tags[1] == 'FILE':
+            tag = block.first.tag
+            if tag == 'FILE':
                 self.parseFile(block)
-            elif tags[1] == 'NOTE':
+            elif tag == 'NOTE':
                 if self.tags is None:
                     self.tags = []
                 self.tags.append(GedComTag(self, block))
-            elif tags[1] == 'CHAN':
+            elif tag == 'CHAN':
                 self.change = GedComChange(block)
-            elif tags[1] == '_PRIM':
-                self.isPrimary = tags[2] == 'Y'
-            elif tags[1] == '_THUM':
-                self.isThumbnail = tags[2] == 'Y'
+            elif tag == '_PRIM':
+                self.isPrimary = block.first.value == 'Y'
+            elif tag == '_THUM':
+                self.isThumbnail = block.first.value == 'Y'
             else:
                 # Unknown.
-                print(f'Media unrecogised tag \'{tags[1]}\' \'{block[0]}\'.')
+                print(f'Media unrecogised tag \'{tag}\' \'{block.first}\'.')
 
             # Fetch the next block.
-            block, start = GedComMedia.gedcom.getNextBlock(gedcomFile, start)
+            block, start = gedcomFile.getNextBlock(start)
 
         # Debug output.
         # print(f'\'{self.identity}\'')
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support the phonetic and fuzzy index of the names in the gedcom python library.
+This module implements the :py:class:`GedComNames` class.
+'''
+# System Libraries.
+import unicodedata
+from collections import Counter
+
+# Application Libraries.
+from gedcom_search import GedComSearch
+
+
+
+class GedComNames:
+    '''
+    Class to represent the index from each name to the individuals with that given name or surname.
+    Each name is also indexed by its Soundex code, its phonetic key and its trigrams, so a search finds the names that sound alike or are spelt alike, for example Walton, Waltone and Wolton.
+    Only the names that share a code or trigrams with the search are scored, so a search does not read every name.
+    The index is built once from the individuals and then each individual is updated after it is edited.
+
+    :ivar dict individuals: Each name to the identities of the individuals with that name.
+    :ivar dict recordNames: The identity of each individual to its names.
+    :ivar dict soundex: Each Soundex code to the names with that code.
+    :ivar dict phonetic: Each phonetic key to the names with that key.
+    :ivar dict trigrams: Each trigram to the names that contain it.
+    '''
+
+    # The Soundex digit of each letter.  The vowels, H, W and Y have no digit.
+    SOUNDEX_DIGITS = {
+        'B': '1', 'F': '1', 'P': '1', 'V': '1',
+        'C': '2', 'G': '2', 'J': '2', 'K': '2', 'Q': '2', 'S': '2', 'X': '2', 'Z': '2',
+        'D': '3', 'T': '3',
+        'L': '4',
+        'M': '5', 'N': '5',
+        'R': '6',
+    }
+
+    # The vowels are only sounded at the start of a name.
+    VOWELS = ('A', 'E', 'I', 'O', 'U')
+
+    # The letters that change the sound of a C or a G before them.
+    SOFTENERS = ('E', 'I', 'Y')
+
+    # The lowest score of a name that is spelt alike but does not sound alike.
+    MIN_SIMILARITY = 0.5
+
+    # The extra score for a name with the same phonetic key and with the same Soundex code.
+    PHONETIC_SCORE = 0.2
+    SOUNDEX_SCORE = 0.1
+
+    # The score of a name that starts with the search, for example a partly typed name.
+    PREFIX_SCORE = 0.8
+
+
+
+    def getLetters(name):
+        ''' Returns the letters A to Z in the specified name in upper case.  The accents are removed, so Müller is MULLER. '''
+        letters = unicodedata.normalize('NFKD', name.upper())
+        return ''.join(letter for letter in letters if 'A' <= letter <= 'Z')
+
+
+
+    def getSoundex(name):
+        ''' Returns the American Soundex code of the specified name, for example W435 for Walton, or an empty string. '''
+        letters = GedComNames.getLetters(name)
+        if letters == '':
+            return ''
+        code = letters[0]
+        lastDigit = GedComNames.SOUNDEX_DIGITS.get(letters[0], '')
+        for letter in letters[1:]:
+            digit = GedComNames.SOUNDEX_DIGITS.get(letter, '')
+            if digit != '' and digit != lastDigit:
+                code += digit
+                if len(code) == 4:
+                    return code
+            # H and W do not separate letters with the same digit, the vowels do.
+            if letter not in 'HW':
+                lastDigit = digit
+        return code.ljust(4, '0')
+
+
+
+    def getPhonetic(name):
+        '''
+        Returns the phonetic key of the specified name, for example WLTN for Walton and SM0 for Smith or Smyth.
+        This follows the main rules of Metaphone, the consonants are reduced to their sounds and the vowels are dropped after the first letter.
+        '''
+        letters = GedComNames.getLetters(name)
+        if letters[:2] in ('AE', 'GN', 'KN', 'PN', 'WR'):
+            letters = letters[1:]
+        elif letters[:1] == 'X':
+            letters = 'S' + letters[1:]
+        elif letters[:2] == 'WH':
+            letters = 'W' + letters[2:]
+
+        key = ''
+        length = len(letters)
+        index = 0
+        while index < length:
+            letter = letters[index]
+            previous = letters[index - 1] if index > 0 else ''
+            following = letters[index + 1] if index + 1 < length else ''
+            sound = ''
+            if letter == previous and letter != 'C':
+                # Double letters sound as one.
+                pass
+            elif letter in GedComNames.VOWELS:
+                if index == 0:
+                    sound = letter
+            elif letter == 'B':
+                # A final B after M is silent, for example Plumb.
+                if not (previous == 'M' and index + 1 == length):
+                    sound = 'B'
+            elif letter == 'C':
+                if letters[index:index + 3] == 'CIA' or letters[index:index + 2] == 'CH':
+                    sound = 'K' if previous == 'S' else 'X'
+                    if following == 'H':
+                        index += 1
+                elif following in GedComNames.SOFTENERS:
+                    if previous != 'S':
+                        sound = 'S'
+                else:
+                    sound = 'K'
+            elif letter == 'D':
+                if following == 'G' and letters[index + 2:index + 3] in GedComNames.SOFTENERS:
+                    sound = 'J'
+                    index += 1
+                else:
+                    sound = 'T'
+            elif letter == 'G':
+                if following == 'H' and index + 2 < length and letters[index + 2] not in GedComNames.VOWELS:
+                    # A silent GH, for example Wright.
+                    pass
+                elif following == 'H' and index > 0:
+                    # A GH at the end or before a vowel sounds like F, for example Hough.
+                    sound = 'F'
+                    index += 1
+                elif following == 'N' and (index + 2 == length or letters[index + 2:index + 4] == 'ED'):
+                    pass
+                elif following in GedComNames.SOFTENERS and previous != 'G':
+                    sound = 'J'
+                else:
+                    sound = 'K'
+            elif letter == 'H':
+                # H is only sounded before a vowel and not after a letter that it changes.
+                if following in GedComNames.VOWELS and previous not in ('C', 'G', 'P', 'S', 'T'):
+                    sound = 'H'
+            elif letter == 'K':
+                if previous != 'C':
+                    sound = 'K'
+            elif letter == 'P':
+                if following == 'H':
+                    sound = 'F'
+                    index += 1
+                else:
+                    sound = 'P'
+            elif letter == 'Q':
+                sound = 'K'
+            elif letter == 'S':
+                if following == 'H' or letters[index:index + 3] in ('SIO', 'SIA'):
+                    sound = 'X'
+                    if following == 'H':
+                        index += 1
+                else:
+                    sound = 'S'
+            elif letter == 'T':
+                if letters[index:index + 3] in ('TIA', 'TIO'):
+                    sound = 'X'
+                elif following == 'H':
+                    sound = '0'
+                    index += 1
+                elif letters[index:index + 3] != 'TCH':
+                    sound = 'T'
+            elif letter == 'V':
+                sound = 'F'
+            elif letter == 'W' or letter == 'Y':
+                # W and Y are only sounded before a vowel.
+                if following in GedComNames.VOWELS:
+                    sound = letter
+            elif letter == 'X':
+                sound = 'KS'
+            elif letter == 'Z':
+                sound = 'S'
+            else:
+                # F, J, L, M, N and R.
+                sound = letter
+            if sound != '' and not key.endswith(sound):
+                key += sound
+            index += 1
+        return key
+
+
+
+    def getTrigrams(name):
+        ''' Returns the set of the trigrams of the specified name.  The name is padded with spaces so the start and the end of the name have their own trigrams. '''
+        padded = f'  {name} '
+        return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+
+    def getDistance(name, other):
+        ''' Returns the Levenshtein edit distance between the specified names. '''
+        if len(name) < len(other):
+            name, other = other, name
+        previous = list(range(len(other) + 1))
+        for index, letter in enumerate(name):
+            current = [index + 1]
+            for otherIndex, otherLetter in enumerate(other):
+                current.append(min(previous[otherIndex + 1] + 1, current[otherIndex] + 1, previous[otherIndex] + (letter != otherLetter)))
+            previous = current
+        return previous[-1]
+
+
+
+    def __init__(self, individuals):
+        '''
+        Class constructor for the :py:class:`GedComNames` class.
+        The individuals are the record objects, for example gedcom.individuals.values().
+        '''
+        self.individuals = {}
+        self.recordNames = {}
+        self.soundex = {}
+        self.phonetic = {}
+        self.trigrams = {}
+        for individual in individuals:
+            self.addIndividual(individual)
+
+
+
+    def addName(self, name):
+        ''' Add the codes and trigrams of the specified new name. '''
+        for index, code in ((self.soundex, GedComNames.getSoundex(name)), (self.phonetic, GedComNames.getPhonetic(name))):
+            if code != '':
+                if code not in index:
+                    index[code] = set()
+                index[code].add(name)
+        for trigram in GedComNames.getTrigrams(name):
+            if trigram not in self.trigrams:
+                self.trigrams[trigram] = set()
+            self.trigrams[trigram].add(name)
+
+
+
+    def addIndividual(self, individual):
+        ''' Add the given names and surname of the specified individual. '''
+        identity = individual.identity
+        for name in GedComSearch.getWords(f'{individual.givenName} {individual.surname}'):
+            if name not in self.individuals:
+                self.individuals[name] = []
+                self.addName(name)
+            if identity not in self.recordNames:
+                self.recordNames[identity] = []
+            if name not in self.recordNames[identity]:
+                self.recordNames[identity].append(name)
+                self.individuals[name].append(identity)
+
+
+
+    def removeRecord(self, identity):
+        '''
+        Remove all the names of the specified individual.
+        A name stays in the codes and trigrams when no individual has it, it just does not match anything.
+        '''
+        if identity not in self.recordNames:
+            return
+        for name in self.recordNames.pop(identity):
+            self.individuals[name].remove(identity)
+
+
+
+    def updateIndividual(self, individual):
+        ''' Replace the names of the specified individual after it has been edited. '''
+        self.removeRecord(individual.identity)
+        self.addIndividual(individual)
+
+
+
+    def getMatches(self, word):
+        '''
+        Returns a dictionary of the names like the specified word to their score, 1 for the same spelling and more for the same sound.
+        The candidates are the names with the same Soundex code or phonetic key and the names that share enough trigrams with the word.
+        '''
+        soundexNames = self.soundex.get(GedComNames.getSoundex(word), set())
+        phoneticNames = self.phonetic.get(GedComNames.getPhonetic(word), set())
+        candidates = soundexNames.union(phoneticNames)
+
+        # Count the shared trigrams, a name of n letters has about n + 1 trigrams.
+        # One edit changes at most 3 trigrams, so a short name one edit away still shares all but 3 of the trigrams.
+        trigrams = GedComNames.getTrigrams(word)
+        oneEdit = max(2, len(trigrams) - 3)
+        counts = Counter()
+        for trigram in trigrams:
+            counts.update(self.trigrams.get(trigram, ()))
+        for name, count in counts.items():
+            if count >= oneEdit or 2 * count >= GedComNames.MIN_SIMILARITY * (len(trigrams) + len(name) + 1):
+                candidates.add(name)
+
+        matches = {}
+        for name in candidates:
+            if len(self.individuals[name]) == 0:
+                continue
+            isPhonetic = name in phoneticNames
+            isSoundex = name in soundexNames
+            length = max(len(word), len(name))
+            if name.startswith(word):
+                score = max(1 - (len(name) - len(word)) / length, GedComNames.PREFIX_SCORE)
+            elif not isPhonetic and not isSoundex and abs(len(name) - len(word)) > (1 - GedComNames.MIN_SIMILARITY) * length:
+                # The edit distance is at least the difference in length, so this name is not close enough.
+                continue
+            else:
+                score = 1 - GedComNames.getDistance(word, name) / length
+            if score < GedComNames.MIN_SIMILARITY and not isPhonetic and not isSoundex:
+                continue
+            if isPhonetic:
+                score += GedComNames.PHONETIC_SCORE
+            if isSoundex:
+                score += GedComNames.SOUNDEX_SCORE
+            matches[name] = score
+        return matches
+
+
+
+    def getIndividuals(self, query, count = None):
+        '''
+        Returns the identities of the individuals with names like the specified query, best match first.
+        The individuals that match the most words of the query come first and then the individuals with the highest total score.
+        The count is the maximum number of identities to return or None for all of them.
+        '''
+        # The identity of each individual to [number of words matched, total score].
+        scores = {}
+        for word in set(GedComSearch.getWords(query)):
+            # The best score of each individual for this word, the names are read best first.
+            best = {}
+            matches = [(score, name) for name, score in self.getMatches(word).items()]
+            matches.sort(reverse=True)
+            for score, name in matches:
+                for identity in self.individuals[name]:
+                    if identity not in best:
+                        best[identity] = score
+            for identity, score in best.items():
+                if identity in scores:
+                    scores[identity][0] += 1
+                    scores[identity][1] += score
+                else:
+                    scores[identity] = [1, score]
+
+        ranked = [(-matched, -score, identity) for identity, (matched, score) in scores.items()]
+        ranked.sort()
+        if count is not None:
+            ranked = ranked[:count]
+        return [identity for _, _, identity in ranked]
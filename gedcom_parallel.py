@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support parsing gedcom files with several processes in the gedcom python library.
+This module implements the :py:class:`GedComParallel` class.
+'''
+# System Libraries.
+import concurrent.futures
+import io
+import pickle
+
+# Application Libraries.
+from gedcom_line import GedComLine
+from gedcom_index import GedComIndex
+from gedcom_identities import GedComIdentities
+from gedcom_reader import GedComReader
+from place import Place
+
+
+
+class GedComParallel:
+    '''
+    Class to parse the records of a gedcom file in a pool of processes.
+    The file is split into contiguous chunks of level 0 records, each chunk is parsed in its own process.
+    The results are returned in the order of the file so that the records and places are always merged in the same order.
+    Each worker has its own registry of identities, so the identities in the results are interned again in the registry of this process.
+    '''
+
+
+
+    def getChunks(fileName, count):
+        ''' Returns the (start, end) byte ranges that split the specified gedcom file into about count chunks on record boundaries. '''
+        index = GedComIndex(fileName)
+        index.close()
+        if len(index.records) == 0:
+            return []
+        fileStart = index.records[0][2]
+        fileEnd = index.records[-1][3]
+        chunkSize = max(1, (fileEnd - fileStart) // count)
+        chunks = []
+        start = fileStart
+        for _, _, _, end in index.records:
+            if end - start >= chunkSize:
+                chunks.append((start, end))
+                start = end
+        if start < fileEnd:
+            chunks.append((start, fileEnd))
+        return chunks
+
+
+
+    def parseChunk(fileName, start, end):
+        '''
+        Returns the (tag, record) for each record and the places in the specified byte range of the gedcom file, pickled by :py:func:`dumps`.
+        This runs in a worker process.
+        '''
+        Place.reset()
+        GedComIdentities.reset()
+        with open(fileName, 'rb') as file:
+            file.seek(start)
+            data = file.read(end - start)
+        text = data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+        records = []
+        objectLines = []
+        for line in GedComLine.fromText(text) + [None]:
+            if (line is None or line.level == 0) and len(objectLines) > 0:
+                tag = objectLines[0].tag
+                record = GedComReader.createRecord(tag, objectLines)
+                if record is not None:
+                    records.append((tag, record))
+                objectLines = []
+            if line is not None:
+                objectLines.append(line)
+        return GedComParallel.dumps((records, Place.allPlaces))
+
+
+
+    def getPersistentId(value):
+        ''' Returns the identity when the specified value is an identity in the registry of this process, otherwise None to pickle the value as normal. '''
+        if type(value) is str and value in GedComIdentities.handles:
+            return value
+        return None
+
+
+
+    def dumps(results):
+        ''' Returns the specified results of a worker as bytes with the identities marked, so that :py:func:`loads` can intern them. '''
+        stream = io.BytesIO()
+        pickler = pickle.Pickler(stream, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = GedComParallel.getPersistentId
+        pickler.dump(results)
+        return stream.getvalue()
+
+
+
+    def loads(data):
+        ''' Returns the results of a worker from the specified bytes with every identity interned in the registry of this process. '''
+        unpickler = pickle.Unpickler(io.BytesIO(data))
+        unpickler.persistent_load = GedComIdentities.intern
+        return unpickler.load()
+
+
+
+    def parseFile(fileName, workers):
+        ''' Generator for the (records, places) of each chunk of the specified gedcom file in the order of the file. '''
+        chunks = GedComParallel.getChunks(fileName, workers * 4)
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            for data in executor.map(GedComParallel.parseChunk, [fileName] * len(chunks), [start for start, _ in chunks], [end for _, end in chunks]):
+                yield GedComParallel.loads(data)
@@ -9,6 +9,7 @@ from enum import Enum
 
 # Application Libraries.
 from place import Place
+from gedcom_block import GedComBlock
 
 
 
@@ -48,31 +49,34 @@ class GedComPlace:
         if len(gedcomFile) == 0:
             return
 
-        for line in gedcomFile:
-            # print(f'\t{line}')
-            tags = line.split()
-            if tags[1] == 'PLAC':
-                self.place = line[7:]
-            elif tags[1] == 'ADDR':
-                self.address = line[7:]
-            elif tags[1] == 'CTRY':
-                self.country = line[7:]
-            elif tags[1] == 'MAP':
+        for line in GedComBlock.toBlock(gedcomFile):
+            if line.tag == 'PLAC':
+                self.place = line.value
+            elif line.tag == 'ADDR':
+                self.address = line.value
+            elif line.tag == 'CTRY':
+                self.country = line.value
+            elif line.tag == 'MAP':
                 pass
-            elif tags[1] == 'LATI':
-                self.latitude = line[7:]
-            elif tags[1] == 'LONG':
-                self.longitude = line[7:]
-            elif tags[1] == 'SOUR':
-                self.sources.append(tags[2][1:-1])
+            elif line.tag == 'LATI':
+                self.latitude = line.value
+            elif line.tag == 'LONG':
+                self.longitude = line.value
+            elif line.tag == 'SOUR':
+                self.sources.append(line.getPointer())
             else:
                 # Unknown.
-                print(f'Place unrecogised tag \'{tags[1]}\'')
+                print(f'Place unrecogised tag \'{line.tag}\'')
 
+        place = Place.getPlace(self.getPlaceName(), self.address, self.country, self.latitude, self.longitude)
+
+
+
+    def getPlaceName(self):
+        ''' Returns the name of the :py:class:`Place` in :py:attr:`Place.allPlaces` for this place. '''
         if self.address is None or self.address == '':
-            place = Place.getPlace(self.place, self.address, self.country, self.latitude, self.longitude)
-        else:
-            place = Place.getPlace(f'{self.address}, {self.place}', self.address, self.country, self.latitude, self.longitude)
+            return self.place
+        return f'{self.address}, {self.place}'
 
 
 
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support the index of the records at each place in the gedcom python library.
+This module implements the :py:class:`GedComPlaceUsage` class.
+'''
+# System Libraries.
+
+# Application Libraries.
+from place import Place
+from gedcom_tag import GedComTag
+
+
+
+class GedComPlaceUsage:
+    '''
+    Class to represent the index from each :py:class:`Place` to the individuals, families and sources with an event there.
+    A record is added to the place of the event and to every parent of that place, so a county or a country lists everything in it.
+    Each use has a label for the event, for example 'Birth Place' or 'Census 1881'.
+    A source has an empty label.
+    The index is built once from the records and then each record is updated after it is edited.
+
+    :ivar dict individuals: The identity of each place to a dictionary of the identities of the individuals there to their labels.
+    :ivar dict families: The identity of each place to a dictionary of the identities of the families there to their labels.
+    :ivar dict sources: The identity of each place to a dictionary of the identities of the sources there to their labels.
+    :ivar dict recordPlaces: The identity of each record to the identities of the places that it is added to.
+    '''
+
+
+
+    def __init__(self, individuals, families, sources):
+        '''
+        Class constructor for the :py:class:`GedComPlaceUsage` class.
+        The individuals, families and sources are the record objects, for example gedcom.individuals.values().
+        The places must already be in :py:attr:`Place.allPlaces`.
+        '''
+        self.individuals = {}
+        self.families = {}
+        self.sources = {}
+        self.recordPlaces = {}
+        for individual in individuals:
+            self.addIndividual(individual)
+        for family in families:
+            self.addFamily(family)
+        for source in sources:
+            self.addSource(source)
+
+
+
+    def add(self, usage, gedcomPlace, recordIdentity, label):
+        ''' Add the specified label of the specified record to the specified :py:class:`GedComPlace` and all its parent places. '''
+        if gedcomPlace is None:
+            return
+        place = Place.allPlaces.get(gedcomPlace.getPlaceName())
+        while place is not None:
+            if place.identity not in usage:
+                usage[place.identity] = {}
+            records = usage[place.identity]
+            if recordIdentity not in records:
+                records[recordIdentity] = []
+                if recordIdentity not in self.recordPlaces:
+                    self.recordPlaces[recordIdentity] = []
+                self.recordPlaces[recordIdentity].append(place.identity)
+            records[recordIdentity].append(label)
+            place = place.parent
+
+
+
+    def addIndividual(self, individual):
+        ''' Add the places of the specified individual in the order that they are shown. '''
+        identity = individual.identity
+        if individual.birth is not None:
+            self.add(self.individuals, individual.birth.place, identity, 'Birth Place')
+        if individual.death is not None:
+            self.add(self.individuals, individual.death.place, identity, 'Death Place')
+        if individual.census is not None:
+            for census in individual.census:
+                self.add(self.individuals, census.place, identity, census.getLabel())
+        if individual.tags is not None:
+            for tag in individual.tags:
+                self.add(self.individuals, tag.place, identity, GedComTag.tagToLabel(tag.type))
+
+
+
+    def addFamily(self, family):
+        ''' Add the places of the specified family. '''
+        if family.marriage is not None:
+            self.add(self.families, family.marriage.place, family.identity, 'Marriage Place')
+
+
+
+    def addSource(self, source):
+        ''' Add the place of the specified source. '''
+        self.add(self.sources, source.place, source.identity, '')
+
+
+
+    def removeRecord(self, identity):
+        ''' Remove all the places of the specified individual, family or source. '''
+        if identity not in self.recordPlaces:
+            return
+        for place in self.recordPlaces.pop(identity):
+            for usage in (self.individuals, self.families, self.sources):
+                if place in usage and identity in usage[place]:
+                    del usage[place][identity]
+
+
+
+    def updateIndividual(self, individual):
+        ''' Replace the places of the specified individual after it has been edited. '''
+        self.removeRecord(individual.identity)
+        self.addIndividual(individual)
+
+
+
+    def updateFamily(self, family):
+        ''' Replace the places of the specified family after it has been edited. '''
+        self.removeRecord(family.identity)
+        self.addFamily(family)
+
+
+
+    def updateSource(self, source):
+        ''' Replace the place of the specified source after it has been edited. '''
+        self.removeRecord(source.identity)
+        self.addSource(source)
+
+
+
+    def getIndividuals(self, identity):
+        ''' Returns a dictionary of the identities of the individuals at the specified place to their labels. '''
+        return self.individuals.get(identity, {})
+
+
+
+    def getFamilies(self, identity):
+        ''' Returns a dictionary of the identities of the families at the specified place to their labels. '''
+        return self.families.get(identity, {})
+
+
+
+    def getSources(self, identity):
+        ''' Returns a dictionary of the identities of the sources at the specified place to their labels. '''
+        return self.sources.get(identity, {})
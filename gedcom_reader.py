@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support streaming the records of a gedcom file in the gedcom python library.
+This module implements the :py:class:`GedComReader` class.
+'''
+# System Libraries.
+
+# Application Libraries.
+from gedcom_line import GedComLine
+from gedcom_identities import GedComIdentities
+from gedcom_individual import GedComIndividual
+from gedcom_family import GedComFamily
+from gedcom_source import GedComSource
+from gedcom_media import GedComMedia
+from place import Place
+
+
+
+class GedComReader:
+    '''
+    Class to stream the records of a gedcom file one at a time without building a :py:class:`GedCom`.
+    Only the lines of the current record are kept in memory, so this is suitable for files that are too large to open.
+    The places of each record are kept in a private registry so :py:attr:`Place.allPlaces` is not changed.
+    The identities of each record are also kept in a private registry, so :py:class:`GedComIdentities` does not grow with the file.
+    '''
+
+    # The level 0 tags of the records that can be streamed.
+    TYPES = ('INDI', 'FAM', 'SOUR', 'OBJE')
+
+
+
+    def createRecord(tag, lines):
+        '''
+        Returns the record built from the specified lines with the specified level 0 tag or None when the tag is not a record, for example 'HEAD'.
+        This is shared by all the loaders, so each tag is built the same way.
+        '''
+        if tag == 'INDI':
+            return GedComIndividual(lines)
+        if tag == 'FAM':
+            return GedComFamily(lines)
+        if tag == 'SOUR':
+            return GedComSource(lines)
+        if tag == 'OBJE':
+            # Keep the current gedcom of the media class.
+            return GedComMedia(GedComMedia.gedcom, lines)
+        if tag not in ('REPO', 'HEAD', 'TRLR'):
+            print('Unknown Gedcom object.')
+            print(f'\t{lines[0]}')
+        return None
+
+
+
+    def buildRecord(tag, lines):
+        ''' Returns the record built from the specified lines with its places in a private registry. '''
+        allPlaces = Place.allPlaces
+        rootPlaces = Place.rootPlaces
+        Place.reset()
+        try:
+            return GedComReader.createRecord(tag, lines)
+        finally:
+            Place.allPlaces = allPlaces
+            Place.rootPlaces = rootPlaces
+
+
+
+    def iterRecords(fileName, types = None):
+        '''
+        Generator for the records in the specified gedcom file in the order of the file.
+        Only the records with a level 0 tag in types are built, the default is all the types in :py:attr:`TYPES`.
+        The records are not connected to a gedcom, so the families of an individual are in the order of the file.
+        '''
+        if types is None:
+            types = GedComReader.TYPES
+        tag = None
+        objectLines = []
+        # Read the lines into a private registry of identities and restore the registry of the gedcom while the caller has each record.
+        registry = GedComIdentities.swap()
+        try:
+            for line in GedComLine.readFile(fileName):
+                if line.level == 0:
+                    if tag is not None:
+                        record = GedComReader.buildRecord(tag, objectLines)
+                        GedComIdentities.swap(*registry)
+                        yield record
+                        registry = GedComIdentities.swap()
+                    tag = line.tag if line.tag in types and line.tag in GedComReader.TYPES else None
+                    objectLines = []
+                if tag is not None:
+                    objectLines.append(line)
+            if tag is not None:
+                record = GedComReader.buildRecord(tag, objectLines)
+                GedComIdentities.swap(*registry)
+                yield record
+                registry = GedComIdentities.swap()
+        finally:
+            GedComIdentities.swap(*registry)
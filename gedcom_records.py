@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support a collection of gedcom records in the gedcom python library.
+This module implements the :py:class:`GedComRecords` class.
+'''
+# System Libraries.
+import collections.abc
+import datetime
+import threading
+
+# Application Libraries.
+from gedcom_line import GedComLine
+from gedcom_block import GedComBlock
+from gedcom_change import GedComChange
+
+
+
+class GedComRecords(collections.abc.MutableMapping):
+    '''
+    Class to represent the records of one type in a gedcom, for example the individuals.
+    This is a dictionary of identity to record.
+    A record can be added as the offsets of its text, in which case the record object is only built the first time it is used.
+
+    :ivar dict records: The records by identity.  A record is None until it is built from its text.
+    :ivar dict offsets: The start and end offsets of the text of the records that have not been built yet.
+    :ivar function factory: The function that builds a record from its lines.
+    :ivar function reader: The function that returns the text between two offsets.
+    '''
+
+    # The lock while a record is built.  The records might be built by a background thread and the main thread at the same time.
+    lock = threading.RLock()
+
+
+
+    def __init__(self, factory = None, reader = None):
+        ''' Class constructor for the :py:class:`GedComRecords` class. '''
+        self.records = {}
+        self.offsets = {}
+        self.factory = factory
+        self.reader = reader
+
+
+
+    def addOffsets(self, identity, start, end):
+        ''' Add a record that will be built from the text between the specified offsets when it is first used. '''
+        self.records[identity] = None
+        self.offsets[identity] = (start, end)
+
+
+
+    def getText(self, identity):
+        ''' Returns the original text of a record that has not been built yet or None if the record has been built. '''
+        offsets = self.offsets.get(identity)
+        if offsets is None:
+            return None
+        return self.reader(*offsets)
+
+
+
+    def isBuilt(self, identity):
+        ''' Returns True if the record with the specified identity has been built. '''
+        return self.records[identity] is not None
+
+
+
+    def buildAll(self):
+        ''' Build all the records that have not been built yet. '''
+        for identity in self.offsets.copy():
+            self[identity]
+
+
+
+    def byChange(self, identity):
+        ''' Key for a list sort of identities by last change.  The record is not built to find the change. '''
+        text = self.getText(identity)
+        if text is None:
+            change = self[identity].change
+        else:
+            # Only parse the change block of the record.
+            change = None
+            block = GedComBlock.toBlock(GedComLine.fromText(text))
+            subBlock, start = block.getNextBlock(1)
+            while len(subBlock) > 0:
+                if subBlock.first.tag == 'CHAN':
+                    change = GedComChange(subBlock)
+                subBlock, start = block.getNextBlock(start)
+        if change is None:
+            return datetime.datetime(1980, 1, 1)
+        return change.datetime
+
+
+
+    def __getitem__(self, identity):
+        ''' Magic Method to return the record with the specified identity, building it if required. '''
+        record = self.records[identity]
+        if record is None:
+            with GedComRecords.lock:
+                # Another thread might have built the record while waiting for the lock.
+                record = self.records[identity]
+                if record is None:
+                    # The parser tokenizes the text and the record keeps the text as its original gedcom.
+                    # The original gedcom is without the final line feed, the same as a record that was not lazy.
+                    record = self.factory(GedComBlock.fromText(self.getText(identity).rstrip('\n')))
+                    self.records[identity] = record
+                    del self.offsets[identity]
+        return record
+
+
+
+    def __setitem__(self, identity, record):
+        ''' Magic Method to add or replace the record with the specified identity. '''
+        self.records[identity] = record
+        self.offsets.pop(identity, None)
+
+
+
+    def __delitem__(self, identity):
+        ''' Magic Method to remove the record with the specified identity. '''
+        del self.records[identity]
+        self.offsets.pop(identity, None)
+
+
+
+    def __contains__(self, identity):
+        ''' Magic Method to return True if the identity is in the records without building the record. '''
+        return identity in self.records
+
+
+
+    def __iter__(self):
+        ''' Magic Method to iterate through the identities in the records. '''
+        return iter(self.records)
+
+
+
+    def __len__(self):
+        ''' Magic Method to return the number of records. '''
+        return len(self.records)
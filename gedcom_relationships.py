@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support the relationship graph in the gedcom python library.
+This module implements the :py:class:`GedComRelationships` class.
+'''
+# System Libraries.
+from array import array
+from collections import deque
+
+# Application Libraries.
+from gedcom_identities import GedComIdentities
+
+
+
+class GedComRelationships:
+    '''
+    Class to represent the parent, child and spouse links between the individuals of a gedcom.
+    The links are built once from the individuals and families and then read without touching the records.
+    The individuals and families are referred to by their :py:class:`GedComIdentities` handles.
+    The children and spouses are kept as compressed sparse row arrays, the links of handle h are targets[offsets[h]:offsets[h + 1]].
+    The graph is a snapshot, build a new object after the gedcom changes.
+
+    :ivar int count: The number of handles covered by the arrays.
+    :ivar array birthKeys: The sort key of the date of birth of each individual, 0 when unknown.
+    :ivar array fathers: The handle of the father of each individual or -1.
+    :ivar array mothers: The handle of the mother of each individual or -1.
+    :ivar array childOffsets: The start of the children of each individual in :py:attr:`childHandles`.
+    :ivar array childHandles: The children of the individuals sorted by date of birth.
+    :ivar array spouseOffsets: The start of the spouses of each individual in :py:attr:`spouseHandles`.
+    :ivar array spouseHandles: The spouses of the individuals in the order of their families.
+    :ivar array familyChildOffsets: The start of the children of each family in :py:attr:`familyChildHandles`.
+    :ivar array familyChildHandles: The children of the families in the order of the gedcom.
+    :ivar list cycles: The identities of the individuals that are their own ancestors or None until :py:func:`getCycles` is called.
+    '''
+
+
+
+    def toArrays(links, count):
+        ''' Returns the (offsets, targets) arrays for the specified dictionary of lists of handles. '''
+        offsets = array('i')
+        targets = array('i')
+        for handle in range(count):
+            offsets.append(len(targets))
+            if handle in links:
+                targets.extend(links[handle])
+        offsets.append(len(targets))
+        return offsets, targets
+
+
+
+    def __init__(self, individuals, families):
+        '''
+        Class constructor for the :py:class:`GedComRelationships` class.
+        The individuals and families are the gedcom.individuals and gedcom.families records.
+        '''
+        getHandle = GedComIdentities.getHandle
+
+        # Register all the handles before sizing the arrays, after this the handles are read directly.
+        individualHandles = [(getHandle(identity), individual) for identity, individual in individuals.items()]
+        familyHandles = {}
+        for identity, family in families.items():
+            familyHandles[identity] = (getHandle(identity), family)
+        for family in families.values():
+            for identity in (family.husbandIdentity, family.wifeIdentity):
+                if identity is not None:
+                    getHandle(identity)
+            for identity in family.childrenIdentities:
+                getHandle(identity)
+        self.count = GedComIdentities.getCount()
+        handles = GedComIdentities.handles
+
+        self.birthKeys = array('i', bytes(4 * self.count))
+        self.fathers = array('i', [-1]) * self.count
+        self.mothers = array('i', [-1]) * self.count
+        for handle, individual in individualHandles:
+            if individual.birth is not None and individual.birth.date is not None:
+                self.birthKeys[handle] = individual.birth.date.sortKey
+
+        # The children of each family in the gedcom order.
+        familyChildren = {}
+        for familyHandle, family in familyHandles.values():
+            familyChildren[familyHandle] = [handles[identity] for identity in family.childrenIdentities]
+
+        # The parents of each individual from their parent family.
+        for handle, individual in individualHandles:
+            if individual.parentFamilyIdentity in familyHandles:
+                _, family = familyHandles[individual.parentFamilyIdentity]
+                if family.husbandIdentity is not None:
+                    self.fathers[handle] = handles[family.husbandIdentity]
+                if family.wifeIdentity is not None:
+                    self.mothers[handle] = handles[family.wifeIdentity]
+
+        # The children of each individual over all their families, sorted into date of birth order.
+        individualChildren = {}
+        individualSpouses = {}
+        for handle, individual in individualHandles:
+            children = []
+            spouses = []
+            for familyIdentity in individual.familyIdentities:
+                if familyIdentity.identity not in familyHandles:
+                    continue
+                familyHandle, family = familyHandles[familyIdentity.identity]
+                children.extend(familyChildren[familyHandle])
+                for spouseIdentity in (family.husbandIdentity, family.wifeIdentity):
+                    if spouseIdentity is not None and spouseIdentity != individual.identity:
+                        spouses.append(handles[spouseIdentity])
+            if len(children) > 1:
+                children.sort(key=self.birthKeys.__getitem__)
+            if len(children) > 0:
+                individualChildren[handle] = children
+            if len(spouses) > 0:
+                individualSpouses[handle] = spouses
+
+        self.childOffsets, self.childHandles = GedComRelationships.toArrays(individualChildren, self.count)
+        self.spouseOffsets, self.spouseHandles = GedComRelationships.toArrays(individualSpouses, self.count)
+        self.familyChildOffsets, self.familyChildHandles = GedComRelationships.toArrays(familyChildren, self.count)
+        self.cycles = None
+
+
+
+    def getLinks(self, identity, offsets, targets):
+        ''' Returns the identities linked to the specified identity in the specified offsets and targets arrays. '''
+        handle = GedComIdentities.handles.get(identity)
+        if handle is None or handle >= self.count:
+            return []
+        return [GedComIdentities.identities[target] for target in targets[offsets[handle]:offsets[handle + 1]]]
+
+
+
+    def getChildren(self, identity):
+        ''' Returns the identities of the children of the specified individual in date of birth order. '''
+        return self.getLinks(identity, self.childOffsets, self.childHandles)
+
+
+
+    def getSpouses(self, identity):
+        ''' Returns the identities of the spouses of the specified individual in the order of their families. '''
+        return self.getLinks(identity, self.spouseOffsets, self.spouseHandles)
+
+
+
+    def getFamilyChildren(self, identity):
+        ''' Returns the identities of the children of the specified family in the gedcom order. '''
+        return self.getLinks(identity, self.familyChildOffsets, self.familyChildHandles)
+
+
+
+    def getParents(self, identity):
+        ''' Returns the (father, mother) identities of the specified individual.  An unknown parent is None. '''
+        handle = GedComIdentities.handles.get(identity)
+        if handle is None or handle >= self.count:
+            return None, None
+        father = self.fathers[handle]
+        mother = self.mothers[handle]
+        return None if father < 0 else GedComIdentities.identities[father], None if mother < 0 else GedComIdentities.identities[mother]
+
+
+
+    def getSiblings(self, identity):
+        '''
+        Returns the identities of the siblings of the specified individual in date of birth order.
+        The siblings are all the children of the father and the mother, so half siblings are included.
+        '''
+        handle = GedComIdentities.handles.get(identity)
+        if handle is None or handle >= self.count:
+            return []
+        siblings = []
+        isSeen = {handle}
+        for parent in (self.fathers[handle], self.mothers[handle]):
+            if parent >= 0:
+                for child in self.childHandles[self.childOffsets[parent]:self.childOffsets[parent + 1]]:
+                    if child not in isSeen:
+                        isSeen.add(child)
+                        siblings.append(child)
+        if len(siblings) > 1:
+            siblings.sort(key=self.birthKeys.__getitem__)
+        return [GedComIdentities.identities[sibling] for sibling in siblings]
+
+
+
+    def getParentHandles(self, handle):
+        ''' Returns the handles of the known parents of the specified handle. '''
+        return [parent for parent in (self.fathers[handle], self.mothers[handle]) if parent >= 0]
+
+
+
+    def getChildHandles(self, handle):
+        ''' Returns the handles of the children of the specified handle in date of birth order. '''
+        return self.childHandles[self.childOffsets[handle]:self.childOffsets[handle + 1]]
+
+
+
+    def traverse(self, identity, generations, getLinks):
+        '''
+        Generator for the (identity, generation) of the individuals reached from the specified individual with the specified links function.
+        The individuals are visited breadth first, so in generation order, and each individual is returned once at its nearest generation.
+        This collapses the shared ancestors of a pedigree and stops any cycles in bad data.
+        The generations is the maximum generation to return or None for all the generations.
+        '''
+        handle = GedComIdentities.handles.get(identity)
+        if handle is None or handle >= self.count:
+            return
+        isSeen = {handle}
+        queue = deque(((handle, 0), ))
+        while len(queue) > 0:
+            handle, generation = queue.popleft()
+            if generations is not None and generation >= generations:
+                continue
+            generation += 1
+            for link in getLinks(handle):
+                if link not in isSeen:
+                    isSeen.add(link)
+                    queue.append((link, generation))
+                    yield GedComIdentities.identities[link], generation
+
+
+
+    def iterAncestors(self, identity, generations = None):
+        ''' Generator for the (identity, generation) of the ancestors of the specified individual.  The parents are generation 1. '''
+        return self.traverse(identity, generations, self.getParentHandles)
+
+
+
+    def iterDescendants(self, identity, generations = None):
+        ''' Generator for the (identity, generation) of the descendants of the specified individual.  The children are generation 1. '''
+        return self.traverse(identity, generations, self.getChildHandles)
+
+
+
+    def getCycles(self):
+        '''
+        Returns the identities of the individuals that are their own ancestors because of bad data.
+        The parent links are searched once with an iterative depth first search and the result is kept.
+        '''
+        if self.cycles is not None:
+            return self.cycles
+        # 0 for not visited, 1 for on the search path and 2 for finished.
+        states = bytearray(self.count)
+        isCycle = set()
+        for start in range(self.count):
+            if states[start] != 0:
+                continue
+            states[start] = 1
+            path = [start]
+            nextParents = [0]
+            while len(path) > 0:
+                handle = path[-1]
+                index = nextParents[-1]
+                if index < 2:
+                    nextParents[-1] = index + 1
+                    parent = self.fathers[handle] if index == 0 else self.mothers[handle]
+                    if parent < 0:
+                        continue
+                    if states[parent] == 1:
+                        # The parent is on the search path, so the path from the parent is a cycle.
+                        isCycle.update(path[path.index(parent):])
+                    elif states[parent] == 0:
+                        states[parent] = 1
+                        path.append(parent)
+                        nextParents.append(0)
+                else:
+                    states[handle] = 2
+                    path.pop()
+                    nextParents.pop()
+        self.cycles = [GedComIdentities.identities[handle] for handle in sorted(isCycle)]
+        return self.cycles
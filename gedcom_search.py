@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support the full text search in the gedcom python library.
+This module implements the :py:class:`GedComSearch` class.
+'''
+# System Libraries.
+import re
+import bisect
+
+# Application Libraries.
+from gedcom_tag import GedComTag
+
+
+
+class GedComSearch:
+    '''
+    Class to represent the inverted index from each word to the individuals and sources that contain it.
+    The words are taken from the names, notes, occupations and education of the individuals, their census notes and the titles and notes of the sources.
+    A word in a search matches all the indexed words that start with it and a record must match every word in the search.
+    Each match has a label for where the word was found, for example 'Name' or 'Census 1881'.
+    The index is built once from the records and then each record is updated after it is edited.
+
+    :ivar list words: All the indexed words in sorted order for the prefix matches.
+    :ivar dict individuals: Each word to a dictionary of the identities of the individuals that contain it to their labels.
+    :ivar dict sources: Each word to a dictionary of the identities of the sources that contain it to their labels.
+    :ivar dict recordWords: The identity of each record to the words that it contains.
+    '''
+
+    # The characters of a word.
+    WORD = re.compile(r'\w+')
+
+    # A character after all the others, the words that start with a prefix sort before the prefix followed by this character.
+    LAST_CHARACTER = '\U0010ffff'
+
+
+
+    def getWords(text):
+        ''' Returns the words in the specified text in lower case. '''
+        if text is None:
+            return []
+        if isinstance(text, list):
+            # The information of a grid is a list of rows of cells.
+            text = ' '.join(' '.join(row) for row in text)
+        return GedComSearch.WORD.findall(text.casefold())
+
+
+
+    def __init__(self, individuals, sources):
+        '''
+        Class constructor for the :py:class:`GedComSearch` class.
+        The individuals and sources are the record objects, for example gedcom.individuals.values().
+        '''
+        # The word list is sorted once after all the records are added.
+        self.words = None
+        self.individuals = {}
+        self.sources = {}
+        self.recordWords = {}
+        for individual in individuals:
+            self.addIndividual(individual)
+        for source in sources:
+            self.addSource(source)
+        self.words = sorted(set(self.individuals).union(self.sources))
+
+
+
+    def add(self, index, text, recordIdentity, label):
+        ''' Add the words of the specified text to the specified index with the specified label of the specified record. '''
+        for word in GedComSearch.getWords(text):
+            if word not in index:
+                if self.words is not None and word not in self.individuals and word not in self.sources:
+                    bisect.insort(self.words, word)
+                index[word] = {}
+            records = index[word]
+            if recordIdentity not in records:
+                records[recordIdentity] = []
+                if recordIdentity not in self.recordWords:
+                    self.recordWords[recordIdentity] = []
+                self.recordWords[recordIdentity].append(word)
+            if label not in records[recordIdentity]:
+                records[recordIdentity].append(label)
+
+
+
+    def addTags(self, index, tags, recordIdentity, label = None):
+        ''' Add the information of the specified tags and their child tags, for example CONT lines, to the specified index. '''
+        if tags is None:
+            return
+        for tag in tags:
+            tagLabel = GedComTag.tagToLabel(tag.type) if label is None else label
+            self.add(index, tag.information, recordIdentity, tagLabel)
+            self.addTags(index, tag.tags, recordIdentity, tagLabel)
+
+
+
+    def addIndividual(self, individual):
+        ''' Add the words of the specified individual. '''
+        identity = individual.identity
+        self.add(self.individuals, individual.givenName, identity, 'Name')
+        self.add(self.individuals, individual.surname, identity, 'Name')
+        self.addTags(self.individuals, individual.tags, identity)
+        if individual.census is not None:
+            for census in individual.census:
+                self.addTags(self.individuals, census.tags, identity, census.getLabel())
+
+
+
+    def addSource(self, source):
+        ''' Add the words of the specified source. '''
+        self.add(self.sources, source.title, source.identity, 'Title')
+        self.addTags(self.sources, source.tags, source.identity)
+
+
+
+    def removeRecord(self, identity):
+        '''
+        Remove all the words of the specified individual or source.
+        The words stay in :py:attr:`words` when no record contains them, they just do not match anything.
+        '''
+        if identity not in self.recordWords:
+            return
+        for word in self.recordWords.pop(identity):
+            for index in (self.individuals, self.sources):
+                if word in index and identity in index[word]:
+                    del index[word][identity]
+
+
+
+    def updateIndividual(self, individual):
+        ''' Replace the words of the specified individual after it has been edited. '''
+        self.removeRecord(individual.identity)
+        self.addIndividual(individual)
+
+
+
+    def updateSource(self, source):
+        ''' Replace the words of the specified source after it has been edited. '''
+        self.removeRecord(source.identity)
+        self.addSource(source)
+
+
+
+    def getPrefixWords(self, prefix):
+        ''' Returns the indexed words that start with the specified prefix. '''
+        start = bisect.bisect_left(self.words, prefix)
+        end = bisect.bisect_left(self.words, prefix + GedComSearch.LAST_CHARACTER, start)
+        return self.words[start:end]
+
+
+
+    def find(self, index, query):
+        '''
+        Returns a dictionary of the identities of the records in the specified index that match all the words of the specified query to the labels where they matched.
+        The records are found from the word in the query that matches the fewest records and then checked against the other words.
+        '''
+        # The (number of matches, prefix, indexed words) of each word in the query, fewest matches first.
+        queryWords = []
+        for prefix in set(GedComSearch.getWords(query)):
+            words = [word for word in self.getPrefixWords(prefix) if word in index and len(index[word]) > 0]
+            queryWords.append((sum(len(index[word]) for word in words), prefix, words))
+        if len(queryWords) == 0:
+            return {}
+        queryWords.sort()
+
+        result = {}
+        for word in queryWords[0][2]:
+            for identity, labels in index[word].items():
+                if identity in result:
+                    result[identity].extend(label for label in labels if label not in result[identity])
+                else:
+                    result[identity] = list(labels)
+
+        for count, _, words in queryWords[1:]:
+            matches = {}
+            if len(words) * len(result) < count:
+                # Look up each record in the matching words.
+                for identity, labels in result.items():
+                    for word in words:
+                        if identity in index[word]:
+                            labels.extend(label for label in index[word][identity] if label not in labels)
+                            matches[identity] = labels
+            else:
+                # Read all the records of the matching words.
+                for word in words:
+                    for identity, wordLabels in index[word].items():
+                        if identity in result:
+                            labels = result[identity]
+                            labels.extend(label for label in wordLabels if label not in labels)
+                            matches[identity] = labels
+            result = matches
+        return result
+
+
+
+    def getIndividuals(self, query):
+        ''' Returns a dictionary of the identities of the individuals that match the specified query to the labels where they matched. '''
+        return self.find(self.individuals, query)
+
+
+
+    def getSources(self, query):
+        ''' Returns a dictionary of the identities of the sources that match the specified query to the labels where they matched. '''
+        return self.find(self.sources, query)
@@ -13,6 +13,7 @@ from gedcom_tag import GedComTag
 from gedcom_date import GedComDate
 from gedcom_place import GedComPlace
 from gedcom_change import GedComChange
+from gedcom_block import GedComBlock
 
 
 
@@ -32,6 +33,7 @@ class GedComSource:
 
     :ivar GedComDateStatus status: The status of the date, EMPTY, ON, BEFORE, AFTER.
     :ivar GedComDateAccuracy accuracy: The accuracy of the date, KNOWN, ABOUT, ESTIMATED, CALCULATED
+    :ivar bool isDirty: True if the source has changed since it was read from the gedcom file.
     '''
     # Connection to the single gedcom.
     gedcom = None
@@ -51,6 +53,7 @@ class GedComSource:
         if gedcomFile is None:
             self.identity = f'S{len(GedComSource.gedcom.sources) + 1:04d}'
             self.gedcomFile = ''
+            self.isDirty = True
             self.title = ''
             self.type = GedComSourceType.GENERAL
             self.repository = ''
@@ -68,6 +71,7 @@ class GedComSource:
     def parse(self, gedcomFile = None):
         ''' Update the object to the date specified in the string. '''
         self.gedcomFile = gedcomFile
+        self.isDirty = False
         self.identity = None
         self.title = ''
         self.type = GedComSourceType.GENERAL
@@ -80,40 +84,40 @@ class GedComSource:
             return
         if len(gedcomFile) == 0:
             return
+        gedcomFile = GedComBlock.toBlock(gedcomFile)
+        self.gedcomFile = gedcomFile
 
         # The identity is on the first line.
-        tags = gedcomFile[0].split()
-        if tags[1][:1] == '@':
-            self.identity = tags[1][1:-1]
+        if gedcomFile.first.identity is not None:
+            self.identity = gedcomFile.first.identity
 
         # Fetch the first block.
-        block, start = GedComSource.gedcom.getNextBlock(gedcomFile, 1)
+        block, start = gedcomFile.getNextBlock(1)
         while len(block) > 0:
             #for line in block:
             #    print(line)
             #print('<--')
-            tags = block[0].split()
-            if tags[1] == 'TITL':
-                self.title = block[0][7:]
-            elif tags[1] == 'DATE':
+            tag = block.first.tag
+            if tag == 'TITL':
+                self.title = block.first.value
+            elif tag == 'DATE':
                 self.date = GedComDate(block)
-            elif tags[1] == 'NOTE':
+            elif tag == 'NOTE':
                 if self.tags is None:
                     self.tags = []
                 self.tags.append(GedComTag(block))
-            elif tags[1] == 'PLAC':
+            elif tag == 'PLAC':
                 self.place = GedComPlace(block)
-            elif tags[1] == 'REPO':
-                self.repository = block[0][7:]
-                self.repository = self.repository[1:-1]
-            elif tags[1] == 'CHAN':
+            elif tag == 'REPO':
+                self.repository = block.first.getPointer()
+            elif tag == 'CHAN':
                 self.change = GedComChange(block)
             else:
                 # Unknown.
-                print(f'Source unrecogised tag \'{tags[1]}\' \'{block[0]}\'.')
+                print(f'Source unrecogised tag \'{tag}\' \'{block.first}\'.')
 
             # Fetch the next block.
-            block, start = GedComSource.gedcom.getNextBlock(gedcomFile, start)
+            block, start = gedcomFile.getNextBlock(start)
 
         # Update the source type.
         self.setTypeFromTitle()
@@ -5,11 +5,13 @@ Module to support tags in the gedcom python library.
 This module implements the :py:class:`GedComTag` class.
 '''
 # System Libraries.
+import sys
 from enum import Enum
 
 # Application libraries.
 from gedcom_date import GedComDate
 from gedcom_place import GedComPlace
+from gedcom_block import GedComBlock
 
 
 
@@ -23,7 +25,9 @@ class GedComTag:
     :ivar list(GedComSource): A list of sources for the tag.
     :ivar GedComDate date: The date of the tag.
     :ivar GedComPlace place: The place of the tag.
+    :ivar list tags: The child tags of the tag or None.
     '''
+    __slots__ = ('type', 'information', 'sources', 'date', 'place', 'tags')
 
     # Connection to the gedcom.
     gedcom = None
@@ -82,7 +86,8 @@ class GedComTag:
         '''
         self.type = ''
         self.information = ''
-        self.sources = []
+        # The empty list is a shared tuple until a source is added.
+        self.sources = ()
         # The date associated with this tag.
         self.date = None
         # The place associated with this tag.
@@ -93,14 +98,14 @@ class GedComTag:
             return
 
         # Check that the parameter is a block of lines.
-        if not isinstance(gedcomFile, list):
+        if not GedComBlock.isBlock(gedcomFile):
             print('GedComTag gedcomFile is not a list.')
             return
+        gedcomFile = GedComBlock.toBlock(gedcomFile)
 
-        # Fetch the tag data.
-        tags = gedcomFile[0].split()
-        self.type = tags[1]
-        self.information = gedcomFile[0][gedcomFile[0].index(tags[1]) + len(tags[1]) + 1:]
+        # Fetch the tag data.  There are only a few types of tag so they are interned.
+        self.type = sys.intern(gedcomFile.first.tag)
+        self.information = gedcomFile.first.value
         # print(f'TAG {self.type} {self.information}')
         if self.information.startswith('GRID: '):
             line = self.information
@@ -108,25 +113,26 @@ class GedComTag:
             self.information.append(line.split(': '))
 
         # Fetch the first block.
-        block, start = GedComTag.gedcom.getNextBlock(gedcomFile, 1)
+        block, start = gedcomFile.getNextBlock(1)
         while len(block) > 0:
-            # Split into tags.
-            tags = block[0].split()
-            if tags[1] == 'SOUR':
-                self.sources.append(tags[2][1:-1])
-            elif tags[1] == 'DATE':
+            tag = block.first.tag
+            if tag == 'SOUR':
+                if len(self.sources) == 0:
+                    self.sources = []
+                self.sources.append(block.first.getPointer())
+            elif tag == 'DATE':
                 self.date = GedComDate(block)
-            elif tags[1] == 'PLAC':
+            elif tag == 'PLAC':
                 self.place = GedComPlace(block)
-            elif tags[1] == 'CONT':
+            elif tag == 'CONT':
                 if isinstance(self.information, list):
                     # Add to existing list.
-                    theFullLine = block[0][7:]
+                    theFullLine = block.first.value
                     # Pickup any following CONT tags as line breaks into this row.
                     if len(block) > 1:
                         for extra in range(1, len(block)):
-                            # print(f'Extra CONT \'{block[extra][7:]}\'')
-                            theFullLine = f'{theFullLine}\n{block[extra][7:]}'
+                            # print(f'Extra CONT \'{block[extra].value}\'')
+                            theFullLine = f'{theFullLine}\n{block[extra].value}'
                     # Add a row to the existing list.
                     self.information.append(theFullLine.split(': '))
                 else:
@@ -134,17 +140,17 @@ class GedComTag:
                     if self.tags is None:
                         self.tags = []
                     self.tags.append(GedComTag(block))
-            elif tags[1] == 'CAUS' or tags[1] == 'TYPE':
+            elif tag == 'CAUS' or tag == 'TYPE':
                 # Add as a child tag.
                 if self.tags is None:
                     self.tags = []
                 self.tags.append(GedComTag(block))
             else:
                 # Unknown.
-                print(f'TAG unrecogised tag \'{tags[1]}\' \'{block[0]}\'')
+                print(f'TAG unrecogised tag \'{tag}\' \'{block.first}\'')
 
             # Fetch the next block.
-            block, start = GedComTag.gedcom.getNextBlock(gedcomFile, start)
+            block, start = gedcomFile.getNextBlock(start)
 
 
 
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support writing gedcom files in the gedcom python library.
+This module implements the :py:class:`GedComWriter` class.
+'''
+# System Libraries.
+import os
+import shutil
+import tempfile
+
+
+
+class GedComWriter:
+    '''
+    Class to write a gedcom file in large buffered chunks.
+    The file is written to a temporary file which replaces the gedcom file when it is complete.
+    A failure part way through a save leaves the original gedcom file untouched.
+
+    :ivar str fileName: The name of the gedcom file to write.
+    :ivar str temporaryFileName: The name of the temporary file that is being written.
+    :ivar file file: The temporary file.
+    :ivar list buffer: The text that has not been written to the file yet.
+    :ivar int bufferLength: The number of characters in the buffer.
+    '''
+
+    # The number of characters to collect before writing them to the file.
+    BUFFER_SIZE = 1024 * 1024
+
+
+
+    def __init__(self, fileName):
+        ''' Class constructor for the :py:class:`GedComWriter` class. '''
+        self.fileName = os.path.abspath(fileName)
+        handle, self.temporaryFileName = tempfile.mkstemp(prefix=f'.{os.path.basename(self.fileName)}.', suffix='.tmp', dir=os.path.dirname(self.fileName))
+        self.file = os.fdopen(handle, 'w', encoding='utf-8')
+        self.buffer = []
+        self.bufferLength = 0
+
+
+
+    def __enter__(self):
+        ''' Magic Method to start a with statement. '''
+        return self
+
+
+
+    def __exit__(self, exceptionType, exception, traceback):
+        ''' Magic Method to end a with statement.  The gedcom file is only replaced when there is no exception. '''
+        if exceptionType is None:
+            self.close()
+        else:
+            self.abort()
+
+
+
+    def write(self, text):
+        ''' Add the specified text to the file. '''
+        self.buffer.append(text)
+        self.bufferLength += len(text)
+        if self.bufferLength >= GedComWriter.BUFFER_SIZE:
+            self.flush()
+
+
+
+    def writeLines(self, lines):
+        ''' Add the specified lines to the file as a single block of text. '''
+        if len(lines) > 0:
+            self.write('\n'.join(lines) + '\n')
+
+
+
+    def flush(self):
+        ''' Write the buffer into the temporary file. '''
+        self.file.write(''.join(self.buffer))
+        self.buffer = []
+        self.bufferLength = 0
+
+
+
+    def close(self):
+        ''' Complete the temporary file and replace the gedcom file with it. '''
+        self.flush()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        if os.path.exists(self.fileName):
+            # Keep the permissions of the existing file.
+            shutil.copymode(self.fileName, self.temporaryFileName)
+        os.replace(self.temporaryFileName, self.fileName)
+
+
+
+    def abort(self):
+        ''' Remove the temporary file and leave the gedcom file untouched. '''
+        self.file.close()
+        if os.path.exists(self.temporaryFileName):
+            os.remove(self.temporaryFileName)
@@ -8,6 +8,10 @@ This module implements the :py:class:`Place` class.
 '''
 # System Libraries.
 from enum import Enum
+import bisect
+
+# Application Libraries.
+from gedcom_records import GedComRecords
 
 
 
@@ -24,40 +28,89 @@ class Place:
 
     :ivar GedComDateStatus status: The status of the date, EMPTY, ON, BEFORE, AFTER.
     :ivar GedComDateAccuracy accuracy: The accuracy of the date, KNOWN, ABOUT, ESTIMATED, CALCULATED
+    :ivar list childPlaces: The places directly inside this place sorted by name.
+    :ivar int placesBelow: The number of places at all the levels inside this place.
     '''
     allPlaces = {}
 
+    # The places without a parent sorted by name.
+    rootPlaces = []
+
+
+
+    def reset(allPlaces = None):
+        '''
+        Start a new registry of places.
+        The places can be an existing registry, for example from a cache, then the root places are found from it.
+        '''
+        Place.allPlaces = {} if allPlaces is None else allPlaces
+        Place.rootPlaces = []
+        for place in Place.allPlaces.values():
+            if place.parent is None:
+                Place.rootPlaces.append(place)
+        Place.rootPlaces.sort(key=Place.byName)
+
+
+
     def getPlace(placeName, address = None, country = None, latitude = None, longitude = None):
         ''' Get the place object for the specified name. '''
-        # print(f'getPlace({placeName})')
-        # Return the existing place.
-        if placeName in Place.allPlaces:
-            thePlace = Place.allPlaces[placeName]
-            if address is not None and placeName.startswith(address) and thePlace.placeType == PlaceType.PLACE:
-                # print(f'\'{placeName}\' convert to an address.')
-                thePlace.placeType = PlaceType.ADDRESS
-            if latitude is not None and thePlace.latitude is None:
-                # print(f'\'{placeName}\' add latitude.')
-                latitude = latitude.replace('N', '')
-                latitude = latitude.replace('S', '-')
-                thePlace.latitude = float(latitude)
-            if longitude is not None and thePlace.longitude is None:
-                # print(f'\'{placeName}\' add longitude.')
-                longitude = longitude.replace('W', '-')
-                longitude = longitude.replace('E', '')
-                thePlace.longitude = float(longitude)
-            return thePlace
-        # print(f'\'{placeName}\' does not exist.  Creating now.')
-
-        if ', ' in placeName:
-            parent = placeName[placeName.index(', ') + 2:]
-            name = placeName[0: placeName.index(', ')]
-        else:
-            parent = None
-            name = placeName
-
-        # Return a new place.
-        return Place(name, placeName, address, country, latitude, longitude)
+        # The places might be added by a background thread and the main thread at the same time.
+        with GedComRecords.lock:
+            # print(f'getPlace({placeName})')
+            # Return the existing place.
+            if placeName in Place.allPlaces:
+                thePlace = Place.allPlaces[placeName]
+                if address is not None and placeName.startswith(address) and thePlace.placeType == PlaceType.PLACE:
+                    # print(f'\'{placeName}\' convert to an address.')
+                    thePlace.placeType = PlaceType.ADDRESS
+                if latitude is not None and thePlace.latitude is None:
+                    # print(f'\'{placeName}\' add latitude.')
+                    latitude = latitude.replace('N', '')
+                    latitude = latitude.replace('S', '-')
+                    thePlace.latitude = float(latitude)
+                if longitude is not None and thePlace.longitude is None:
+                    # print(f'\'{placeName}\' add longitude.')
+                    longitude = longitude.replace('W', '-')
+                    longitude = longitude.replace('E', '')
+                    thePlace.longitude = float(longitude)
+                return thePlace
+            # print(f'\'{placeName}\' does not exist.  Creating now.')
+
+            if ', ' in placeName:
+                parent = placeName[placeName.index(', ') + 2:]
+                name = placeName[0: placeName.index(', ')]
+            else:
+                parent = None
+                name = placeName
+
+            # Return a new place.
+            return Place(name, placeName, address, country, latitude, longitude)
+
+
+
+    def mergePlaces(places):
+        '''
+        Merge the places from another registry, for example from another process, into :py:attr:`allPlaces`.
+        The places are merged in the order that they were added, so the parent of a place is always merged first.
+        '''
+        with GedComRecords.lock:
+            for place in places.values():
+                if place.identity in Place.allPlaces:
+                    thePlace = Place.allPlaces[place.identity]
+                    if place.placeType == PlaceType.ADDRESS and thePlace.placeType == PlaceType.PLACE:
+                        thePlace.placeType = PlaceType.ADDRESS
+                    if thePlace.latitude is None:
+                        thePlace.latitude = place.latitude
+                    if thePlace.longitude is None:
+                        thePlace.longitude = place.longitude
+                else:
+                    if place.parent is not None:
+                        place.parent = Place.allPlaces[place.parent.identity]
+                    # The children are merged after this place.
+                    place.childPlaces = []
+                    place.placesBelow = 0
+                    Place.allPlaces[place.identity] = place
+                    place.addToParent()
 
 
 
@@ -78,6 +131,8 @@ class Place:
         self.identity = identity
         self.placeType = PlaceType.PLACE
         self.parent = None
+        self.childPlaces = []
+        self.placesBelow = 0
         self.latitude = None
         if isinstance(latitude, str):
             latitude = latitude.replace('N', '')
@@ -85,25 +140,40 @@ class Place:
             self.latitude = float(latitude)
         self.longitude = None
         if isinstance(longitude, str):
-            longitude = longitude.replace('W', '')
-            longitude = longitude.replace('E', '-')
+            longitude = longitude.replace('W', '-')
+            longitude = longitude.replace('E', '')
             self.longitude = float(longitude)
         self.name = name
 
-        if ', ' in identity:
-            parent = identity[identity.index(', ') + 2:]
-            self.parent = Place.getPlace(parent, None, country)
-
         if self.name == country:
             self.placeType = PlaceType.COUNTRY
         if self.name == address:
             self.placeType = PlaceType.ADDRESS
 
-        Place.allPlaces[self.identity] = self
+        # The places might be added by a background thread and the main thread at the same time.
+        with GedComRecords.lock:
+            if ', ' in identity:
+                parent = identity[identity.index(', ') + 2:]
+                self.parent = Place.getPlace(parent, None, country)
+            Place.allPlaces[self.identity] = self
+            self.addToParent()
         # print(f'name = {self.name}, identity={self.identity}')
 
 
 
+    def addToParent(self):
+        ''' Add this new place to the sorted children of its parent, or the root places, and count it in all the places above it. '''
+        if self.parent is None:
+            bisect.insort(Place.rootPlaces, self, key=Place.byName)
+        else:
+            bisect.insort(self.parent.childPlaces, self, key=Place.byName)
+        parent = self.parent
+        while parent is not None:
+            parent.placesBelow += 1
+            parent = parent.parent
+
+
+
     def toLongString(self):
         ''' Returns the place as a long string. '''
         result = f'<a href="app:place?id={self.identity}">{self.name}</a>'
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support spatial queries on the places in the gedcom python library.
+This module implements the :py:class:`PlaceGrid` class.
+'''
+# System Libraries.
+import math
+
+
+
+class PlaceGrid:
+    '''
+    Class to represent a grid index of the :py:class:`Place` objects that have a latitude and longitude.
+    The world is split into square cells of :py:attr:`cellSize` degrees and each cell keeps the places inside it.
+    A query only looks at the cells that overlap the area of the query.
+    The distances are great circle distances in km.
+    The grid is a snapshot, build a new object after the places change.
+
+    :ivar float cellSize: The size of each cell in degrees.
+    :ivar dict cells: The (row, column) of each cell to the list of places inside it.
+    :ivar int count: The number of places in the grid.
+    '''
+
+    # The mean radius of the earth in km.
+    EARTH_RADIUS = 6371.0088
+
+    # The length of one degree of latitude in km.
+    DEGREE = math.pi * EARTH_RADIUS / 180
+
+
+
+    def getDistance(latitude, longitude, otherLatitude, otherLongitude):
+        ''' Returns the great circle distance in km between the specified points in degrees. '''
+        latitude = math.radians(latitude)
+        otherLatitude = math.radians(otherLatitude)
+        sinLatitude = math.sin((otherLatitude - latitude) / 2)
+        sinLongitude = math.sin(math.radians(otherLongitude - longitude) / 2)
+        value = sinLatitude * sinLatitude + math.cos(latitude) * math.cos(otherLatitude) * sinLongitude * sinLongitude
+        return 2 * PlaceGrid.EARTH_RADIUS * math.asin(min(1.0, math.sqrt(value)))
+
+
+
+    def __init__(self, places, cellSize = 0.1):
+        '''
+        Class constructor for the :py:class:`PlaceGrid` class.
+        The places are the :py:class:`Place` objects, for example Place.allPlaces.values().
+        The places without a latitude and longitude are ignored.
+        '''
+        self.cellSize = cellSize
+        self.cells = {}
+        self.count = 0
+        for place in places:
+            if place.latitude is not None and place.longitude is not None:
+                cell = self.getCell(place.latitude, place.longitude)
+                if cell in self.cells:
+                    self.cells[cell].append(place)
+                else:
+                    self.cells[cell] = [place]
+                self.count += 1
+
+
+
+    def toLongitude(longitude):
+        ''' Returns the specified longitude in the range -180 to 180 degrees. '''
+        return (longitude + 180) % 360 - 180
+
+
+
+    def getCell(self, latitude, longitude):
+        ''' Returns the (row, column) of the cell that contains the specified point. '''
+        return math.floor(latitude / self.cellSize), math.floor(PlaceGrid.toLongitude(longitude) / self.cellSize)
+
+
+
+    def getInBox(self, south, west, north, east):
+        ''' Returns the places inside the specified bounding box in degrees.  The west can be greater than the east for a box that crosses 180 degrees. '''
+        if east - west >= 360:
+            ranges = ((-180, 180), )
+        else:
+            west = PlaceGrid.toLongitude(west)
+            east = PlaceGrid.toLongitude(east)
+            if west <= east:
+                ranges = ((west, east), )
+            else:
+                ranges = ((west, 180), (-180, east))
+
+        result = []
+        firstRow = math.floor(south / self.cellSize)
+        lastRow = math.floor(north / self.cellSize)
+        for rangeWest, rangeEast in ranges:
+            firstColumn = math.floor(rangeWest / self.cellSize)
+            lastColumn = math.floor(rangeEast / self.cellSize)
+            places = []
+            if (lastRow - firstRow + 1) * (lastColumn - firstColumn + 1) > len(self.cells):
+                # The box covers more cells than are used, so test the used cells instead.
+                for (row, column), cellPlaces in self.cells.items():
+                    if firstRow <= row <= lastRow and firstColumn <= column <= lastColumn:
+                        places.extend(cellPlaces)
+            else:
+                for row in range(firstRow, lastRow + 1):
+                    for column in range(firstColumn, lastColumn + 1):
+                        if (row, column) in self.cells:
+                            places.extend(self.cells[(row, column)])
+            # The cells on the edges are only partly inside the box.
+            for place in places:
+                if south <= place.latitude <= north and rangeWest <= PlaceGrid.toLongitude(place.longitude) <= rangeEast:
+                    result.append(place)
+        return result
+
+
+
+    def getBox(self, latitude, longitude, distance):
+        ''' Returns the (south, west, north, east) bounding box of the circle of the specified distance in km around the specified point. '''
+        latitudeChange = distance / PlaceGrid.DEGREE
+        south = max(-90.0, latitude - latitudeChange)
+        north = min(90.0, latitude + latitudeChange)
+        # The degrees of longitude get shorter towards the poles.
+        cosine = min(math.cos(math.radians(south)), math.cos(math.radians(north)))
+        if south <= -90 or north >= 90 or cosine * 180 * PlaceGrid.DEGREE <= distance:
+            return south, -180.0, north, 180.0
+        longitudeChange = distance / (PlaceGrid.DEGREE * cosine)
+        return south, longitude - longitudeChange, north, longitude + longitudeChange
+
+
+
+    def getWithin(self, latitude, longitude, distance):
+        ''' Returns the (distance, place) of the places within the specified distance in km of the specified point, nearest first. '''
+        result = []
+        for place in self.getInBox(*self.getBox(latitude, longitude, distance)):
+            placeDistance = PlaceGrid.getDistance(latitude, longitude, place.latitude, place.longitude)
+            if placeDistance <= distance:
+                result.append((placeDistance, place))
+        result.sort(key=PlaceGrid.byDistance)
+        return result
+
+
+
+    def byDistance(item):
+        ''' Key for a list sort of (distance, place) by distance. '''
+        return item[0]
+
+
+
+    def getNearest(self, latitude, longitude, count = 1):
+        '''
+        Returns the (distance, place) of the specified number of places nearest to the specified point, nearest first.
+        The search distance starts at one cell and doubles until enough places are found.
+        '''
+        count = min(count, self.count)
+        if count <= 0:
+            return []
+        distance = self.cellSize * PlaceGrid.DEGREE
+        while True:
+            result = self.getWithin(latitude, longitude, distance)
+            if len(result) >= count or distance >= math.pi * PlaceGrid.EARTH_RADIUS:
+                return result[:count]
+            distance *= 2
+
+
+
+    def getNearbyPairs(self, distance):
+        '''
+        Generator for the (distance, place, otherPlace) of each pair of places within the specified distance in km of each other.
+        This is intended to find possible duplicate places.
+        '''
+        for place in self.getInBox(-90, -180, 90, 180):
+            for placeDistance, otherPlace in self.getWithin(place.latitude, place.longitude, distance):
+                if otherPlace is not place and place.identity < otherPlace.identity:
+                    yield placeDistance, place, otherPlace
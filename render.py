@@ -10,6 +10,7 @@ This module implements the :py:class:`Render` class.
 import datetime
 import time
 import html
+import urllib.parse
 
 # The program libraries.
 import walton.html
@@ -41,6 +42,15 @@ class Render(walton.toolbar.IToolbar):
     This class inherits from the :py:class:`~walton.toolbar.IToolbar` base class.
     '''
 
+    # The distance in km of the nearby places on a place page.
+    NEARBY_DISTANCE = 10
+
+    # The maximum number of individuals and of sources on a search page.
+    SEARCH_LIMIT = 500
+
+    # The maximum number of individuals with similar names on a search page.
+    NAMES_LIMIT = 50
+
 
 
     def __init__(self, application):
@@ -82,6 +92,7 @@ class Render(walton.toolbar.IToolbar):
             'all'               : self.showAll,
             'all_places'        : self.showAllPlaces,
             'place'             : self.showPlace,
+            'search'            : self.showSearch,
         }
 
 
@@ -113,30 +124,26 @@ class Render(walton.toolbar.IToolbar):
         self.html.add('<fieldset style="display: inline-block; vertical-align:top;">')
         self.html.addLine(f'<legend>Individuals</legend>')
         self.html.addLine(f'<table>')
-        isFirst = True
-        count = 0
-        individuals = []
-        individual = None
-        for individual in self.application.gedcom.individuals.values():
-            if isFirst:
-                isFirst = False
-                self.html.add('<tr>')
-                self.html.add('<td>First</td>')
-                self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.identity}</a></td>')
-                self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td>')
-                self.html.addLine('</tr>')
-            individuals.append(individual)
-        if individual is not None:
+        individuals = self.application.gedcom.individuals
+        identities = list(individuals)
+        if len(identities) > 0:
+            individual = individuals[identities[0]]
+            self.html.add('<tr>')
+            self.html.add('<td>First</td>')
+            self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.identity}</a></td>')
+            self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td>')
+            self.html.addLine('</tr>')
+            individual = individuals[identities[-1]]
             self.html.add('<td>Last</td>')
             self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.identity}</a></td>')
             self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td>')
             self.html.addLine('</tr>')
 
-        # Recent.
-        individuals.sort(key=GedComIndividual.byChange, reverse=True)
+        # Recent.  This does not build the individuals that are not displayed.
+        identities.sort(key=individuals.byChange, reverse=True)
         for index in range(10):
-            if index < len(individuals):
-                individual = individuals[index]
+            if index < len(identities):
+                individual = individuals[identities[index]]
                 self.html.add('<tr>')
                 self.html.add(f'<td>Recent {index + 1}</td>')
                 self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.identity}</a></td>')
@@ -144,25 +151,22 @@ class Render(walton.toolbar.IToolbar):
                 self.html.addLine('</tr>')
 
         self.html.add('</table>')
-        self.html.addLine(f'<p>There are <a href="app:all">{len(individuals)} individuals</a> in this gedcom.</p>')
+        self.html.addLine(f'<p>There are <a href="app:all">{len(identities)} individuals</a> in this gedcom.</p>')
         self.html.addLine('</fieldset>')
 
         self.html.add('<fieldset style="display: inline-block; vertical-align:top;">')
         self.html.addLine(f'<legend>Families</legend>')
         self.html.addLine(f'<table>')
-        isFirst = True
-        families = []
-        family = None
-        for family in self.application.gedcom.families.values():
-            if isFirst:
-                isFirst = False
-                self.html.add('<tr>')
-                self.html.add('<td>First</td>')
-                self.html.add(f'<td><a href="app:family?id={family.identity}">{family.identity}</a></td>')
-                self.html.add(f'<td><a href="app:family?id={family.identity}">{family.getName()}</a></td>')
-                self.html.addLine('</tr>')
-            families.append(family)
-        if family is not None:
+        families = self.application.gedcom.families
+        identities = list(families)
+        if len(identities) > 0:
+            family = families[identities[0]]
+            self.html.add('<tr>')
+            self.html.add('<td>First</td>')
+            self.html.add(f'<td><a href="app:family?id={family.identity}">{family.identity}</a></td>')
+            self.html.add(f'<td><a href="app:family?id={family.identity}">{family.getName()}</a></td>')
+            self.html.addLine('</tr>')
+            family = families[identities[-1]]
             self.html.add('<tr>')
             self.html.add('<td>Last</td>')
             self.html.add(f'<td><a href="app:family?id={family.identity}">{family.identity}</a></td>')
@@ -170,10 +174,10 @@ class Render(walton.toolbar.IToolbar):
             self.html.addLine('</tr>')
 
         # Recent.
-        families.sort(key=GedComFamily.byChange, reverse=True)
+        identities.sort(key=families.byChange, reverse=True)
         for index in range(10):
-            if index < len(families):
-                family = families[index]
+            if index < len(identities):
+                family = families[identities[index]]
                 self.html.add('<tr>')
                 self.html.add(f'<td>Recent {index + 1}</td>')
                 self.html.add(f'<td><a href="app:family?id={family.identity}">{family.identity}</a></td>')
@@ -181,36 +185,33 @@ class Render(walton.toolbar.IToolbar):
                 self.html.addLine('</tr>')
 
         self.html.add('</table>')
-        self.html.addLine(f'<p>There are <a href="app:all">{len(families)} families</a> in this gedcom.</p>')
+        self.html.addLine(f'<p>There are <a href="app:all">{len(identities)} families</a> in this gedcom.</p>')
         self.html.addLine('</fieldset>')
 
         self.html.add('<fieldset style="display: inline-block; vertical-align:top;">')
         self.html.addLine(f'<legend>Sources</legend>')
         self.html.addLine(f'<table>')
-        isFirst = True
-        sources = []
-        source = None
-        for source in self.application.gedcom.sources.values():
-            if isFirst:
-                isFirst = False
-                self.html.add('<tr>')
-                self.html.add('<td>First</td>')
-                self.html.add(f'<td><a href="app:source?id={source.identity}">{source.identity}</a></td>')
-                self.html.add(f'<td><a href="app:source?id={source.identity}">{source.getName()}</a></td>')
-                self.html.addLine('</tr>')
-                self.html.add('<tr>')
-            sources.append(source)
-        if source is not None:
+        sources = self.application.gedcom.sources
+        identities = list(sources)
+        if len(identities) > 0:
+            source = sources[identities[0]]
+            self.html.add('<tr>')
+            self.html.add('<td>First</td>')
+            self.html.add(f'<td><a href="app:source?id={source.identity}">{source.identity}</a></td>')
+            self.html.add(f'<td><a href="app:source?id={source.identity}">{source.getName()}</a></td>')
+            self.html.addLine('</tr>')
+            self.html.add('<tr>')
+            source = sources[identities[-1]]
             self.html.add('<td>Last</td>')
             self.html.add(f'<td><a href="app:source?id={source.identity}">{source.identity}</a></td>')
             self.html.add(f'<td><a href="app:source?id={source.identity}">{source.getName()}</a></td>')
             self.html.addLine('</tr>')
 
         # Recent.
-        sources.sort(key=GedComSource.byChange, reverse=True)
+        identities.sort(key=sources.byChange, reverse=True)
         for index in range(10):
-            if index < len(sources):
-                source = sources[index]
+            if index < len(identities):
+                source = sources[identities[index]]
                 self.html.add('<tr>')
                 self.html.add(f'<td>Recent {index + 1}</td>')
                 self.html.add(f'<td><a href="app:source?id={source.identity}">{source.identity}</a></td>')
@@ -218,36 +219,33 @@ class Render(walton.toolbar.IToolbar):
                 self.html.addLine('</tr>')
 
         self.html.add('</table>')
-        self.html.addLine(f'<p>There are <a href="app:all">{len(sources)} sources</a> in this gedcom.</p>')
+        self.html.addLine(f'<p>There are <a href="app:all">{len(identities)} sources</a> in this gedcom.</p>')
         self.html.addLine('</fieldset>')
 
         self.html.add('<fieldset style="display: inline-block; vertical-align:top;">')
         self.html.addLine(f'<legend>Media</legend>')
         self.html.addLine(f'<table>')
-        isFirst = True
-        mediaObjects = []
-        media = None
-        for media in self.application.gedcom.media.values():
-            if isFirst:
-                isFirst = False
-                self.html.add('<tr>')
-                self.html.add('<td>First</td>')
-                self.html.add(f'<td><a href="app:media?id={media.identity}">{media.identity}</a></td>')
-                self.html.add(f'<td><a href="app:media?id={media.identity}">{media.getName()}</a></td>')
-                self.html.addLine('</tr>')
-                self.html.add('<tr>')
-            mediaObjects.append(media)
-        if media is not None:
+        mediaObjects = self.application.gedcom.media
+        identities = list(mediaObjects)
+        if len(identities) > 0:
+            media = mediaObjects[identities[0]]
+            self.html.add('<tr>')
+            self.html.add('<td>First</td>')
+            self.html.add(f'<td><a href="app:media?id={media.identity}">{media.identity}</a></td>')
+            self.html.add(f'<td><a href="app:media?id={media.identity}">{media.getName()}</a></td>')
+            self.html.addLine('</tr>')
+            self.html.add('<tr>')
+            media = mediaObjects[identities[-1]]
             self.html.add('<td>Last</td>')
             self.html.add(f'<td><a href="app:media?id={media.identity}">{media.identity}</a></td>')
             self.html.add(f'<td><a href="app:media?id={media.identity}">{media.getName()}</a></td>')
             self.html.addLine('</tr>')
 
         # Recent.
-        mediaObjects.sort(key=GedComMedia.byChange, reverse=True)
+        identities.sort(key=mediaObjects.byChange, reverse=True)
         for index in range(10):
-            if index < len(mediaObjects):
-                media = mediaObjects[index]
+            if index < len(identities):
+                media = mediaObjects[identities[index]]
                 self.html.add('<tr>')
                 self.html.add(f'<td>Recent {index + 1}</td>')
                 self.html.add(f'<td><a href="app:media?id={media.identity}">{media.identity}</a></td>')
@@ -255,10 +253,16 @@ class Render(walton.toolbar.IToolbar):
                 self.html.addLine('</tr>')
 
         self.html.add('</table>')
-        self.html.addLine(f'<p>There are <a href="app:all">{len(mediaObjects)} media</a> in this gedcom.</p>')
+        self.html.addLine(f'<p>There are <a href="app:all">{len(identities)} media</a> in this gedcom.</p>')
         self.html.addLine('</fieldset>')
 
-        self.html.addLine(f'<p>There are <a href="app:all_places">{len(Place.allPlaces)} places</a> in this gedcom.</p>')
+        if self.application.gedcom.isLoading:
+            self.html.addLine('<p>The records are loading in the background.</p>')
+        elif self.application.gedcom.isLazy:
+            # The places are only known when all the records are built.
+            self.html.addLine(f'<p>Show <a href="app:all_places">all the places</a> in this gedcom.</p>')
+        else:
+            self.html.addLine(f'<p>There are <a href="app:all_places">{len(Place.allPlaces)} places</a> in this gedcom.</p>')
 
 
 
@@ -276,6 +280,70 @@ class Render(walton.toolbar.IToolbar):
         self.html.addLine('<li><a href="app:all_places">All Places</a></li>')
         self.html.addLine('<li><a href="app:about">About</a></li>')
         self.html.addLine('</ul>')
+        self.displaySearchForm('')
+
+
+
+    def displaySearchForm(self, query):
+        ''' Display a form to search for the words in the names, notes and sources. '''
+        self.html.addLine('<form action="app:search" method="get">')
+        self.html.addLine(f'<input type="text" name="q" value="{html.escape(query)}" size="40" /> <input type="submit" value="Search" />')
+        self.html.addLine('</form>')
+
+
+
+    def showSearch(self, parameters):
+        ''' Show the individuals and sources that match the search query. '''
+        query = urllib.parse.unquote_plus(parameters['q']) if 'q' in parameters else ''
+
+        self.html.clear()
+        self.displayToolbar(True, None, None, None, False, False, False, '', self.host)
+        self.html.addLine('<h1>Search</h1>')
+        self.displaySearchForm(query)
+        if query.strip() == '':
+            return
+
+        # The index needs all the records.
+        if self.application.gedcom.isLoading:
+            self.html.addLine('<p>The search is available when the records have loaded.</p>')
+            return
+        search = self.application.gedcom.getSearch()
+
+        # Show the individuals that match.
+        individuals = search.getIndividuals(query)
+        self.html.addLine(f'<p>Individuals ({len(individuals)})</p>')
+        self.html.addLine('<table class="reference">')
+        count = 0
+        for individualIdentity, labels in individuals.items():
+            if count == self.SEARCH_LIMIT:
+                self.html.addLine(f'<tr><td>{len(individuals) - count} more individuals.</td></tr>')
+                break
+            individual = self.application.gedcom.individuals[individualIdentity]
+            self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td><td>{", ".join(labels)}</td><td>{self.getRelationshipToHome(individual.identity)}</td></tr>')
+            count += 1
+        self.html.addLine('</table>')
+
+        # Show the individuals with names that sound or are spelt like the query.
+        self.html.addLine('<p>Similar Names</p>')
+        self.html.addLine('<table class="reference">')
+        for individualIdentity in self.application.gedcom.getNames().getIndividuals(query, self.NAMES_LIMIT):
+            individual = self.application.gedcom.individuals[individualIdentity]
+            self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td><td>{self.getRelationshipToHome(individual.identity)}</td></tr>')
+        self.html.addLine('</table>')
+
+        # Show the sources that match.
+        sources = search.getSources(query)
+        self.html.addLine(f'<p>Sources ({len(sources)})</p>')
+        self.html.addLine('<table class="reference">')
+        count = 0
+        for sourceIdentity, labels in sources.items():
+            if count == self.SEARCH_LIMIT:
+                self.html.addLine(f'<tr><td>{len(sources) - count} more sources.</td></tr>')
+                break
+            source = self.application.gedcom.sources[sourceIdentity]
+            self.html.addLine(f'<tr><td><a href="app:source?id={source.identity}">{source.title}</a></td><td>{", ".join(labels)}</td></tr>')
+            count += 1
+        self.html.addLine('</table>')
 
 
 
@@ -304,6 +372,24 @@ class Render(walton.toolbar.IToolbar):
 
 
 
+    def getRelationshipToHome(self, identity):
+        ''' Returns the relationship of the specified individual to the home individual for the listings or an empty string. '''
+        homeIdentity = self.application.gedcom.defaultIdentity
+        if homeIdentity is None:
+            return ''
+        # The relationship graph would build every lazy record, so wait until the gedcom is loaded.
+        if not self.application.gedcom.isRelationshipsReady():
+            return ''
+        kinship = self.application.gedcom.getKinship()
+        # All the relationships to the home individual are found once and kept for the whole listing.
+        kinship.getRelationshipsTo(homeIdentity)
+        relationship = kinship.getDescription(homeIdentity, identity)
+        if relationship is None:
+            return ''
+        return firstCap(relationship)
+
+
+
     def drawIndividual(self, identity, x, y):
         ''' Draw the specified individual at the specified location. '''
         individual = self.application.gedcom.individuals[identity]
@@ -807,14 +893,13 @@ class Render(walton.toolbar.IToolbar):
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in individual.gedcomFile:
-            indent = int(line[:1])
-            self.html.addLine(f'{"  " * indent}{html.escape(line)}')
+            self.html.addLine(f'{"  " * line.level}{html.escape(line.text)}')
         self.html.addLine('</pre></div>')
         gedcom = individual.toGedCom()
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in gedcom:
-            indent = int(line[:1])
+            indent = int(line.split(' ', 1)[0])
             self.html.addLine(f'{"  " * indent}{html.escape(line)}')
         self.html.addLine('</pre></div>')
 
@@ -912,14 +997,13 @@ class Render(walton.toolbar.IToolbar):
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in family.gedcomFile:
-            indent = int(line[:1])
-            self.html.addLine(f'{"  " * indent}{html.escape(line)}')
+            self.html.addLine(f'{"  " * line.level}{html.escape(line.text)}')
         self.html.addLine('</pre></div>')
         gedcom = family.toGedCom()
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in gedcom:
-            indent = int(line[:1])
+            indent = int(line.split(' ', 1)[0])
             self.html.addLine(f'{"  " * indent}{html.escape(line)}')
         self.html.addLine('</pre></div>')
 
@@ -1198,63 +1282,21 @@ class Render(walton.toolbar.IToolbar):
             self.html.addLine(f'<p class="change">Last change {source.change.toLongString()}</p>')
 
         # Show the people that reference this source.
+        citations = self.application.gedcom.getCitations()
         self.html.addLine('<p>Individuals</p>')
         self.html.addLine('<table class="reference">')
-        for individual in self.application.gedcom.individuals.values():
-            tags = ''
-            # print(f'{individual.identity} {individual.getName()}')
-            if identity in individual.sources:
-                tags += ' '
-            if identity in individual.nameSources:
-                tags += 'Name, '
-            if individual.birth is not None:
-                if individual.birth.date is not None:
-                    if identity in individual.birth.date.sources:
-                        tags += 'Birth Date, '
-                if individual.birth.place is not None:
-                    if identity in individual.birth.place.sources:
-                        tags += 'Birth Place, '
-                if identity in individual.birth.sources:
-                    tags += 'Birth, '
-            if individual.death is not None:
-                if individual.death.date is not None:
-                    if identity in individual.death.date.sources:
-                        tags += 'Death Date, '
-                if individual.death.place is not None:
-                    if identity in individual.death.place.sources:
-                        tags += 'Death Place, '
-                if identity in individual.death.sources:
-                    tags += 'Death, '
-            if individual.census is not None:
-                for census in individual.census:
-                    if census.sources is not None:
-                        if identity in census.sources:
-                            tags += f'Census {census.date.theDate.year}, '
-            if tags != '':
-                self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td><td>{tags[:-2]}</td></tr>')
+        for individualIdentity, labels in citations.getIndividuals(identity).items():
+            individual = self.application.gedcom.individuals[individualIdentity]
+            tags = ', '.join([label for label in labels if label != ''])
+            self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td><td>{tags}</td><td>{self.getRelationshipToHome(individual.identity)}</td></tr>')
         self.html.addLine('</table>')
 
         # Show the families that reference this source.
         self.html.addLine('<p>Families</p>')
         self.html.addLine('<table class="reference">')
-        for family in self.application.gedcom.families.values():
-            tags = ''
-            if family.marriage is not None:
-                if family.marriage.date is not None:
-                    if identity in family.marriage.date.sources:
-                        tags += 'Marriage Date, '
-                if family.marriage.place is not None:
-                    if identity in family.marriage.place.sources:
-                        tags += 'Marriage Place, '
-            if family.divorce is not None:
-                if identity in family.divorce.sources:
-                    tags += 'Divorce, '
-                if family.divorce.date is not None:
-                    if identity in family.divorce.date.sources:
-                        tags += 'Divorce Date, '
-
-            if tags != '':
-                self.html.addLine(f'<tr><td><a href="app:family?id={family.identity}">{family.getName()}</a></td><td>{tags[:-2]}</td></tr>')
+        for familyIdentity, labels in citations.getFamilies(identity).items():
+            family = self.application.gedcom.families[familyIdentity]
+            self.html.addLine(f'<tr><td><a href="app:family?id={family.identity}">{family.getName()}</a></td><td>{", ".join(labels)}</td></tr>')
         self.html.addLine('</table>')
 
         # Show the gedcom data for this source.
@@ -1262,14 +1304,13 @@ class Render(walton.toolbar.IToolbar):
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in source.gedcomFile:
-            indent = int(line[:1])
-            self.html.addLine(f'{"  " * indent}{html.escape(line)}')
+            self.html.addLine(f'{"  " * line.level}{html.escape(line.text)}')
         self.html.addLine('</pre></div>')
         gedcom = source.toGedCom()
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in gedcom:
-            indent = int(line[:1])
+            indent = int(line.split(' ', 1)[0])
             self.html.addLine(f'{"  " * indent}{html.escape(line)}')
         self.html.addLine('</pre></div>')
 
@@ -1296,7 +1337,7 @@ class Render(walton.toolbar.IToolbar):
                     isShow = True
 
             if isShow:
-                self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td></tr>')
+                self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td><td>{self.getRelationshipToHome(individual.identity)}</td></tr>')
         self.html.addLine('</table>')
 
         # Show the gedcom data for this media.
@@ -1304,14 +1345,13 @@ class Render(walton.toolbar.IToolbar):
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in media.gedcomFile:
-            indent = int(line[:1])
-            self.html.addLine(f'{"  " * indent}{html.escape(line)}')
+            self.html.addLine(f'{"  " * line.level}{html.escape(line.text)}')
         self.html.addLine('</pre></div>')
         gedcom = media.toGedCom()
         self.html.add('<div style="display: inline-block; vertical-align:top;">')
         self.html.add('<pre style="border: 1px solid black;  background-color: white;">')
         for line in gedcom:
-            indent = int(line[:1])
+            indent = int(line.split(' ', 1)[0])
             self.html.addLine(f'{"  " * indent}{html.escape(line)}')
         self.html.addLine('</pre></div>')
 
@@ -1355,6 +1395,7 @@ class Render(walton.toolbar.IToolbar):
             self.html.add('<tr>')
             self.html.add(f'<td>{individual.identity}</td>')
             self.html.add(f'<td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td>')
+            self.html.add(f'<td>{self.getRelationshipToHome(individual.identity)}</td>')
             self.html.addLine('</tr>')
         self.html.add('</table>')
         self.html.addLine('</fieldset>')
@@ -1396,16 +1437,11 @@ class Render(walton.toolbar.IToolbar):
 
     def displayAllPlacesWithParent(self, parent):
         ''' Show all places with the specified parent. '''
-        childPlaces = []
+        # The child places are kept sorted by name.
         if parent is None:
-            for place in Place.allPlaces.values():
-                if place.parent is None:
-                    childPlaces.append(place)
+            childPlaces = Place.rootPlaces
         else:
-            for place in Place.allPlaces.values():
-                if place.parent == parent:
-                    childPlaces.append(place)
-        childPlaces.sort(key=Place.byName)
+            childPlaces = parent.childPlaces
         self.html.addLine('<p>Child Locations</p>')
         self.html.addLine('<table style="display: inline-block; vertical-align:top; border: 1px solid black;">')
         for place in childPlaces:
@@ -1423,6 +1459,10 @@ class Render(walton.toolbar.IToolbar):
                     self.html.add(f'<td style="text-align: center;">{place.longitude}</td>')
                 else:
                     self.html.add('<td></td>')
+                if place.placesBelow > 0:
+                    self.html.add(f'<td>{place.placesBelow} places below</td>')
+                else:
+                    self.html.add('<td></td>')
                 self.html.addLine('</tr>')
         self.html.addLine('</table>')
 
@@ -1451,6 +1491,11 @@ class Render(walton.toolbar.IToolbar):
         self.displayToolbar(True, None, None, None, False, False, False, '', self.host)
         self.html.addLine(f'<h1>All Elements</h1>')
 
+        # The places are collected as the records are built.
+        if self.application.gedcom.isLoading:
+            self.html.addLine('<p>The places are available when the records have loaded.</p>')
+            return
+        self.application.gedcom.buildAll()
         self.displayAllPlacesWithParent(None)
 
 
@@ -1460,6 +1505,13 @@ class Render(walton.toolbar.IToolbar):
         placeName = parameters['id'] if 'id' in parameters else None
         placeName = placeName.replace('%20', ' ')
 
+        if self.application.gedcom.isLoading:
+            self.html.clear()
+            self.displayToolbar(True, None, None, None, False, False, False, '', self.host)
+            self.html.addLine(f'<h1>{placeName}</h1>')
+            self.html.addLine('<p>The places are available when the records have loaded.</p>')
+            return
+        self.application.gedcom.buildAll()
         place = Place.allPlaces[placeName]
 
         self.html.clear()
@@ -1494,56 +1546,37 @@ class Render(walton.toolbar.IToolbar):
 
         self.displayAllPlacesWithParent(place)
 
+        # Show the places nearby.
+        if place.latitude is not None and place.longitude is not None:
+            nearbyPlaces = self.application.gedcom.getPlaceGrid().getWithin(place.latitude, place.longitude, self.NEARBY_DISTANCE)
+            self.html.addLine(f'<p>Places within {self.NEARBY_DISTANCE}km</p>')
+            self.html.addLine('<table class="reference">')
+            for distance, nearbyPlace in nearbyPlaces:
+                if nearbyPlace is not place:
+                    self.html.addLine(f'<tr><td><a href="app:place?id={nearbyPlace.identity}">{nearbyPlace.identity}</a></td><td style="text-align: right;">{distance:.1f}km</td></tr>')
+            self.html.addLine('</table>')
+
         # Show the people that reference this place.
+        placeUsage = self.application.gedcom.getPlaceUsage()
         self.html.addLine('<p>Individuals</p>')
         self.html.addLine('<table class="reference">')
-        for individual in self.application.gedcom.individuals.values():
-            tags = ''
-            # print(f'{individual.identity} {individual.getName()}')
-
-            if individual.birth is not None:
-                if individual.birth.place is not None:
-                    if place.identity in individual.birth.place.toIdentityCheck():
-                        tags += 'Birth Place, '
-            if individual.death is not None:
-                if individual.death.place is not None:
-                    if place.identity in individual.death.place.toIdentityCheck():
-                        tags += 'Death Place, '
-            if individual.census is not None:
-                for census in individual.census:
-                    if census.place is not None:
-                        if place.identity in census.place.toIdentityCheck():
-                            tags += f'Census {census.date.theDate.year}, '
-            if individual.tags is not None:
-                for tag in individual.tags:
-                    if tag.place is not None:
-                        if place.identity in tag.place.toIdentityCheck():
-                            tags += f'{GedComTag.tagToLabel(tag.type)}, '
-            if tags != '':
-                self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td><td>{tags[:-2]}</td></tr>')
+        for individualIdentity, labels in placeUsage.getIndividuals(place.identity).items():
+            individual = self.application.gedcom.individuals[individualIdentity]
+            self.html.addLine(f'<tr><td><a href="app:individual?id={individual.identity}">{individual.getName()}</a></td><td>{", ".join(labels)}</td><td>{self.getRelationshipToHome(individual.identity)}</td></tr>')
         self.html.addLine('</table>')
 
         # Show the families that reference this place.
         self.html.addLine('<p>Families</p>')
         self.html.addLine('<table class="reference">')
-        for family in self.application.gedcom.families.values():
-            tags = ''
-            if family.marriage is not None:
-                if family.marriage.place is not None:
-                    if place.identity in family.marriage.place.toIdentityCheck():
-                        tags += 'Marriage Place, '
-            if tags != '':
-                self.html.addLine(f'<tr><td><a href="app:family?id={family.identity}">{family.getName()}</a></td><td>{tags[:-2]}</td></tr>')
+        for familyIdentity, labels in placeUsage.getFamilies(place.identity).items():
+            family = self.application.gedcom.families[familyIdentity]
+            self.html.addLine(f'<tr><td><a href="app:family?id={family.identity}">{family.getName()}</a></td><td>{", ".join(labels)}</td></tr>')
         self.html.addLine('</table>')
 
         # Show the sources that reference this place.
         self.html.addLine('<p>Source</p>')
         self.html.addLine('<table class="reference">')
-        for source in self.application.gedcom.sources.values():
-            tags = ''
-            if source.place is not None:
-                if place.identity in source.place.toIdentityCheck():
-                    tags += ', '
-            if tags != '':
-                self.html.addLine(f'<tr><td><a href="app:source?id={source.identity}">{source.title}</a></td><td>{tags[:-2]}</td></tr>')
+        for sourceIdentity, labels in placeUsage.getSources(place.identity).items():
+            source = self.application.gedcom.sources[sourceIdentity]
+            self.html.addLine(f'<tr><td><a href="app:source?id={source.identity}">{source.title}</a></td><td>{", ".join(labels)}</td></tr>')
         self.html.addLine('</table>')
@@ -19,6 +19,7 @@ import copy
 from gedcom_individual import GedComIndividual, IdentitySources, IndividualSex
 from gedcom_source import GedComSource
 import widget_wx.gedcom_tag as wxtag
+import widget_wx.individual_picker as wxpicker
 from gedcom_change import GedComChange
 
 
@@ -45,6 +46,8 @@ class EditFamily(wx.Dialog):
         # Initialise members.
         self.family = None
         self.generalSources = []
+        self.childStartDate = None
+        self.childEndDate = None
 
         # Add a panel to the dialog.
         self.panel = wx.Panel(self, wx.ID_ANY)
@@ -56,7 +59,7 @@ class EditFamily(wx.Dialog):
         groupDetails = wx.StaticBoxSizer(wx.VERTICAL, self.panel, 'Details')
         # GridSizer all cells are the same size!
         #groupDetailsSizer = wx.GridSizer(1, 4, 5, 5)
-        groupDetailsSizer = wx.FlexGridSizer(1, 4, 5, 5)
+        groupDetailsSizer = wx.FlexGridSizer(2, 4, 5, 5)
         label = wx.StaticText(groupDetails.GetStaticBox(), wx.ID_ANY, 'Husband')
         groupDetailsSizer.Add(label, 0, wx.ALL | wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL, 2)
         self.comboboxHusband = wx.ComboBox(groupDetails.GetStaticBox(), wx.ID_ANY, style=wx.CB_READONLY, size=(250,-1), choices=[])
@@ -65,6 +68,17 @@ class EditFamily(wx.Dialog):
         groupDetailsSizer.Add(label, 0, wx.ALL | wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL, 2)
         self.comboboxWife = wx.ComboBox(groupDetails.GetStaticBox(), wx.ID_ANY, style=wx.CB_READONLY, size=(250,-1), choices=[])
         groupDetailsSizer.Add(self.comboboxWife, 0, wx.ALL | wx.ALIGN_LEFT, 2)
+        # The comboboxes only hold the individuals with names like these.
+        label = wx.StaticText(groupDetails.GetStaticBox(), wx.ID_ANY, 'Find')
+        groupDetailsSizer.Add(label, 0, wx.ALL | wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL, 2)
+        self.textFindHusband = wx.TextCtrl(groupDetails.GetStaticBox(), wx.ID_ANY, size=(250,-1))
+        self.textFindHusband.Bind(wx.EVT_TEXT, self.onFindHusband)
+        groupDetailsSizer.Add(self.textFindHusband, 0, wx.ALL | wx.ALIGN_LEFT, 2)
+        label = wx.StaticText(groupDetails.GetStaticBox(), wx.ID_ANY, 'Find')
+        groupDetailsSizer.Add(label, 0, wx.ALL | wx.ALIGN_RIGHT | wx.ALIGN_CENTER_VERTICAL, 2)
+        self.textFindWife = wx.TextCtrl(groupDetails.GetStaticBox(), wx.ID_ANY, size=(250,-1))
+        self.textFindWife.Bind(wx.EVT_TEXT, self.onFindWife)
+        groupDetailsSizer.Add(self.textFindWife, 0, wx.ALL | wx.ALIGN_LEFT, 2)
         groupDetails.Add(groupDetailsSizer, 0, wx.EXPAND | wx.ALL, 2)
         self.boxsizer.Add(groupDetails, 0, wx.EXPAND | wx.ALL, 2)
 
@@ -73,6 +87,11 @@ class EditFamily(wx.Dialog):
         self.listboxChildren = wx.ListBox(groupDetails.GetStaticBox(), wx.ID_ANY)
         groupDetails.Add(self.listboxChildren, 0, wx.ALL | wx.EXPAND, 2)
         panelButtons = wx.BoxSizer(wx.HORIZONTAL)
+        label = wx.StaticText(groupDetails.GetStaticBox(), wx.ID_ANY, 'Find')
+        panelButtons.Add(label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 2)
+        self.textFindChild = wx.TextCtrl(groupDetails.GetStaticBox(), wx.ID_ANY, size=(150,-1))
+        self.textFindChild.Bind(wx.EVT_TEXT, self.onFindChild)
+        panelButtons.Add(self.textFindChild)
         label = wx.StaticText(groupDetails.GetStaticBox(), wx.ID_ANY, 'Child')
         panelButtons.Add(label, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 2)
         self.comboboxChild = wx.ComboBox(groupDetails.GetStaticBox(), wx.ID_ANY, style=wx.CB_READONLY, size=(250,-1))
@@ -160,6 +179,46 @@ class EditFamily(wx.Dialog):
 
 
 
+    def isHusband(self, individual):
+        ''' Returns True if the specified individual can be the husband. '''
+        return individual.sex == IndividualSex.MALE
+
+
+
+    def isWife(self, individual):
+        ''' Returns True if the specified individual can be the wife. '''
+        return individual.sex != IndividualSex.MALE
+
+
+
+    def isPossibleChild(self, individual):
+        ''' Returns True if the specified individual was born in the range for a child of the family.  An individual without a known date of birth is not a possible child. '''
+        if individual.birth is None or individual.birth.date is None or individual.birth.date.sortKey == 0:
+            return False
+        return individual.birth.date.sortKey >= self.childStartDate and individual.birth.date.sortKey <= self.childEndDate
+
+
+
+    def onFindHusband(self, event):
+        ''' Event handler for the find husband text changing. '''
+        identity = wxpicker.getPickerIdentity(self.comboboxHusband)
+        wxpicker.populatePicker(self.comboboxHusband, self.gedcom, self.textFindHusband.GetValue(), self.isHusband, identity)
+
+
+
+    def onFindWife(self, event):
+        ''' Event handler for the find wife text changing. '''
+        identity = wxpicker.getPickerIdentity(self.comboboxWife)
+        wxpicker.populatePicker(self.comboboxWife, self.gedcom, self.textFindWife.GetValue(), self.isWife, identity)
+
+
+
+    def onFindChild(self, event):
+        ''' Event handler for the find child text changing. '''
+        wxpicker.populatePicker(self.comboboxChild, self.gedcom, self.textFindChild.GetValue(), self.isPossibleChild)
+
+
+
     def onAddChild(self, event):
         ''' Event handler for the add child button. '''
         # Find the selected child.
@@ -269,20 +328,9 @@ class EditFamily(wx.Dialog):
 
     def populateDialog(self):
         ''' Populate the dialog from the family. '''
-        # Add People to the husbands and wives.
-        husbands = []
-        wives = []
-        for individual in self.gedcom.individuals.values():
-            if individual.sex == IndividualSex.MALE:
-                husbands.append(individual)
-            else:
-                wives.append(individual)
-        # Sort the people.
-        # Add the people to the comboboxes.
-        for individual in husbands:
-            self.comboboxHusband.Append(individual.toLongString(), individual)
-        for individual in wives:
-            self.comboboxWife.Append(individual.toLongString(), individual)
+        # Add people to the husbands and wives, the find texts replace them with the people with similar names.
+        wxpicker.populatePicker(self.comboboxHusband, self.gedcom, '', self.isHusband, self.family.husbandIdentity)
+        wxpicker.populatePicker(self.comboboxWife, self.gedcom, '', self.isWife, self.family.wifeIdentity)
 
         # Add sources to combobox in reverse change order.
         sources = []
@@ -292,26 +340,14 @@ class EditFamily(wx.Dialog):
         for source in sources:
             self.comboboxNewSource.Append(source.title, source)
 
-        # Guess a range for the possible children.
-        childStartDate = datetime.date(1600, 1, 1)
-        childEndDate = datetime.date.today()
-
-        # Populate the actual husband and wife.
-        if self.family.husbandIdentity is not None:
-            for index in range(len(self.comboboxHusband.Items)):
-                individual = self.comboboxHusband.GetClientData(index)
-                if individual.identity == self.family.husbandIdentity:
-                    self.comboboxHusband.SetSelection(index)
-                    break
+        # Guess a range for the possible children.  The range is the day ordinals of the dates, the same as the sort key of a date.
+        self.childStartDate = datetime.date(1600, 1, 1).toordinal()
+        self.childEndDate = datetime.date.today().toordinal()
         if self.family.wifeIdentity is not None:
-            for index in range(len(self.comboboxWife.Items)):
-                individual = self.comboboxWife.GetClientData(index)
-                if individual.identity == self.family.wifeIdentity:
-                    self.comboboxWife.SetSelection(index)
-                    break
             mother = self.gedcom.individuals[self.family.wifeIdentity]
-            childStartDate = datetime.date(mother.birth.date.theDate.year + 16, 1, 1)
-            childEndDate = datetime.date(mother.birth.date.theDate.year + 50, 12, 31)
+            if mother.birth is not None and mother.birth.date is not None and mother.birth.date.sortKey > 0:
+                self.childStartDate = datetime.date(mother.birth.date.theDate.year + 16, 1, 1).toordinal()
+                self.childEndDate = datetime.date(mother.birth.date.theDate.year + 50, 12, 31).toordinal()
 
         # Add the childrem.
         for childIdentity in self.family.childrenIdentities:
@@ -319,9 +355,7 @@ class EditFamily(wx.Dialog):
             self.listboxChildren.Append(child.toLongString(), child)
 
         # Add the possible children.
-        for individual in self.gedcom.individuals.values():
-            if individual.birth.date.theDate >= childStartDate and individual.birth.date.theDate <= childEndDate:
-                self.comboboxChild.Append(individual.toLongString(), individual)
+        wxpicker.populatePicker(self.comboboxChild, self.gedcom, '', self.isPossibleChild)
 
         # Add the tags to the one and only root.
         root = self.treeTags.AddRoot(self.family.getName())
@@ -350,10 +384,14 @@ class EditFamily(wx.Dialog):
                         if spouse.identity == self.family.identity:
                             print('Remove')
                             husband.familyIdentities.remove(spouse)
+                            husband.isDirty = True
                 # Add the family to the new husband.
                 if newHusband.identity is not None:
                     husband = GedComIndividual.gedcom.individuals[newHusband.identity]
+                    # An individual without families shares an empty tuple.
+                    husband.familyIdentities = list(husband.familyIdentities)
                     husband.familyIdentities.append(IdentitySources(self.family.identity))
+                    husband.isDirty = True
                     self.family.husbandIdentity = newHusband.identity
         # Get the wife.
         index = self.comboboxWife.GetSelection()
@@ -367,10 +405,14 @@ class EditFamily(wx.Dialog):
                     for spouse in wife.familyIdentities:
                         if spouse.identity == self.family.identity:
                             wife.familyIdentities.remove(spouse)
+                            wife.isDirty = True
                 # Add the family to the new wife.
                 if newWife.identity is not None:
                     wife = GedComIndividual.gedcom.individuals[newWife.identity]
+                    # An individual without families shares an empty tuple.
+                    wife.familyIdentities = list(wife.familyIdentities)
                     wife.familyIdentities.append(IdentitySources([f'0 FAMS @{self.family.identity}@', '1 ignore ignore']))
+                    wife.isDirty = True
                     self.family.wifeIdentity = newWife.identity
 
         # Deal with the children.
@@ -386,6 +428,7 @@ class EditFamily(wx.Dialog):
                 print(f'Remove{identity}')
                 child = self.gedcom.individuals[identity]
                 child.parentFamilyIdentity = None
+                child.isDirty = True
         for identity in newIdentities:
             if identity in self.family.childrenIdentities:
                 # Nothing to do.
@@ -394,6 +437,7 @@ class EditFamily(wx.Dialog):
                 print(f'Add {child.toLongString()}')
                 child = self.gedcom.individuals[identity]
                 child.parentFamilyIdentity = self.family.identity
+                child.isDirty = True
         self.family.childrenIdentities = newIdentities
 
         # Loop through the tagss.
@@ -415,6 +459,9 @@ class EditFamily(wx.Dialog):
 
         # Update the change record.
         self.gedcom.isDirty = True
+        self.gedcom.resetRelationships()
+        self.family.isDirty = True
+        self.gedcom.updateIndexes(self.family)
         if self.family.change is None:
             self.family.change = GedComChange()
         self.family.change.setNow()
@@ -13,7 +13,6 @@ import datetime
 import time
 import os
 import sys
-import copy
 
 # Import my own libraries.
 import widget_wx.gedcom_tag as wxtag
@@ -310,13 +309,13 @@ class EditIndividual(wx.Dialog):
         self.treeTags.Toggle(root)
 
         # Initialise the non tag sources.
-        self.generalSources = copy.copy(self.individual.sources)
-        self.nameSources = copy.copy(self.individual.nameSources)
-        self.dobSources = copy.copy(self.individual.birth.date.sources)
+        self.generalSources = list(self.individual.sources)
+        self.nameSources = list(self.individual.nameSources)
+        self.dobSources = list(self.individual.birth.date.sources)
         if self.individual.death is None or self.individual.death.date is None:
             self.dodSources = []
         else:
-            self.dodSources = copy.copy(self.individual.death.date.sources)
+            self.dodSources = list(self.individual.death.date.sources)
         # Update the layout.
         self.panel.Layout()
 
@@ -386,6 +385,9 @@ class EditIndividual(wx.Dialog):
 
         # Update the change record.
         self.gedcom.isDirty = True
+        self.gedcom.resetRelationships()
+        self.individual.isDirty = True
+        self.gedcom.updateIndexes(self.individual)
         if self.individual.change is None:
             self.individual.change = GedComChange()
         self.individual.change.setNow()
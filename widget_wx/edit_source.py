@@ -16,6 +16,7 @@ import copy
 
 # Import my own libraries.
 import widget_wx.gedcom_tag as wxtag
+import widget_wx.individual_picker as wxpicker
 from gedcom_source import GedComSourceType
 from gedcom_tag import GedComTag
 from gedcom_date import GedComDate
@@ -382,6 +383,7 @@ class EditSource(wx.Dialog):
                     textName = wx.TextCtrl(groupDetails.GetStaticBox(), wx.ID_ANY, size=(200,-1))
                     groupDetailsSizer.Add(textName, pos=(line,0), span=(1,2), flag = wx.ALL | wx.ALIGN_LEFT, border = 1)
                     textName.SetValue(grid[index][0])
+                    textName.Bind(wx.EVT_TEXT, self.onCensusNameChange)
                     self.textName.append(textName)
 
                     # grid[index][1] is person identity.
@@ -411,6 +413,7 @@ class EditSource(wx.Dialog):
             # Add an extra row for new input.
             textName = wx.TextCtrl(groupDetails.GetStaticBox(), wx.ID_ANY, size=(200,-1))
             groupDetailsSizer.Add(textName, pos=(line,0), span=(1,2), flag = wx.ALL | wx.ALIGN_LEFT, border = 1)
+            textName.Bind(wx.EVT_TEXT, self.onCensusNameChange)
             self.textName.append(textName)
             comboboxPerson = wx.ComboBox(groupDetails.GetStaticBox(), wx.ID_ANY, style=wx.CB_READONLY, size=(250,-1), choices=[])
             groupDetailsSizer.Add(comboboxPerson, pos=(line,2), span=(1,2), flag = wx.ALL | wx.ALIGN_LEFT, border = 1)
@@ -496,6 +499,16 @@ class EditSource(wx.Dialog):
 
 
 
+    def onCensusNameChange(self, event):
+        ''' Event handler for a census name changing.  The person combobox on the same line is filled with the people with similar names. '''
+        textName = event.GetEventObject()
+        index = self.textName.index(textName)
+        if index < len(self.comboboxPerson):
+            combobox = self.comboboxPerson[index]
+            wxpicker.populatePicker(combobox, self.gedcom, textName.GetValue(), None, wxpicker.getPickerIdentity(combobox))
+
+
+
     def onTreeSelectionChange(self, event):
         ''' Event handler for the tree control selection changing. '''
         treeItem = self.treeTags.GetSelection()
@@ -623,22 +636,14 @@ class EditSource(wx.Dialog):
                     self.textWhenRegistered.SetValue(grid[11][1])
 
                 elif self.source.type == GedComSourceType.CENSUS:
-                    # Add the people to the comboboxes.
-                    individuals = self.gedcom.individuals.values()
-                    for individual in individuals:
-                        for combobox in self.comboboxPerson:
-                            combobox.Append(individual.toLongString(), individual)
-
-                    # Select the person in the person comboboxes.
+                    # Add the people with names like the census names to the comboboxes and select the person in each.
                     for personIndex in range(1, len(grid)):
+                        identity = None
                         if grid[personIndex][1] != '':
-                            self.originalCensusPeople.append(grid[personIndex][1])
-                            for index in range(len(self.comboboxPerson[personIndex - 1].Items)):
-                                individual = self.comboboxPerson[personIndex - 1].GetClientData(index)
-                                # print(f'compare \'{grid[personIndex][1]}\' with \'{individual.identity}\'')
-                                if grid[personIndex][1] == individual.identity:
-                                    self.comboboxPerson[personIndex - 1].SetSelection(index)
-                                    break
+                            identity = grid[personIndex][1]
+                            self.originalCensusPeople.append(identity)
+                        wxpicker.populatePicker(self.comboboxPerson[personIndex - 1], self.gedcom, grid[personIndex][0], None, identity)
+                    wxpicker.populatePicker(self.comboboxPerson[-1], self.gedcom, '')
 
                     # Populate the reference.
                     self.textSeries.SetValue(grid[0][3])
@@ -785,6 +790,8 @@ class EditSource(wx.Dialog):
 
         # Update the change record.
         self.gedcom.isDirty = True
+        self.source.isDirty = True
+        self.gedcom.updateIndexes(self.source)
         if self.source.change is None:
             self.source.change = GedComChange()
         self.source.change.setNow()
@@ -835,6 +842,8 @@ class EditSource(wx.Dialog):
         individual.census.append(newCensus)
 
         individual.census.sort(key = GedComCensus.byDate)
+        individual.isDirty = True
+        self.gedcom.updateIndexes(individual)
 
 
 
@@ -848,6 +857,8 @@ class EditSource(wx.Dialog):
         while index < len(individual.census):
             if self.source.identity in individual.census[index].sources:
                 individual.census.pop(index)
+                individual.isDirty = True
             else:
                 index += 1
+        self.gedcom.updateIndexes(individual)
 
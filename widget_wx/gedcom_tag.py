@@ -6,7 +6,6 @@ Module to support gedcom tags in the wxPython library.
 
 # System libraries.
 import wx
-import copy
 
 # Application libraries.
 from gedcom_date import GedComDate
@@ -40,7 +39,7 @@ def addTagToTree(tree, root, tag):
                         tree.AppendItem(parent, f'CONT: {lineAsString}')
         else:
             # Normal tag, expect to come here.
-            parent = tree.AppendItem(root, f'{GedComTag.tagToLabel(tag.type)}: {tag.information}', data=copy.copy(tag.sources))
+            parent = tree.AppendItem(root, f'{GedComTag.tagToLabel(tag.type)}: {tag.information}', data=list(tag.sources))
             if tag.date is not None:
                 addTagToTree(tree, parent, tag.date)
             if tag.place is not None:
@@ -49,9 +48,9 @@ def addTagToTree(tree, root, tag):
                 for childFact in tag.tags:
                     addTagToTree(tree, parent, childFact)
     elif isinstance(tag, GedComDate):
-        parent = tree.AppendItem(root, f'Date: {tag.toGedCom()}', data = copy.copy(tag.sources))
+        parent = tree.AppendItem(root, f'Date: {tag.toGedCom()}', data = list(tag.sources))
     elif isinstance(tag, GedComPlace):
-        parent = tree.AppendItem(root, f'Place: {tag.place}', data = copy.copy(tag.sources))
+        parent = tree.AppendItem(root, f'Place: {tag.place}', data = list(tag.sources))
         if tag.address is not None:
             tree.AppendItem(parent, f'Address: {tag.address}')
     else:
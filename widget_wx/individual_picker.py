@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to support choosing an individual from a combobox in the wxPython library.
+The combobox only holds the individuals with names like a search rather than every individual in the gedcom.
+'''
+
+# System libraries.
+import wx
+
+# Application libraries.
+
+
+
+# The maximum number of individuals in a combobox.
+PICKER_LIMIT = 100
+
+
+
+def populatePicker(combobox, gedcom, query, isInclude = None, identity = None):
+    '''
+    Fill the combobox with the individuals with names like the query, the best match first.
+    When the query is empty the combobox has the first individuals of the gedcom.
+    The isInclude function can reject some individuals, for example the women from a list of husbands.
+    The individual with the specified identity is always first and selected.
+    '''
+    combobox.Clear()
+    individuals = []
+    if identity is not None and identity in gedcom.individuals:
+        individuals.append(gedcom.individuals[identity])
+    if query.strip() == '':
+        candidates = gedcom.individuals
+    else:
+        candidates = gedcom.getNames().getIndividuals(query)
+    for candidate in candidates:
+        if len(individuals) >= PICKER_LIMIT:
+            break
+        if candidate != identity:
+            individual = gedcom.individuals[candidate]
+            if isInclude is None or isInclude(individual):
+                individuals.append(individual)
+
+    for individual in individuals:
+        combobox.Append(individual.toLongString(), individual)
+    if len(individuals) > 0 and individuals[0].identity == identity:
+        combobox.SetSelection(0)
+
+
+
+def getPickerIdentity(combobox):
+    ''' Returns the identity of the individual selected in the combobox or None. '''
+    index = combobox.GetSelection()
+    if index == wx.NOT_FOUND:
+        return None
+    return combobox.GetClientData(index).identity
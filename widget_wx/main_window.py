@@ -16,6 +16,7 @@ import shutil
 import datetime
 import wx           # Try package python3-wxpython4 or apt install python3-wxgtk4.0 or python -m pip install wxPython
 import wx.html2     # Try package python3-wxpython4-webview or apt install python3-wxgtk-webview4.0
+import wx.lib.newevent
 
 # Application libraries.
 import widget_wx.edit_individual
@@ -25,6 +26,9 @@ from gedcom_individual import GedComIndividual
 from gedcom_family import GedComFamily
 from gedcom_source import GedComSource
 
+# Event to report the progress of the background loading of the gedcom records.
+LoadProgressEvent, EVT_LOAD_PROGRESS = wx.lib.newevent.NewEvent()
+
 
 
 class WxMainWindow(wx.Frame):
@@ -114,6 +118,10 @@ class WxMainWindow(wx.Frame):
         self.SetSizer(sizer)
         self.SetSize((700, 700))
 
+        # The status bar shows the progress of the background loading.
+        self.CreateStatusBar()
+        self.Bind(EVT_LOAD_PROGRESS, self._loadProgress)
+
         # The page history for the back button.
         self.history = ['home']
 
@@ -176,7 +184,9 @@ class WxMainWindow(wx.Frame):
             fileName = fileDialog.GetPath()
 
         if fileName is not None:
-            self.application.gedcom.open(fileName)
+            self.application.gedcom.open(fileName, self.application.args.lazy or self.application.args.background, not self.application.args.no_cache, self.application.args.jobs)
+            if self.application.args.background:
+                self.application.gedcom.startLoading(self.postLoadProgress)
             # Display the home page.
             self.followLocalLink('home', True)
 
@@ -250,6 +260,8 @@ class WxMainWindow(wx.Frame):
         individual = GedComIndividual()
         GedComIndividual.gedcom.individuals[individual.identity] = individual
         GedComIndividual.gedcom.isDirty = True
+        GedComIndividual.gedcom.resetRelationships()
+        GedComIndividual.gedcom.updateIndexes(individual)
 
         # Display the home page.
         self.followLocalLink('home', True)
@@ -262,6 +274,7 @@ class WxMainWindow(wx.Frame):
         family = GedComFamily()
         GedComFamily.gedcom.families[family.identity] = family
         GedComFamily.gedcom.isDirty = True
+        GedComFamily.gedcom.resetRelationships()
 
         # Display the home page.
         self.followLocalLink('home', True)
@@ -274,6 +287,7 @@ class WxMainWindow(wx.Frame):
         source = GedComSource()
         GedComSource.gedcom.sources[source.identity] = source
         GedComSource.gedcom.isDirty = True
+        GedComSource.gedcom.updateIndexes(source)
         # Display the home page.
         self.followLocalLink('home', True)
 
@@ -396,6 +410,24 @@ class WxMainWindow(wx.Frame):
 
 
 
+    def postLoadProgress(self, count, total):
+        ''' Post the progress of the background loading to the main window.  This is called from the background thread. '''
+        wx.PostEvent(self, LoadProgressEvent(count=count, total=total))
+
+
+
+    def _loadProgress(self, event):
+        ''' Signal handler for the progress of the background loading. '''
+        if event.count < event.total:
+            self.SetStatusText(f'Loading {event.count} of {event.total} records.')
+            return
+        self.SetStatusText(f'Loaded {event.total} records.')
+        # Refresh the pages that wait for all the records.
+        if self.application.request in ('home', 'all_places', 'place'):
+            self.application.openCurrentPage()
+
+
+
     def saveDocument(self, fileName):
         '''
         :param string fileName: Specifies the full filename of the file to write.